@@ -12,7 +12,8 @@ import numpy
 from deap import base
 from deap import creator
 from deap import tools
-from deap.gp import PrimitiveTree, compileADF, mutUniform, PrimitiveSet
+from deap.gp import PrimitiveTree, compileADF, mutUniform, PrimitiveSet, evaluateBitwiseADF, countBits
+from deap.benchmarks.gp import parity_masks
 from app.ourMods import genGrow, cxPTreeGraft, selProbablistic
 
 """
@@ -39,6 +40,9 @@ for i in range(PARITY_SIZE_M):
             inputs[i][j] = 0
     outputs[i] = parity
 
+# the same table packed into one bitmask per input, for bitwise evaluation
+IN_MASKS, OUT_MASK, CASES_MASK = parity_masks(PARITY_FANIN_M)
+
 """
 ### Primitive Sets for ADF and Main program
 """
@@ -48,11 +52,11 @@ def nor(a,b):
 
 # the adf takes two inputs and has just the one primitive
 adfpset = PrimitiveSet("ADF0", 2, "ARG")
-adfpset.addPrimitive(nor, 2)
+adfpset.addPrimitive(nor, 2, vectorized=lambda a, b: ~(a | b))
 
 # the main pset is the same, plus the adf
 pset = PrimitiveSet("MAIN", PARITY_FANIN_M, "IN")
-pset.addPrimitive(nor, 2)
+pset.addPrimitive(nor, 2, vectorized=lambda a, b: ~(a | b))
 pset.addADF(adfpset)
 
 
@@ -78,11 +82,20 @@ toolbox.register("individual", tools.initCycle, creator.Individual, [toolbox.MAI
 # the population is a list of individuals and (hopefully) the default compile routine knows what to do
 # with the adfs
 toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-toolbox.register("compile", compileADF, psets=[pset, adfpset])
+
+
+def compile_individual(individual):
+    # compileADF takes the main tree and its set last, after the adf it calls
+    main, adf = individual
+    return compileADF([adf, main], [adfpset, pset])
+
+toolbox.register("compile", compile_individual)
 
 def evalParity(individual):
-    func = toolbox.compile(expr=individual)
-    score = sum(func(*in_) == out for in_, out in zip(inputs, outputs))
+    # every one of the 2^n cases is evaluated at once, one per bit; the adf goes first
+    main, adf = individual
+    result = evaluateBitwiseADF([adf, main], [adfpset, pset], *IN_MASKS)
+    score = countBits(~(result ^ OUT_MASK) & CASES_MASK)
     nodes = len(individual[0]) + len(individual[1])
     score = max(0, PARITY_SIZE_M - score + nodes * 0.001)
     return score,
@@ -105,7 +118,7 @@ def main(pop_size=POP_SIZE, gens=GENERATIONS):
     stats.register("min", numpy.min)
     stats.register("max", numpy.max)
 
-    logbook = tools.Logbook()
+    logbook = tools.ArrayLogbook(interval=1.0)
     logbook.header = ['gen'] + stats.fields
 
     def log(gen):
@@ -115,7 +128,7 @@ def main(pop_size=POP_SIZE, gens=GENERATIONS):
         logbook.record(gen=gen, **stats.compile(pop))
         hof.update(pop)
 
-        print(logbook.stream)
+        logbook.show()
         gen += 1
 
     # Generational loop
@@ -151,6 +164,7 @@ def main(pop_size=POP_SIZE, gens=GENERATIONS):
             offspring.append(child)
         pop[:] = offspring
     log(gen+1)
+    logbook.show(force=True)
 
     return pop, stats, hof
 
@@ -86,15 +86,16 @@ def get_pset():
     return pset
 
 
-def get_toolbox(pset):
+def get_toolbox(pset, compiler=gp.compile):
     """
+    :param compiler: gp.compile, or gp.interpret to run the trees on the stack interpreter
     :return: a configured toolbox
     """
     toolbox = base.Toolbox()
     toolbox.register("expr", gp.genGrow, pset, min_=1, max_=50)
     toolbox.register("individual", tools.initIterate, creator.Individual, toolbox.expr)
     toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-    toolbox.register("compile", gp.compile, pset=pset)
+    toolbox.register("compile", compiler, pset=pset)
 
     def eval_func(individual):
         """
@@ -11,7 +11,8 @@ from deap import algorithms
 from deap import base
 from deap import creator
 from deap import tools
-from deap.gp import PrimitiveTree, compile, mutUniform, PrimitiveSet
+from deap.gp import PrimitiveTree, CompileCache, mutUniform, PrimitiveSet, evaluateBitwise, countBits
+from deap.benchmarks.gp import parity_masks
 from app.ourMods import genGrow, cxPTreeGraft, selProbablistic, eaNigel, procreate
 
 # Initialize Parity problem input and output matrices
@@ -36,12 +37,15 @@ for i in range(PARITY_SIZE_M):
             inputs[i][j] = 0
     outputs[i] = parity
 
+# the same table packed into one bitmask per input, for bitwise evaluation
+IN_MASKS, OUT_MASK, CASES_MASK = parity_masks(PARITY_FANIN_M)
+
 pset = PrimitiveSet("MAIN", PARITY_FANIN_M, "IN")
 
 def nor(a,b):
     return not(a or b)
 
-pset.addPrimitive(nor, 2)
+pset.addPrimitive(nor, 2, vectorized=lambda a, b: ~(a | b))
 
 # pset.addPrimitive(operator.and_, 2)
 # pset.addPrimitive(operator.or_, 2)
@@ -57,12 +61,13 @@ toolbox = base.Toolbox()
 toolbox.register("expr", genGrow, pset=pset, max_=5)
 toolbox.register("individual", tools.initIterate, creator.Individual, toolbox.expr)
 toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-toolbox.register("compile", compile, pset=pset)
+toolbox.register("compile", CompileCache(), pset=pset)
 
 
 def evalParity(individual):
-    func = toolbox.compile(expr=individual)
-    score = sum(func(*in_) == out for in_, out in zip(inputs, outputs))
+    # every one of the 2^n cases is evaluated at once, one per bit
+    result = evaluateBitwise(individual, pset, *IN_MASKS)
+    score = countBits(~(result ^ OUT_MASK) & CASES_MASK)
     nodes = len(individual)
     score = max(0, PARITY_SIZE_M - score + nodes * 0.001)
     return score,
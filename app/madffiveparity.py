@@ -10,7 +10,8 @@ from functools import partial
 
 from deap import base
 from deap import tools
-from deap.gp import PrimitiveTree, compileADF, mutUniform, PrimitiveSet
+from deap.gp import PrimitiveTree, mutUniform, PrimitiveSet, evaluateBitwiseADF, countBits
+from deap.benchmarks.gp import parity_masks
 from app.ourMods import genGrow, selProbablistic, adfdraw
 
 """
@@ -37,20 +38,24 @@ for i in range(PARITY_SIZE_M):
             inputs[i][j] = 0
     outputs[i] = parity
 
+# the same table packed into one bitmask per input, for bitwise evaluation
+IN_MASKS, OUT_MASK, CASES_MASK = parity_masks(PARITY_FANIN_M)
+
 """
 ### Primitive Sets for ADF and Main program
 """
 # you can build anything you need from this one primitive
 def nor(a,b):
     return (a|b)^1
-primitives = [(nor, 2)]
+# each primitive with its bitwise twin over packed cases
+primitives = [(nor, 2, lambda a, b: ~(a | b))]
 
 
 def get_pset(primitives, name, arity, prefix='A'):
     """returns a new PrimitiveSet"""
     pset = PrimitiveSet(name, arity, prefix)
-    for func, arity in primitives:
-        pset.addPrimitive(func, arity)
+    for func, arity, bitwise in primitives:
+        pset.addPrimitive(func, arity, vectorized=bitwise)
     return pset
 
 
@@ -98,18 +103,14 @@ class Individual(list):
         self.fitness = FitnessMin()
 
     def evaluate(self):
-        # run the function with the inputs and outputs and sum the outputs for a score out of 32
-        func = compileADF(self, self.psets)
-        score = 0
+        # run the function over all the inputs at once, one case per bit, and count the matching outputs
         try:
-            for in_, out in zip(inputs, outputs):
-                if func(*in_) == out:
-                    score += 1
-#            score = sum(func(*in_) == out for in_, out in zip(inputs, outputs))
+            result = evaluateBitwiseADF(self, self.psets, *IN_MASKS)
         except Exception as ex:
             print(ex)
             adfdraw(self)
             raise ex
+        score = countBits(~(result ^ OUT_MASK) & CASES_MASK)
         score = max(0, PARITY_SIZE_M - score)
 
         # accumulate the number of nodes actually used during a run by calling the adfs in the rpb
@@ -217,7 +218,7 @@ def main(pop_size=100, gens=100, adf_range=(0,4), adf_nargs=(1,5), mmc=(80,18,2)
     stats.register("min", numpy.min)
     stats.register("max", numpy.max)
 
-    logbook = tools.Logbook()
+    logbook = tools.ArrayLogbook(interval=1.0)
     logbook.header = ['gen'] + stats.fields
 
     def log(gen):
@@ -227,7 +228,7 @@ def main(pop_size=100, gens=100, adf_range=(0,4), adf_nargs=(1,5), mmc=(80,18,2)
         logbook.record(gen=gen, **stats.compile(pop))
         hof.update(pop)
 
-        print(logbook.stream)
+        logbook.show()
         gen += 1
 
     # Generational loop
@@ -274,6 +275,7 @@ def main(pop_size=100, gens=100, adf_range=(0,4), adf_nargs=(1,5), mmc=(80,18,2)
             offspring.append(child)
         pop[:] = offspring
     log(gen+1)
+    logbook.show(force=True)
 
     return pop, stats, hof
 
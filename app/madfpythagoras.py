@@ -140,7 +140,7 @@ def main(pop_size=100, gens=100, adf_range=(0,4), adf_nargs=(1,5), mmc=(80,18,2)
     stats.register("min", numpy.min)
     stats.register("max", numpy.max)
 
-    logbook = tools.Logbook()
+    logbook = tools.ArrayLogbook(interval=1.0)
     logbook.header = ['gen'] + stats.fields
 
     def log(gen):
@@ -150,7 +150,7 @@ def main(pop_size=100, gens=100, adf_range=(0,4), adf_nargs=(1,5), mmc=(80,18,2)
         logbook.record(gen=gen, **stats.compile(pop))
         hof.update(pop)
 
-        print(logbook.stream)
+        logbook.show()
         gen += 1
 
     # Generational loop
@@ -197,6 +197,7 @@ def main(pop_size=100, gens=100, adf_range=(0,4), adf_nargs=(1,5), mmc=(80,18,2)
             offspring.append(child)
         pop[:] = offspring
     log(gen+1)
+    logbook.show(force=True)
 
     return pop, stats, hof
 
@@ -6,11 +6,12 @@ import networkx as nx
 
 from deap.gp import graph as gph
 from deap.gp import Primitive
-from deap.tools import Logbook
+from deap.tools import ArrayLogbook
+from deap.tools import CumulativeSampler
 
 
 def eaNigel(population, toolbox, ngen, goal=0, stats=None,
-             halloffame=None, history=None, verbose=__debug__):
+             halloffame=None, history=None, cache=None, verbose=__debug__):
     """This algorithm is a simple evolutionary algorithm.
 
     :param population: A list of individuals.
@@ -22,17 +23,28 @@ def eaNigel(population, toolbox, ngen, goal=0, stats=None,
                   inplace, optional.
     :param halloffame: A :class:`~deap.tools.HallOfFame` object that will
                        contain the best individuals, optional.
+    :param cache: A :class:`~deap.tools.EvaluationCache` of toolbox.evaluate, optional;
+                  it is passed to toolbox.procreate to evaluate every generation and its
+                  hit rate is logged.
     :param verbose: Whether or not to log the statistics.
     :returns: The final population
-    :returns: A class:`~deap.tools.Logbook` with the statistics of the
+    :returns: A class:`~deap.tools.ArrayLogbook` with the statistics of the
               evolution
     """
-    logbook = Logbook()
+    logbook = ArrayLogbook(interval=1.0)
     logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+    if cache is not None:
+        logbook.header.append('hit_rate')
 
     # Evaluate the individuals with an invalid fitness
     invalid_ind = [ind for ind in population if not ind.fitness.valid]
-    fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+    if cache is None:
+        fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+        nevals = len(invalid_ind)
+    else:
+        misses = cache.misses
+        fitnesses = cache.map(invalid_ind, toolbox.map)
+        nevals = cache.misses - misses
     for ind, fit in zip(invalid_ind, fitnesses):
         ind.fitness.values = fit
 
@@ -43,13 +55,21 @@ def eaNigel(population, toolbox, ngen, goal=0, stats=None,
         history.update(population)
 
     record = stats.compile(population) if stats else {}
-    logbook.record(gen=0, nevals=len(invalid_ind), **record)
+    if cache is not None:
+        record['hit_rate'] = cache.hit_rate
+    logbook.record(gen=0, nevals=nevals, **record)
 
     # Begin the generational process
     gen = 0
     while halloffame[0].fitness.values[0] > goal and gen < ngen:
         # Select the next generation individuals
-        offspring = toolbox.procreate(population)
+        if cache is None:
+            offspring = toolbox.procreate(population)
+            nevals = len(offspring)
+        else:
+            misses = cache.misses
+            offspring = toolbox.procreate(population, cache=cache)
+            nevals = cache.misses - misses
 
         # Replace the current population by the offspring
         population[:] = offspring
@@ -64,41 +84,58 @@ def eaNigel(population, toolbox, ngen, goal=0, stats=None,
 
         # Append the current generation statistics to the logbook
         record = stats.compile(population) if stats else {}
+        if cache is not None:
+            record['hit_rate'] = cache.hit_rate
         gen += 1
-        logbook.record(gen=gen, nevals=len(invalid_ind), **record)
-        print(logbook.stream)
+        logbook.record(gen=gen, nevals=nevals, **record)
+        logbook.show()
 
+    logbook.show(force=True)
     return population, logbook
 
 
-def procreate(pop, toolbox):
-    """Create a new population from the given one
+def procreate(pop, toolbox, cache=None):
+    """Create a new population from the given one.
+    The offspring are evaluated together through toolbox.map, which may be a
+    :class:`~deap.base.ProcessPoolMap`.
 
+    :param cache: A :class:`~deap.tools.EvaluationCache` of toolbox.evaluate, optional;
+                  offspring already evaluated, such as clones, are then not evaluated again.
     :returns: a list of individuals
+
+    toolbox.select is called with as_list=True, see :func:`selProbablistic`.
     """
     offspring = []
-    # for every individual randomly clone, crossover, or mutate
-    for idx in range(len(pop)):
-        action = random.randint(1, 3)
+    # for every individual randomly clone, crossover, or mutate; the actions are decided first
+    # so that the parents of the whole generation are selected in a single call
+    actions = [random.randint(1, 3) for _ in range(len(pop))]
+    k = sum(2 if action == 2 else 1 for action in actions)
+    parents = iter(toolbox.select(pop, k, as_list=True))
+    for action in actions:
         if action == 1:
-            ind = toolbox.select(pop, 1)[0]
-            baby = toolbox.clone(ind)
+            baby = toolbox.clone(next(parents))
         elif action == 2:
+            dad, mum = next(parents), next(parents)
             attempt = 0
             while True:
                 try:
-                    dad, mum = toolbox.select(pop, 2)
                     baby = toolbox.mate(dad, mum)[0]
                     break
                 except:
                     attempt += 1
                     if attempt > 5:
                         raise Exception("Couldn't find a mate")
+                    dad, mum = toolbox.select(pop, 2)
         else:
-            ind = toolbox.select(pop, 1)[0]
-            baby = toolbox.mutate(ind)[0]
-        baby.fitness.values = toolbox.evaluate(baby)
+            baby = toolbox.mutate(next(parents))[0]
         offspring.append(baby)
+
+    if cache is None:
+        fitnesses = toolbox.map(toolbox.evaluate, offspring)
+    else:
+        fitnesses = cache.map(offspring, toolbox.map)
+    for baby, fit in zip(offspring, fitnesses):
+        baby.fitness.values = fit
     return offspring
 
 
@@ -115,9 +152,12 @@ def cxPTreeGraft(receiver, contributor, pset=None):
     :param pset: A PrimitiveSet which all the contributed nodes must be within
     :returns: A new Individual with a branch of the contributor on the receiver, or an exception.
     """
-    # find and randomly choose the type of node to graft at
-    types1 = set([node.ret for node in receiver])
-    types2 = set([node.ret for node in contributor])
+    # find and randomly choose the type of node to graft at; the cached type
+    # index of a tree leaves its root out
+    receiver_types = receiver.types[0]
+    contributor_types = contributor.types[0]
+    types1 = set(receiver_types).union([receiver.root.ret])
+    types2 = set(contributor_types).union([contributor.root.ret])
     common_types = types1.intersection(types2)
     try:
         graft_type = random.choice(list(common_types))
@@ -125,22 +165,20 @@ def cxPTreeGraft(receiver, contributor, pset=None):
         raise GraftingError("The two individuals do not have any nodes of the same type.")
 
     # pick the receiving node
-    receiving_nodes = []
-    for idx, node in enumerate(receiver):
-        if node.ret is graft_type:
-            receiving_nodes.append(idx)
+    receiving_nodes = [0] if receiver.root.ret is graft_type else []
+    receiving_nodes += receiver_types.get(graft_type, [])
     receiver_node_idx = random.choice(receiving_nodes)
 
     # pick the contributing node
     contributing_nodes = []
-    for idx, node in enumerate(contributor):
-        if node.ret is graft_type:
-            if pset is None:
+    candidates = [0] if contributor.root.ret is graft_type else []
+    for idx in candidates + contributor_types.get(graft_type, []):
+        if pset is None:
+            contributing_nodes.append(idx)
+        else:
+            nodeset_names = set([n.name for n in contributor[contributor.searchSubtree(idx)]])
+            if nodeset_names.issubset(set(pset.mapping.keys())):
                 contributing_nodes.append(idx)
-            else:
-                nodeset_names = set([n.name for n in contributor[contributor.searchSubtree(idx)]])
-                if nodeset_names.issubset(set(pset.mapping.keys())):
-                    contributing_nodes.append(idx)
     contributor_node_idx = random.choice(contributing_nodes)
 
     # graft the contributed slice onto a copy of the receiver
@@ -159,6 +197,9 @@ class DeadBranchError(Exception):
 def genGrow(pset, max_, type_=None, prob=0.30):
     """Generate an expression tree.
     Branches can be of any height, provided they are not more than *max*.
+    Only primitives from which a complete branch can be grown within the
+    remaining height are picked, see :meth:`PrimitiveSetTyped.viablePrimitives`,
+    so the generation never has to backtrack.
 
     :param pset: Primitive set from which primitives are selected.
     :param max_: Maximum height of the produced tree.
@@ -166,54 +207,37 @@ def genGrow(pset, max_, type_=None, prob=0.30):
     :param type_: The type that the tree should return when called.
     :returns: An expression tree.
     """
-    def random_terminal():
-        terminals = pset.terminals[type_]
-        if len(terminals) == 0:
-            raise DeadBranchError("No terminal of type '%s' is available" % type_)
-        else:
-            term = random.choice(terminals)
-            # and if it's actually a class then instantiate it
-            if isclass(term):
-                term = term()
-            return [term]
-
     if type_ is None:
         type_ = pset.ret
 
-    # we're at the maximum depth, or there are no primitives to try
-    if max_ <= 1 or not len(pset.primitives[type_]):
-        return random_terminal()
-
-    # if chance dictates, return a terminal, if you can
-    try:
-        if random.random() < prob:
-            return random_terminal()
-    except DeadBranchError:
-        # No problem, press on, we'll try the prims.
-        pass
-
-    primitives = pset.primitives[type_].copy()
-    random.shuffle(primitives)
-    for prim in primitives:
-        try:
-            expr = [prim]
-            for arg in prim.args:
-                expr += genGrow(pset, max_ - 1, arg, prob)
-            return expr
-        except DeadBranchError:
-            # ok, this prim is no good, but press on and try others
-            continue
-    else:
-        # exhausted all terminals and primitives
+    terminals = pset.terminals[type_]
+    primitives = pset.viablePrimitives(type_, max_)
+    if not terminals and not primitives:
         raise DeadBranchError("Neither primitives nor terminals of type '%s' could be found" % type_)
 
+    # at the maximum depth, or if there are no primitives to try, or if
+    # chance dictates, return a terminal, if you can
+    if not primitives or (terminals and random.random() < prob):
+        term = random.choice(terminals)
+        # and if it's actually a class then instantiate it
+        if isclass(term):
+            term = term()
+        return [term]
+
+    prim = random.choice(primitives)
+    expr = [prim]
+    for arg in prim.args:
+        expr += genGrow(pset, max_ - 1, arg, prob)
+    return expr
+
 
-def selProbablistic(individuals, k):
+def selProbablistic(individuals, k, as_list=False):
     """Select *k* individuals among the input *individuals*. The
     list returned contains references to the input *individuals*.
 
     :param individuals: A list of individuals to select from.
     :param k: The number of individuals to select.
+    :param as_list: Return a list even when k is 1, rather than the individual itself.
     :returns: A list containing k individuals.
 
     The individuals returned are randomly selected from individuals according
@@ -227,33 +251,26 @@ def selProbablistic(individuals, k):
                 raise Exception("Invalid fitness: you have to ensure all the individuals have fitness values "
                                 "before calling this.")
 
-    # adjusted pop is a list of tuples (adjusted fitness, individual)
-    adjusted_pop = [(1.0 / (1.0 + i.fitness.values[0]), i) for i in individuals]
-
-    # normalised_pop is a list of tuples (float, individual) where the float indicates
-    # a 'share' of 1.0 that the individual deserves based on it's fitness relative to
-    # the other individuals. It is sorted so the best chances are at the front of the list.
-    denom = sum([fit for fit, ind in adjusted_pop])
-    normalised_pop = [(fit/denom, ind) for fit, ind in adjusted_pop]
-    normalised_pop = sorted(normalised_pop, key=lambda x: x[0], reverse=True)
-
-    # randomly select with a fitness bias
-    #FIXME: surely this can be optimized?
-    selected = []
-    for x in range(k):
-        rand = random.random()
-        accumulator = 0.0
-        for share, ind in normalised_pop:
-            accumulator += share
-            if rand <= accumulator:
-                selected.append(ind)
-                break
-    if len(selected) == 1:
+    sampler, order = probablistic_sampler(individuals)
+    selected = [individuals[order[idx]] for idx in sampler.sample(k)]
+    if len(selected) == 1 and not as_list:
         return selected[0]
     else:
         return selected
 
 
+def probablistic_sampler(individuals):
+    """Build the distribution used by selProbablistic: the adjusted fitness 1/(1+f) of each
+    individual is its weight, the best chances being at the front.
+
+    :param individuals: A list of individuals with valid fitness values.
+    :returns: a CumulativeSampler of the weights and the index of the individual of each weight
+    """
+    adjusted = [1.0 / (1.0 + ind.fitness.values[0]) for ind in individuals]
+    order = sorted(range(len(individuals)), key=adjusted.__getitem__, reverse=True)
+    return CumulativeSampler([adjusted[idx] for idx in order]), order
+
+
 def draw(individual):
     """
     Draws a node tree of the individual
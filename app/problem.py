@@ -5,6 +5,8 @@ import random
 import math
 import operator
 
+import numpy
+
 from deap import creator
 from deap import gp
 from deap import base
@@ -67,6 +69,10 @@ class RandomPoint(Point):
 # a series of random points
 A_RANDOMPOINTS = [RandomPoint() for _ in range(50)]
 
+# the same points as one (x, y) row per fitness case, and their true distances
+A_POINTS = numpy.array([(point.x, point.y) for point in A_RANDOMPOINTS])
+A_DISTANCES = numpy.hypot(A_POINTS[:, 0], A_POINTS[:, 1])
+
 # the origin point of the plane
 ORIGIN = Point(0, 0)
 
@@ -82,18 +88,18 @@ pset = gp.PrimitiveSetTyped(
 )
 
 # a couple of functions that return the x, and y, values of a point
-pset.addPrimitive(Point.getx, [Point], float, name='getx')
-pset.addPrimitive(Point.gety, [Point], float, name='gety')
+pset.addPrimitive(Point.getx, [Point], float, name='getx', vectorized=lambda P: P[:, 0])
+pset.addPrimitive(Point.gety, [Point], float, name='gety', vectorized=lambda P: P[:, 1])
 
 # a set of primitive mathematical functions
-pset.addPrimitive(operator.add, [float, float], float, name="plus")
-pset.addPrimitive(operator.sub, [float, float], float, name="minus")
+pset.addPrimitive(operator.add, [float, float], float, name="plus", vectorized=numpy.add)
+pset.addPrimitive(operator.sub, [float, float], float, name="minus", vectorized=numpy.subtract)
 
 # a set of intermediate mathematical functions
 square = lambda x: x ** 2
 sqrt = lambda x: math.sqrt(abs(x))
-pset.addPrimitive(square, [float], float, name="square")
-pset.addPrimitive(sqrt, [float], float, name="sqrt")
+pset.addPrimitive(square, [float], float, name="square", vectorized=numpy.square)
+pset.addPrimitive(sqrt, [float], float, name="sqrt", vectorized=lambda x: numpy.sqrt(numpy.abs(x)))
 
 # create a terminal for every int
 # pset.addEphemeralConstant("Rint", lambda: random.randint(0, PLANE_SIZE), int)
@@ -121,7 +127,7 @@ toolbox = base.Toolbox()
 toolbox.register("expr", genGrow, pset, max_=10, prob=0.25)
 toolbox.register("individual", tools.initIterate, creator.Individual, toolbox.expr)
 toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-toolbox.register("compile", gp.compile, pset=pset)
+toolbox.register("compile", gp.CompileCache(), pset=pset)
 
 def eval_func(individual):
     """
@@ -129,16 +135,10 @@ def eval_func(individual):
     between the output and the actual distance.
     """
     # print(individual)
-    program = toolbox.compile(expr=individual)
-    score = 0
-    try:
-        for point_in in A_RANDOMPOINTS:
-            program_distance = program(point_in)
-            true_distance = math.hypot(point_in.x, point_in.y)
-            score += min(100000, abs(true_distance - program_distance))
-    except OverflowError:
-        # just leave score at whatever before the maximum
-        pass
+    with numpy.errstate(over='ignore', invalid='ignore'):
+        program_distances = gp.evaluateVectorized(individual, pset, A_POINTS)
+        # overflows and nans score the maximum for that point
+        score = numpy.fmin(100000, numpy.abs(A_DISTANCES - program_distances)).sum()
     return score + len(individual) * 5,
 
 toolbox.register("evaluate", eval_func)
@@ -64,6 +64,10 @@ class RandomPoint(Point):
 # a series of random points
 A_RANDOMPOINTS = [RandomPoint() for _ in range(50)]
 
+# the same points as one (x, y) row per fitness case, and their true distances
+A_POINTS = numpy.array([(point.x, point.y) for point in A_RANDOMPOINTS])
+A_DISTANCES = numpy.hypot(A_POINTS[:, 0], A_POINTS[:, 1])
+
 # the origin point of the plane
 # ORIGIN = Point(0, 0)
 
@@ -92,18 +96,18 @@ def get_pset():
     )
 
     # a couple of functions that return the x, and y, values of a point
-    pset.addPrimitive(Point.getx, [Point], float, name='getx')
-    pset.addPrimitive(Point.gety, [Point], float, name='gety')
+    pset.addPrimitive(Point.getx, [Point], float, name='getx', vectorized=lambda P: P[:, 0])
+    pset.addPrimitive(Point.gety, [Point], float, name='gety', vectorized=lambda P: P[:, 1])
 
     # a set of primitive mathematical functions
-    pset.addPrimitive(operator.add, [float, float], float, name="plus")
-    pset.addPrimitive(operator.sub, [float, float], float, name="minus")
+    pset.addPrimitive(operator.add, [float, float], float, name="plus", vectorized=numpy.add)
+    pset.addPrimitive(operator.sub, [float, float], float, name="minus", vectorized=numpy.subtract)
 
     # a set of intermediate mathematical functions
     square = lambda x: x ** 2
     sqrt = lambda x: math.sqrt(abs(x))
-    pset.addPrimitive(square, [float], float, name="square")
-    pset.addPrimitive(sqrt, [float], float, name="sqrt")
+    pset.addPrimitive(square, [float], float, name="square", vectorized=numpy.square)
+    pset.addPrimitive(sqrt, [float], float, name="sqrt", vectorized=lambda x: numpy.sqrt(numpy.abs(x)))
 
     # create a terminal for every int
     #pset.addEphemeralConstant("Rint", lambda: random.randint(0, PLANE_SIZE), int)
@@ -116,15 +120,16 @@ def get_pset():
     return pset
 
 
-def get_toolbox(pset):
+def get_toolbox(pset, compiler=gp.compile):
     """
+    :param compiler: gp.compile, or gp.interpret to run the trees on the stack interpreter
     :return: a configured toolbox
     """
     toolbox = base.Toolbox()
     toolbox.register("expr", genGrow, pset, max_=5, prob=0.0)
     toolbox.register("individual", tools.initIterate, creator.Individual, toolbox.expr)
     toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-    toolbox.register("compile", gp.compile, pset=pset)
+    toolbox.register("compile", compiler, pset=pset)
 
     def eval_func(individual):
         """
@@ -132,16 +137,10 @@ def get_toolbox(pset):
         between the output and the actual distance.
         """
         #print(individual)
-        program = toolbox.compile(expr=individual)
-        score = 0
-        try:
-            for point_in in A_RANDOMPOINTS:
-                program_distance = program(point_in)
-                true_distance = math.hypot(point_in.x, point_in.y)
-                score += min(100000, abs(true_distance - program_distance))
-        except OverflowError:
-            # just leave score at whatever before the maximum
-            pass
+        with numpy.errstate(over='ignore', invalid='ignore'):
+            program_distances = gp.evaluateVectorized(individual, pset, A_POINTS)
+            # overflows and nans score the maximum for that point
+            score = numpy.fmin(100000, numpy.abs(A_DISTANCES - program_distances)).sum()
         tree = gp.PrimitiveTree(individual)
         return score + tree.height,
 
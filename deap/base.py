@@ -16,8 +16,11 @@
 """The :mod:`~deap.base` module provides basic structures to build
 evolutionary algorithms. It contains the :class:`~deap.base.Toolbox`, useful
 to store evolutionary operators, and a virtual :class:`~deap.base.Fitness`
-class used as base class, for the fitness member of any individual. """
+class used as base class, for the fitness member of any individual. The
+:class:`~deap.base.ProcessPoolMap` is a parallel replacement for the
+toolbox's :func:`map`. """
 
+import multiprocessing
 import sys
 
 from collections import Sequence
@@ -25,12 +28,43 @@ from copy import deepcopy
 from functools import partial
 from operator import mul, truediv
 
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+    ProcessPoolExecutor = None
+
+
+_clones = {}
+
+def registerClone(type_, function):
+    """Make :func:`clone` duplicate the instances of *type_*, and of its
+    subclasses, with *function* instead of :func:`copy.deepcopy`.
+
+    :param type_: A class.
+    :param function: A function taking an instance of *type_* and returning
+                     an independent copy of it.
+    """
+    _clones[type_] = function
+
+def clone(obj):
+    """Duplicate *obj*, the default :meth:`~deap.base.Toolbox.clone` of the
+    toolboxes. Any object is deep copied with :func:`copy.deepcopy`, unless
+    a cheaper clone was registered for its type with :func:`registerClone`.
+    The :mod:`deap.gp` trees are registered this way, see
+    :func:`~deap.gp.cloneTree`.
+    """
+    for class_ in type(obj).__mro__:
+        function = _clones.get(class_)
+        if function is not None:
+            return function(obj)
+    return deepcopy(obj)
+
 
 class Toolbox(object):
     """A toolbox for evolution that contains the evolutionary operators. At
     first the toolbox contains a :meth:`~deap.toolbox.clone` method that
     duplicates any element it is passed as argument, this method defaults to
-    the :func:`copy.deepcopy` function. and a :meth:`~deap.toolbox.map`
+    the :func:`~deap.base.clone` function. and a :meth:`~deap.toolbox.map`
     method that applies the function given as first argument to every items
     of the iterables given as next arguments, this method defaults to the
     :func:`map` function. You may populate the toolbox with any other
@@ -42,7 +76,7 @@ class Toolbox(object):
     """
 
     def __init__(self):
-        self.register("clone", deepcopy)
+        self.register("clone", clone)
         self.register("map", map)
 
     def register(self, alias, function, *args, **kargs):
@@ -262,3 +296,82 @@ class Fitness(object):
         """Return the Python code to build a copy of the object."""
         return "%s.%s(%r)" % (self.__module__, self.__class__.__name__,
                               self.values if self.valid else tuple())
+
+
+def _mapChunk(function, chunk):
+    return [function(*args) for args in chunk]
+
+
+class ProcessPoolMap(object):
+    """Replacement for the builtin :func:`map` to register as the toolbox's
+    :meth:`~deap.toolbox.map`, that applies the function in a
+    :class:`concurrent.futures.ProcessPoolExecutor`. ::
+
+        >>> pmap = ProcessPoolMap()
+        >>> toolbox.register("map", pmap)
+
+    The items are submitted in chunks, *chunksize* items at a time, or by
+    default as many chunks as four times the number of workers. A chunk is
+    pickled as a whole, hence the nodes shared by the trees of a chunk are
+    sent only once. The *pack* function, when given, is applied to every
+    argument before it is sent, for example :func:`deap.gp.packTree` to send
+    the trees of the individuals as compact :class:`~deap.gp.PrimitiveArrayTree`.
+
+    The results are returned as a list, in the order of the items. The
+    function and its arguments must be picklable; the workers must be able
+    to import the function, as well as the classes created by the
+    :mod:`~deap.creator` and the ephemeral constants of the primitive sets.
+
+    :param max_workers: The number of processes, by default the number of
+                        processors.
+    :param chunksize: The number of items sent to a worker at a time,
+                      optional.
+    :param pack: A function applied to every argument before sending it,
+                 optional.
+
+    The pool is started on the first call and stopped by :meth:`close`, or
+    when leaving the object used as a context manager.
+    """
+    def __init__(self, max_workers=None, chunksize=None, pack=None):
+        if ProcessPoolExecutor is None:
+            raise ImportError("ProcessPoolMap requires the concurrent.futures module.")
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.chunksize = chunksize
+        self.pack = pack
+        self.executor = None
+
+    def __call__(self, function, *iterables):
+        if self.pack is None:
+            items = list(zip(*iterables))
+        else:
+            items = [tuple(self.pack(arg) for arg in args) for args in zip(*iterables)]
+        if len(items) == 0:
+            return []
+
+        chunksize = self.chunksize
+        if chunksize is None:
+            chunksize = max(1, -(-len(items) // (4 * self.max_workers)))
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.max_workers)
+        futures = [self.executor.submit(_mapChunk, function, items[i:i + chunksize])
+                   for i in range(0, len(items), chunksize)]
+
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def close(self):
+        """Shut the pool of processes down, a new one is started if the
+        object is called again.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
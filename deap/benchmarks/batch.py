@@ -0,0 +1,243 @@
+#    This file is part of DEAP.
+#
+#    DEAP is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as
+#    published by the Free Software Foundation, either version 3 of
+#    the License, or (at your option) any later version.
+#
+#    DEAP is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public
+#    License along with DEAP. If not, see <http://www.gnu.org/licenses/>.
+"""
+Batched versions of the benchmarks functions of :mod:`deap.benchmarks`.
+Each function takes a whole population as an array of shape (N, dim), or
+anything :func:`numpy.asarray` converts to such an array, and returns the
+fitness values of every individual as an array of shape (N, n_obj). ::
+
+    >>> population = numpy.zeros((3, 4))
+    >>> rastrigin(population)
+    array([[0.],
+           [0.],
+           [0.]])
+
+The decorators of :mod:`deap.benchmarks.tools` have batched forms for these
+functions, see :class:`~deap.benchmarks.tools.translate_batch`.
+"""
+
+import numpy
+from numpy import sin, cos, pi, exp, e, sqrt
+
+def _population(individuals):
+    return numpy.asarray(individuals, dtype=float).reshape(len(individuals), -1)
+
+def _column(values):
+    return values.reshape(-1, 1)
+
+# Unimodal
+def plane(individuals):
+    """Batched :func:`~deap.benchmarks.plane`."""
+    return _column(_population(individuals)[:, 0].copy())
+
+def sphere(individuals):
+    """Batched :func:`~deap.benchmarks.sphere`."""
+    x = _population(individuals)
+    return _column((x * x).sum(axis=1))
+
+def cigar(individuals):
+    """Batched :func:`~deap.benchmarks.cigar`."""
+    x = _population(individuals)
+    return _column(x[:, 0]**2 + 1e6 * (x * x).sum(axis=1))
+
+def rosenbrock(individuals):
+    """Batched :func:`~deap.benchmarks.rosenbrock`."""
+    x = _population(individuals)
+    x, y = x[:, :-1], x[:, 1:]
+    return _column((100 * (x * x - y)**2 + (1. - x)**2).sum(axis=1))
+
+def h1(individuals):
+    """Batched :func:`~deap.benchmarks.h1`."""
+    x = _population(individuals)
+    num = sin(x[:, 0] - x[:, 1] / 8)**2 + sin(x[:, 1] + x[:, 0] / 8)**2
+    denum = ((x[:, 0] - 8.6998)**2 + (x[:, 1] - 6.7665)**2)**0.5 + 1
+    return _column(num / denum)
+
+# Multimodal
+def ackley(individuals):
+    """Batched :func:`~deap.benchmarks.ackley`."""
+    x = _population(individuals)
+    N = x.shape[1]
+    return _column(20 - 20 * exp(-0.2 * sqrt(1.0/N * (x**2).sum(axis=1)))
+                   + e - exp(1.0/N * cos(2*pi*x).sum(axis=1)))
+
+def bohachevsky(individuals):
+    """Batched :func:`~deap.benchmarks.bohachevsky`."""
+    x = _population(individuals)
+    x, x1 = x[:, :-1], x[:, 1:]
+    return _column((x**2 + 2*x1**2 - 0.3*cos(3*pi*x) - 0.4*cos(4*pi*x1) + 0.7).sum(axis=1))
+
+def griewank(individuals):
+    """Batched :func:`~deap.benchmarks.griewank`."""
+    x = _population(individuals)
+    i = numpy.arange(1, x.shape[1] + 1)
+    return _column(1.0/4000.0 * (x**2).sum(axis=1) - cos(x / sqrt(i)).prod(axis=1) + 1)
+
+def rastrigin(individuals):
+    """Batched :func:`~deap.benchmarks.rastrigin`."""
+    x = _population(individuals)
+    return _column(10 * x.shape[1] + (x * x - 10 * cos(2 * pi * x)).sum(axis=1))
+
+def rastrigin_scaled(individuals):
+    """Batched :func:`~deap.benchmarks.rastrigin_scaled`."""
+    x = _population(individuals)
+    N = x.shape[1]
+    y = 10**(numpy.arange(N) / (N - 1)) * x
+    return _column(10*N + (y**2 - 10*cos(2*pi*y)).sum(axis=1))
+
+def rastrigin_skew(individuals):
+    """Batched :func:`~deap.benchmarks.rastrigin_skew`."""
+    x = _population(individuals)
+    y = numpy.where(x > 0, 10*x, x)
+    return _column(10*x.shape[1] + (y**2 - 10*cos(2*pi*y)).sum(axis=1))
+
+def schaffer(individuals):
+    """Batched :func:`~deap.benchmarks.schaffer`."""
+    x = _population(individuals)
+    r = x[:, :-1]**2 + x[:, 1:]**2
+    return _column((r**0.25 * (sin(50*r**0.1)**2 + 1.0)).sum(axis=1))
+
+def schwefel(individuals):
+    """Batched :func:`~deap.benchmarks.schwefel`."""
+    x = _population(individuals)
+    return _column(418.9828872724339*x.shape[1] - (x*sin(sqrt(abs(x)))).sum(axis=1))
+
+def himmelblau(individuals):
+    """Batched :func:`~deap.benchmarks.himmelblau`."""
+    x = _population(individuals)
+    return _column((x[:, 0] * x[:, 0] + x[:, 1] - 11)**2 +
+                   (x[:, 0] + x[:, 1] * x[:, 1] - 7)**2)
+
+def shekel(individuals, a, c):
+    """Batched :func:`~deap.benchmarks.shekel`, all the maxima being
+    evaluated at once.
+    """
+    x = _population(individuals)
+    a = numpy.asarray(a, dtype=float)
+    distances = ((x[:, None, :] - a[None, :, :])**2).sum(axis=2)
+    return _column((1. / (numpy.asarray(c, dtype=float) + distances)).sum(axis=1))
+
+# Multiobjectives
+def kursawe(individuals):
+    """Batched :func:`~deap.benchmarks.kursawe`."""
+    x = _population(individuals)
+    f1 = (-10 * exp(-0.2 * sqrt(x[:, :-1]**2 + x[:, 1:]**2))).sum(axis=1)
+    f2 = (abs(x)**0.8 + 5 * sin(x * x * x)).sum(axis=1)
+    return numpy.column_stack((f1, f2))
+
+def schaffer_mo(individuals):
+    """Batched :func:`~deap.benchmarks.schaffer_mo`."""
+    x = _population(individuals)[:, 0]
+    return numpy.column_stack((x ** 2, (x - 2) ** 2))
+
+def _zdtG(x):
+    return 1.0 + 9.0*x[:, 1:].sum(axis=1)/(x.shape[1]-1)
+
+def zdt1(individuals):
+    """Batched :func:`~deap.benchmarks.zdt1`."""
+    x = _population(individuals)
+    g = _zdtG(x)
+    f1 = x[:, 0]
+    return numpy.column_stack((f1, g * (1 - sqrt(f1/g))))
+
+def zdt2(individuals):
+    """Batched :func:`~deap.benchmarks.zdt2`."""
+    x = _population(individuals)
+    g = _zdtG(x)
+    f1 = x[:, 0]
+    return numpy.column_stack((f1, g * (1 - (f1/g)**2)))
+
+def zdt3(individuals):
+    """Batched :func:`~deap.benchmarks.zdt3`."""
+    x = _population(individuals)
+    g = _zdtG(x)
+    f1 = x[:, 0]
+    return numpy.column_stack((f1, g * (1 - sqrt(f1/g) - f1/g * sin(10*pi*f1))))
+
+def zdt4(individuals):
+    """Batched :func:`~deap.benchmarks.zdt4`."""
+    x = _population(individuals)
+    xi = x[:, 1:]
+    g = 1 + 10*(x.shape[1]-1) + (xi**2 - 10*cos(4*pi*xi)).sum(axis=1)
+    f1 = x[:, 0]
+    return numpy.column_stack((f1, g * (1 - sqrt(f1/g))))
+
+def zdt6(individuals):
+    """Batched :func:`~deap.benchmarks.zdt6`."""
+    x = _population(individuals)
+    g = 1 + 9 * (x[:, 1:].sum(axis=1) / (x.shape[1]-1))**0.25
+    f1 = 1 - exp(-4*x[:, 0]) * sin(6*pi*x[:, 0])**6
+    return numpy.column_stack((f1, g * (1 - (f1/g)**2)))
+
+def _prefixProducts(x):
+    # Column m holds the product of the m first columns of x
+    return numpy.hstack((numpy.ones((len(x), 1)), numpy.cumprod(x, axis=1)))
+
+def _dtlzG1(xm):
+    return 100 * (xm.shape[1] + ((xm-0.5)**2 - cos(20*pi*(xm-0.5))).sum(axis=1))
+
+def _dtlzSpherical(xc, g, obj):
+    # The objectives of dtlz2 to dtlz4 on the angles *xc*, the first being
+    # the product of all the cosines, the others replacing the last cosine
+    # of a product of m cosines by a sine, for m from obj-2 to 0
+    prefix = _prefixProducts(cos(0.5*xc*pi))
+    m = numpy.arange(obj-2, -1, -1)
+    f = numpy.hstack((prefix[:, obj-1:obj], prefix[:, m] * sin(0.5*xc[:, m]*pi)))
+    return (1.0+g)[:, None] * f
+
+def dtlz1(individuals, obj):
+    """Batched :func:`~deap.benchmarks.dtlz1`."""
+    x = _population(individuals)
+    g = _dtlzG1(x[:, obj-1:])
+    prefix = _prefixProducts(x[:, :obj-1])
+    m = numpy.arange(obj-2, -1, -1)
+    f = numpy.hstack((prefix[:, obj-1:obj], prefix[:, m] * (1 - x[:, m])))
+    return 0.5 * (1 + g)[:, None] * f
+
+def dtlz2(individuals, obj):
+    """Batched :func:`~deap.benchmarks.dtlz2`."""
+    x = _population(individuals)
+    g = ((x[:, obj-1:]-0.5)**2).sum(axis=1)
+    return _dtlzSpherical(x[:, :obj-1], g, obj)
+
+def dtlz3(individuals, obj):
+    """Batched :func:`~deap.benchmarks.dtlz3`."""
+    x = _population(individuals)
+    return _dtlzSpherical(x[:, :obj-1], _dtlzG1(x[:, obj-1:]), obj)
+
+def dtlz4(individuals, obj, alpha):
+    """Batched :func:`~deap.benchmarks.dtlz4`."""
+    x = _population(individuals)
+    g = ((x[:, obj-1:]-0.5)**2).sum(axis=1)
+    return _dtlzSpherical(x[:, :obj-1]**alpha, g, obj)
+
+def fonseca(individuals):
+    """Batched :func:`~deap.benchmarks.fonseca`."""
+    x = _population(individuals)[:, :3]
+    f_1 = 1 - exp(-((x - 1/sqrt(3))**2).sum(axis=1))
+    f_2 = 1 - exp(-((x + 1/sqrt(3))**2).sum(axis=1))
+    return numpy.column_stack((f_1, f_2))
+
+def poloni(individuals):
+    """Batched :func:`~deap.benchmarks.poloni`."""
+    x = _population(individuals)
+    x_1 = x[:, 0]
+    x_2 = x[:, 1]
+    A_1 = 0.5 * sin(1) - 2 * cos(1) + sin(2) - 1.5 * cos(2)
+    A_2 = 1.5 * sin(1) - cos(1) + 2 * sin(2) - 0.5 * cos(2)
+    B_1 = 0.5 * sin(x_1) - 2 * cos(x_1) + sin(x_2) - 1.5 * cos(x_2)
+    B_2 = 1.5 * sin(x_1) - cos(x_1) + 2 * sin(x_2) - 0.5 * cos(x_2)
+    return numpy.column_stack((1 + (A_1 - B_1)**2 + (A_2 - B_2)**2,
+                               (x_1 + 3)**2 + (x_2 + 1)**2))
@@ -15,6 +15,35 @@
 
 from math import exp, sin, cos
 
+def parity_masks(fanin):
+    """Even parity truth table over *fanin* inputs, packed for
+    :func:`~deap.gp.evaluateBitwise`. Case *i* of the :math:`2^{fanin}`
+    cases sets input *j* to bit :math:`fanin - 1 - j` of *i*, so that the
+    first input is the most significant, and expects true when an even
+    number of inputs are set.
+
+    :param fanin: The number of inputs of the parity function.
+    :returns: A list of one integer mask per input, the mask of the expected
+              outputs and the mask with a bit set for every case.
+    """
+    ncases = 2 ** fanin
+    full = (1 << ncases) - 1
+    inputs = []
+    for j in range(fanin):
+        # Bit k of the case index alternates every 2**k cases: repeat a
+        # block of 2**k zeros followed by 2**k ones over all the cases.
+        width = 2 ** (fanin - 1 - j)
+        mask = ((1 << width) - 1) << width
+        length = 2 * width
+        while length < ncases:
+            mask |= mask << length
+            length *= 2
+        inputs.append(mask)
+    outputs = full
+    for mask in inputs:
+        outputs ^= mask
+    return inputs, outputs, full
+
 def kotanchek(data):
     """Kotanchek benchmark function.
     
@@ -26,6 +26,11 @@ import itertools
 import random
 from collections import Sequence
 
+try:
+    import numpy
+except ImportError:
+    numpy = False
+
 def cone(individual, position, height, width):
     """The cone peak function to be used with scenario 2 and 3.
     
@@ -54,6 +59,19 @@ def function1(individual, position, height, width):
         value += (x - p)**2
     return height / (1 + width * value)
 
+# Peak functions of all the individuals against all the peaks at once, from
+# the (N, K) squared distances to the K peaks of given heights and widths
+def _coneBatch(sqdist, height, width):
+    return height - width * numpy.sqrt(sqdist)
+
+def _sphereBatch(sqdist, height, width):
+    return height * sqdist
+
+def _function1Batch(sqdist, height, width):
+    return height / (1 + width * sqdist)
+
+_BATCH_FUNCTIONS = {cone: _coneBatch, sphere: _sphereBatch, function1: _function1Batch}
+
 class MovingPeaks:
     """The Moving Peaks Benchmark is a fitness function changing over time. It
     consists of a number of peaks, changing in height, width and location. The
@@ -106,6 +124,9 @@ class MovingPeaks:
     
     .. plot:: code/benchmarks/movingsc1.py
        :width: 67 %
+
+    A whole population can be evaluated at once with :meth:`evaluateBatch`,
+    which requires NumPy.
     """
     def __init__(self, dim, random=random, **kargs):
         # Scenario 1 is the default
@@ -178,6 +199,11 @@ class MovingPeaks:
     def globalMaximum(self):
         """Returns the global maximum value and position."""
         # The global maximum is at one peak's position
+        if numpy:
+            positions = numpy.array(self.peaks_position, dtype=float).reshape(-1, self.dim)
+            values = self._peaksValues(positions)
+            return max(zip(values.diagonal().tolist(), self.peaks_position))
+
         potential_max = list()
         for func, pos, height, width in zip(self.peaks_function,
                                             self.peaks_position,
@@ -193,6 +219,18 @@ class MovingPeaks:
         # The maximums are at the peaks position but might be swallowed by 
         # other peaks
         maximums = list()
+        if numpy:
+            # A peak is visible when its value at its position is the
+            # fitness at this position
+            positions = numpy.array(self.peaks_position, dtype=float).reshape(-1, self.dim)
+            values = self._peaksValues(positions)
+            fitness = self._fitness(values, self.peaks_position)
+            for val, fit, pos in zip(values.diagonal().tolist(), fitness.tolist(),
+                                     self.peaks_position):
+                if val >= fit:
+                    maximums.append((val, pos))
+            return sorted(maximums, reverse=True)
+
         for func, pos, height, width in zip(self.peaks_function,
                                             self.peaks_position,
                                             self.peaks_height,
@@ -239,6 +277,76 @@ class MovingPeaks:
         
         return fitness,
     
+    def evaluateBatch(self, individuals, count=True):
+        """Evaluate all the *individuals* at once with the current benchmark
+        configuration, holding the peaks in NumPy arrays. The evaluations
+        are counted in order as with :meth:`__call__`: the offline and
+        current errors are the same, and the peaks change after the
+        individual completing a period, the following individuals being
+        evaluated on the new peaks.
+
+        :param individuals: The individuals to evaluate, or an array of
+                            shape (N, dim).
+        :param count: Wether or not to count these evaluations in
+                      the total evaluation count. (Defaults to
+                      :data:`True`)
+        :returns: An array of shape (N, 1) of the fitnesses.
+        """
+        if not numpy:
+            raise RuntimeError("Numpy is required for evaluating a batch of "
+                "individuals")
+        points = numpy.asarray(individuals, dtype=float).reshape(len(individuals), self.dim)
+        fitness = numpy.empty(len(points))
+        start = 0
+        while start < len(points):
+            stop = len(points)
+            if count and self.period > 0:
+                stop = min(stop, start + self.period - self.nevals % self.period)
+            values = self._peaksValues(points[start:stop])
+            fitness[start:stop] = self._fitness(values, individuals[start:stop])
+            if count:
+                self._countBatch(fitness[start:stop])
+            start = stop
+        return fitness.reshape(-1, 1)
+
+    def _peaksValues(self, points):
+        # Values of every peak for every point, shape (N, K)
+        positions = numpy.array(self.peaks_position, dtype=float).reshape(-1, self.dim)
+        heights = numpy.array(self.peaks_height, dtype=float)
+        widths = numpy.array(self.peaks_width, dtype=float)
+        sqdist = ((points[:, None, :] - positions[None, :, :])**2).sum(axis=2)
+        values = numpy.empty_like(sqdist)
+        for func in set(self.peaks_function):
+            idx = [i for i, f in enumerate(self.peaks_function) if f is func]
+            batch_func = _BATCH_FUNCTIONS.get(func)
+            if batch_func is not None:
+                values[:, idx] = batch_func(sqdist[:, idx], heights[idx], widths[idx])
+            else:
+                for i in idx:
+                    values[:, i] = [func(point, self.peaks_position[i], self.peaks_height[i],
+                                         self.peaks_width[i]) for point in points.tolist()]
+        return values
+
+    def _fitness(self, values, individuals):
+        fitness = values.max(axis=1, initial=-numpy.inf)
+        if self.basis_function:
+            basis = [self.basis_function(ind) for ind in individuals]
+            fitness = numpy.maximum(fitness, basis)
+        return fitness
+
+    def _countBatch(self, fitness):
+        if self._optimum is None:
+            self._optimum = self.globalMaximum()[0]
+            self._error = abs(fitness[0] - self._optimum)
+        errors = numpy.minimum.accumulate(numpy.abs(fitness - self._optimum))
+        errors = numpy.minimum(errors, self._error).tolist()
+        # Sequential sum, as many evaluations one at a time
+        self._offline_error = sum(errors, self._offline_error)
+        self._error = errors[-1]
+        self.nevals += len(errors)
+        if self.period > 0 and self.nevals % self.period == 0:
+            self.changePeaks()
+
     def offlineError(self):
         return self._offline_error / self.nevals
 
@@ -8,12 +8,10 @@ try:
 except ImportError:
     numpy = False
 
-try:
-    # try importing the C version
-    from ..tools._hypervolume import hv
-except ImportError:
-    # fallback on python version
-    from ..tools._hypervolume import pyhv as hv
+from ..tools._hypervolume import load
+
+# The C version when it can be imported, the NumPy version otherwise
+hv = load()
 
 class translate(object):
     """Decorator for evaluation functions, it translates the objective
@@ -246,6 +244,93 @@ class bound(object):
         elif type == "clip":
             self.bound = self._clip
         
+class translate_batch(translate):
+    """Batched form of :class:`translate` for the functions of
+    :mod:`deap.benchmarks.batch`. The decorated function receives the array
+    of shape (N, dim) of the individuals translated by *vector*.
+    """
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(individuals, *args, **kargs):
+            return func(numpy.asarray(individuals, dtype=float) - numpy.asarray(self.vector),
+                *args, **kargs)
+        wrapper.translate = self.translate
+        return wrapper
+
+class rotate_batch(rotate):
+    """Batched form of :class:`rotate` for the functions of
+    :mod:`deap.benchmarks.batch`. The decorated function receives the array
+    of shape (N, dim) of the individuals rotated by *matrix*, computed with
+    a single matrix product.
+    """
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(individuals, *args, **kargs):
+            return func(numpy.dot(individuals, self.matrix.T), *args, **kargs)
+        wrapper.rotate = self.rotate
+        return wrapper
+
+class noise_batch(noise):
+    """Batched form of :class:`noise` for the functions of
+    :mod:`deap.benchmarks.batch`. The noise functions are called once per
+    individual, objective after objective, and their values added to the
+    columns of the array of shape (N, n_obj) returned by the decorated
+    function.
+    """
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(individuals, *args, **kargs):
+            result = numpy.array(func(individuals, *args, **kargs), dtype=float)
+            for column, f in zip(result.T, self.rand_funcs):
+                if f is not None:
+                    column += [f() for _ in range(len(column))]
+            return result
+        wrapper.noise = self.noise
+        return wrapper
+
+class scale_batch(scale):
+    """Batched form of :class:`scale` for the functions of
+    :mod:`deap.benchmarks.batch`. The decorated function receives the array
+    of shape (N, dim) of the individuals scaled by the inverse of *factor*.
+    """
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(individuals, *args, **kargs):
+            return func(numpy.asarray(individuals, dtype=float) * numpy.asarray(self.factor),
+                *args, **kargs)
+        wrapper.scale = self.scale
+        return wrapper
+
+class bound_batch(bound):
+    """Batched form of :class:`bound` for variation functions returning
+    arrays of shape (N, dim), or tuples of such arrays. The *bounds* are a
+    pair *(low, up)* of values or of arrays of one value per dimension, and
+    the *type* "clip", "wrap" or "mirror" determines how the attributes are
+    brought back into the valid range, all the individuals at once.
+    """
+    def _clip(self, individuals):
+        if isinstance(individuals, tuple):
+            return tuple(self._clip(ind) for ind in individuals)
+        return numpy.clip(individuals, self.low, self.up)
+
+    def _wrap(self, individuals):
+        if isinstance(individuals, tuple):
+            return tuple(self._wrap(ind) for ind in individuals)
+        return self.low + numpy.mod(individuals - self.low, self.up - self.low)
+
+    def _mirror(self, individuals):
+        if isinstance(individuals, tuple):
+            return tuple(self._mirror(ind) for ind in individuals)
+        width = self.up - self.low
+        folded = numpy.mod(individuals - self.low, 2 * width)
+        return self.low + numpy.where(folded > width, 2 * width - folded, folded)
+
+    def __init__(self, bounds, type):
+        low, up = bounds
+        self.low = numpy.asarray(low, dtype=float)
+        self.up = numpy.asarray(up, dtype=float)
+        bound.__init__(self, bounds, type)
+
 def diversity(first_front, first, last):
     """Given a Pareto front `first_front` and the two extreme points of the 
     optimal Pareto front, this function returns a metric of the diversity 
@@ -289,16 +374,20 @@ def convergence(first_front, optimal_front):
     return sum(distances) / len(distances)
 
 
-def hypervolume(front, ref=None):
+def hypervolume(front, ref=None, backend=None):
     """Return the hypervolume of a *front*. If the *ref* point is not
     given, the worst value for each objective +1 is used.
 
     :param front: The population (usually a list of undominated individuals)
                   on which to compute the hypervolume.
     :param ref: A point of the same dimensionality as the individuals in *front*.
+    :param backend: The hypervolume version to use, "c", "numpy" or
+                    "python", by default the C version when it is available
+                    and the NumPy version otherwise.
     """
     # Must use wvalues * -1 since hypervolume use implicit minimization
     wobj = numpy.array([ind.fitness.wvalues for ind in front]) * -1
     if ref is None:
         ref = numpy.max(wobj, axis=0) + 1
-    return hv.hypervolume(wobj, ref)
\ No newline at end of file
+    hv_ = load(backend) if backend is not None else hv
+    return hv_.hypervolume(wobj, ref)
\ No newline at end of file
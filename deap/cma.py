@@ -76,7 +76,16 @@ class Strategy(object):
     |                | mueff) / ((N + 2)^2 +     | update.                    |
     |                | mueff)``                  |                            |
     +----------------+---------------------------+----------------------------+
+    | ``lazy``       | ``False``                 | Decompose the covariance   |
+    |                |                           | matrix only every ``1 /    |
+    |                |                           | (10 * N * (ccov1 +         |
+    |                |                           | ccovmu))`` generations.    |
+    +----------------+---------------------------+----------------------------+
 
+    In the lazy mode, the eigendecomposition of the covariance matrix, which
+    costs :math:`O(N^3)`, is done only once the matrix had time to change
+    significantly, as in Hansen's reference implementations. The sampling
+    and the step-size path use the last decomposition in between.
     """
     def __init__(self, centroid, sigma, **kargs):
         self.params = kargs
@@ -92,17 +101,10 @@ class Strategy(object):
                                       1. / (21. * self.dim ** 2))
 
         self.C = self.params.get("cmatrix", numpy.identity(self.dim))
-        self.diagD, self.B = numpy.linalg.eigh(self.C)
-
-        indx = numpy.argsort(self.diagD)
-        self.diagD = self.diagD[indx] ** 0.5
-        self.B = self.B[:, indx]
-        self.BD = self.B * self.diagD
-
-        self.cond = self.diagD[indx[-1]] / self.diagD[indx[0]]
+        self.update_count = 0
+        self.decompose()
 
         self.lambda_ = self.params.get("lambda_", int(4 + 3 * log(self.dim)))
-        self.update_count = 0
         self.computeParams(self.params)
 
     def generate(self, ind_init):
@@ -125,9 +127,10 @@ class Strategy(object):
                            parameters.
         """
         population.sort(key=lambda ind: ind.fitness, reverse=True)
+        arx = numpy.array(population[0:self.mu], dtype=float)
 
         old_centroid = self.centroid
-        self.centroid = numpy.dot(self.weights, population[0:self.mu])
+        self.centroid = numpy.dot(self.weights, arx)
 
         c_diff = self.centroid - old_centroid
 
@@ -147,8 +150,9 @@ class Strategy(object):
             * sqrt(self.cc * (2 - self.cc) * self.mueff) / self.sigma \
             * c_diff
 
-        # Update covariance matrix
-        artmp = population[0:self.mu] - old_centroid
+        # Update covariance matrix, the rank-mu update of all the selected
+        # steps in a single matrix product
+        artmp = arx - old_centroid
         self.C = (1 - self.ccov1 - self.ccovmu + (1 - hsig)
                   * self.ccov1 * self.cc * (2 - self.cc)) * self.C \
             + self.ccov1 * numpy.outer(self.pc, self.pc) \
@@ -158,6 +162,14 @@ class Strategy(object):
         self.sigma *= numpy.exp((numpy.linalg.norm(self.ps) / self.chiN - 1.)
                                 * self.cs / self.damps)
 
+        if self.update_count - self.decompose_count >= self.decompose_gap:
+            self.decompose()
+
+    def decompose(self):
+        """Compute the eigendecomposition of the covariance matrix used to
+        sample the individuals. It is called by :meth:`update` every
+        generation or, in the lazy mode, only every few generations.
+        """
         self.diagD, self.B = numpy.linalg.eigh(self.C)
         indx = numpy.argsort(self.diagD)
 
@@ -166,6 +178,7 @@ class Strategy(object):
         self.diagD = self.diagD[indx] ** 0.5
         self.B = self.B[:, indx]
         self.BD = self.B * self.diagD
+        self.decompose_count = self.update_count
 
     def computeParams(self, params):
         """Computes the parameters depending on :math:`\lambda`. It needs to
@@ -201,6 +214,11 @@ class Strategy(object):
                                            (self.dim + 1.)) - 1.) + self.cs
         self.damps = params.get("damps", self.damps)
 
+        self.decompose_gap = 1
+        if params.get("lazy", False):
+            self.decompose_gap = max(1, int(1. / (10. * self.dim *
+                                                  (self.ccov1 + self.ccovmu))))
+
 
 class StrategyOnePlusLambda(object):
     """
@@ -373,13 +391,14 @@ class StrategyMultiObjective(object):
         self.ccov = params.get("ccov", 2.0 / (self.dim ** 2 + 6.0))
         self.pthresh = params.get("pthresh", 0.44)
 
-        # Internal parameters associated to the mu parent
+        # Internal parameters associated to the mu parent, the matrices and
+        # paths being stacked along the first axis
         self.sigmas = [sigma] * len(population)
         # Lower Cholesky matrix (Sampling matrix)
-        self.A = [numpy.identity(self.dim) for _ in range(len(population))]
+        self.A = numpy.tile(numpy.identity(self.dim), (len(population), 1, 1))
         # Inverse Cholesky matrix (Used in the update of A)
-        self.invCholesky = [numpy.identity(self.dim) for _ in range(len(population))]
-        self.pc = [numpy.zeros(self.dim) for _ in range(len(population))]
+        self.invCholesky = numpy.tile(numpy.identity(self.dim), (len(population), 1, 1))
+        self.pc = numpy.zeros((len(population), self.dim))
         self.psucc = [self.ptarg] * len(population)
 
         self.indicator = params.get("indicator", tools.hypervolume)
@@ -396,7 +415,6 @@ class StrategyMultiObjective(object):
                   of its parent.
         """
         arz = numpy.random.randn(self.lambda_, self.dim)
-        individuals = list()
 
         # Make sure every parent has a parent tag and index
         for i, p in enumerate(self.parents):
@@ -404,20 +422,21 @@ class StrategyMultiObjective(object):
 
         # Each parent produce an offspring
         if self.lambda_ == self.mu:
-            for i in range(self.lambda_):
-                # print "Z", list(arz[i])
-                individuals.append(ind_init(self.parents[i] + self.sigmas[i] * numpy.dot(self.A[i], arz[i])))
-                individuals[-1]._ps = "o", i
+            p_idx = list(range(self.lambda_))
 
         # Parents producing an offspring are chosen at random from the first front
         else:
             ndom = tools.sortLogNondominated(self.parents, len(self.parents), first_front_only=True)
-            for i in range(self.lambda_):
-                j = numpy.random.randint(0, len(ndom))
-                _, p_idx = ndom[j]._ps
-                individuals.append(ind_init(self.parents[p_idx] + self.sigmas[p_idx] * numpy.dot(self.A[p_idx], arz[i])))
-                individuals[-1]._ps = "o", p_idx
+            p_idx = [ndom[numpy.random.randint(0, len(ndom))]._ps[1] for _ in range(self.lambda_)]
 
+        # All the steps at once, each one with the matrix of its parent
+        steps = numpy.einsum("ijk,ik->ij", self.A[p_idx], arz)
+        steps *= numpy.array(self.sigmas)[p_idx, None]
+        arx = numpy.array(self.parents, dtype=float)[p_idx] + steps
+
+        individuals = list(map(ind_init, arx))
+        for ind, i in zip(individuals, p_idx):
+            ind._ps = "o", i
         return individuals
 
     def _select(self, candidates):
@@ -462,18 +481,25 @@ class StrategyMultiObjective(object):
         return chosen, not_chosen
 
     def _rankOneUpdate(self, invCholesky, A, alpha, beta, v):
-        w = numpy.dot(invCholesky, v)
+        # Rank one updates of the matrices stacked along the first axis,
+        # modified in place
+        w = numpy.einsum("ijk,ik->ij", invCholesky, v)
 
         # Under this threshold, the update is mostly noise
-        if w.max() > 1e-20:
-            w_inv = numpy.dot(w, invCholesky)
-            norm_w2 = numpy.sum(w ** 2)
-            a = sqrt(alpha)
+        update = w.max(axis=1) > 1e-20
+        if update.any():
+            invC, alpha, v, w = invCholesky[update], alpha[update], v[update], w[update]
+            w_inv = numpy.einsum("ij,ijk->ik", w, invC)
+            norm_w2 = numpy.sum(w ** 2, axis=1)
+            a = numpy.sqrt(alpha)
             root = numpy.sqrt(1 + beta / alpha * norm_w2)
             b = a / norm_w2 * (root - 1)
 
-            A = a * A + b * numpy.outer(v, w)
-            invCholesky = 1.0 / a * invCholesky - b / (a ** 2 + a * b * norm_w2) * numpy.outer(w, w_inv)
+            A[update] = a[:, None, None] * A[update] \
+                + b[:, None, None] * numpy.einsum("ij,ik->ijk", v, w)
+            invCholesky[update] = (1.0 / a)[:, None, None] * invC \
+                - (b / (a ** 2 + a * b * norm_w2))[:, None, None] \
+                * numpy.einsum("ij,ik->ijk", w, w_inv)
 
         return invCholesky, A
 
@@ -489,36 +515,28 @@ class StrategyMultiObjective(object):
         cp, cc, ccov = self.cp, self.cc, self.ccov
         d, ptarg, pthresh = self.d, self.ptarg, self.pthresh
 
-        # Make copies for chosen offspring only
-        last_steps = [self.sigmas[ind._ps[1]] if ind._ps[0] == "o" else None for ind in chosen]
-        sigmas = [self.sigmas[ind._ps[1]] if ind._ps[0] == "o" else None for ind in chosen]
-        invCholesky = [self.invCholesky[ind._ps[1]].copy() if ind._ps[0] == "o" else None for ind in chosen]
-        A = [self.A[ind._ps[1]].copy() if ind._ps[0] == "o" else None for ind in chosen]
-        pc = [self.pc[ind._ps[1]].copy() if ind._ps[0] == "o" else None for ind in chosen]
-        psucc = [self.psucc[ind._ps[1]] if ind._ps[0] == "o" else None for ind in chosen]
-
-        # Update the internal parameters for successful offspring
-        for i, ind in enumerate(chosen):
-            t, p_idx = ind._ps
-
-            # Only the offspring update the parameter set
-            if t == "o":
-                # Update (Success = 1 since it is chosen)
-                psucc[i] = (1.0 - cp) * psucc[i] + cp
-                sigmas[i] = sigmas[i] * exp((psucc[i] - ptarg) / (d * (1.0 - ptarg)))
-
-                if psucc[i] < pthresh:
-                    xp = numpy.array(ind)
-                    x = numpy.array(self.parents[p_idx])
-                    pc[i] = (1.0 - cc) * pc[i] + sqrt(cc * (2.0 - cc)) * (xp - x) / last_steps[i]
-                    invCholesky[i], A[i] = self._rankOneUpdate(invCholesky[i], A[i], 1 - ccov, ccov, pc[i])
-                else:
-                    pc[i] = (1.0 - cc) * pc[i]
-                    pc_weight = cc * (2.0 - cc)
-                    invCholesky[i], A[i] = self._rankOneUpdate(invCholesky[i], A[i], 1 - ccov + pc_weight, ccov, pc[i])
-
-                self.psucc[p_idx] = (1.0 - cp) * self.psucc[p_idx] + cp
-                self.sigmas[p_idx] = self.sigmas[p_idx] * exp((self.psucc[p_idx] - ptarg) / (d * (1.0 - ptarg)))
+        # Only the chosen offspring update a copy of the parameter set of
+        # their parent, all at once
+        offspring = [i for i, ind in enumerate(chosen) if ind._ps[0] == "o"]
+        p_idx = [chosen[i]._ps[1] for i in offspring]
+        last_steps = numpy.array(self.sigmas)[p_idx]
+
+        # Update (Success = 1 since it is chosen)
+        psucc = (1.0 - cp) * numpy.array(self.psucc)[p_idx] + cp
+        sigmas = last_steps * numpy.exp((psucc - ptarg) / (d * (1.0 - ptarg)))
+
+        success = psucc < pthresh
+        xp = numpy.array([chosen[i] for i in offspring], dtype=float).reshape(-1, self.dim)
+        x = numpy.array(self.parents, dtype=float)[p_idx]
+        pc = (1.0 - cc) * self.pc[p_idx]
+        pc[success] += sqrt(cc * (2.0 - cc)) * (xp - x)[success] / last_steps[success, None]
+        alpha = numpy.where(success, 1 - ccov, 1 - ccov + cc * (2.0 - cc))
+        invCholesky, A = self._rankOneUpdate(self.invCholesky[p_idx], self.A[p_idx],
+                                             alpha, ccov, pc)
+
+        for p in p_idx:
+            self.psucc[p] = (1.0 - cp) * self.psucc[p] + cp
+            self.sigmas[p] = self.sigmas[p] * exp((self.psucc[p] - ptarg) / (d * (1.0 - ptarg)))
 
         # It is unnecessary to update the entire parameter set for not chosen individuals
         # Their parameters will not make it to the next generation
@@ -532,9 +550,16 @@ class StrategyMultiObjective(object):
 
         # Make a copy of the internal parameters
         # The parameter is in the temporary variable for offspring and in the original one for parents
+        source = [ind._ps[1] for ind in chosen]
         self.parents = chosen
-        self.sigmas = [sigmas[i] if ind._ps[0] == "o" else self.sigmas[ind._ps[1]] for i, ind in enumerate(chosen)]
-        self.invCholesky = [invCholesky[i] if ind._ps[0] == "o" else self.invCholesky[ind._ps[1]] for i, ind in enumerate(chosen)]
-        self.A = [A[i] if ind._ps[0] == "o" else self.A[ind._ps[1]] for i, ind in enumerate(chosen)]
-        self.pc = [pc[i] if ind._ps[0] == "o" else self.pc[ind._ps[1]] for i, ind in enumerate(chosen)]
-        self.psucc = [psucc[i] if ind._ps[0] == "o" else self.psucc[ind._ps[1]] for i, ind in enumerate(chosen)]
+        self.sigmas = [self.sigmas[p] for p in source]
+        self.psucc = [self.psucc[p] for p in source]
+        self.invCholesky = self.invCholesky[source]
+        self.A = self.A[source]
+        self.pc = self.pc[source]
+        for j, i in enumerate(offspring):
+            self.sigmas[i] = float(sigmas[j])
+            self.psucc[i] = float(psucc[j])
+        self.invCholesky[offspring] = invCholesky
+        self.A[offspring] = A
+        self.pc[offspring] = pc
@@ -26,13 +26,20 @@ import re
 import sys
 import warnings
 
+from array import array
 from collections import defaultdict, deque
-from functools import partial, wraps
+from functools import wraps
 from inspect import isclass
-from operator import eq, lt
 
+from . import base
 from . import tools        # Needed by HARM-GP
 import collections
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = False
 
 ######################################
 # GP Data structure                  #
@@ -42,6 +49,48 @@ import collections
 __type__ = object
 
 
+def _buildExtents(arities):
+    # One pass over the arities of a tree in prefix order computing, for
+    # every node, the end index of its subtree, its depth and the index of
+    # its parent (-1 for the root).
+    ends, depths, parents = [], [], []
+    open_, remaining = [], []
+    for i, arity in enumerate(arities):
+        if open_:
+            parent = open_[-1]
+            parents.append(parent)
+            depths.append(depths[parent] + 1)
+            remaining[-1] -= 1
+        else:
+            parents.append(-1)
+            depths.append(0)
+        ends.append(i + 1)
+        if arity > 0:
+            open_.append(i)
+            remaining.append(arity)
+        else:
+            # A leaf completes every open node whose last child it ends
+            while open_ and remaining[-1] == 0:
+                ends[open_.pop()] = i + 1
+                remaining.pop()
+    return ends, depths, parents
+
+
+def _buildTypes(rets, arities):
+    # Indices of the nodes below the root grouped by return type, for all
+    # the nodes, the terminals and the primitives.
+    nodes, terminals, primitives = dict(), dict(), dict()
+    for idx, (ret, arity) in enumerate(zip(rets, arities)):
+        if idx == 0:
+            continue
+        nodes.setdefault(ret, []).append(idx)
+        if arity == 0:
+            terminals.setdefault(ret, []).append(idx)
+        else:
+            primitives.setdefault(ret, []).append(idx)
+    return nodes, terminals, primitives
+
+
 class PrimitiveTree(list):
     """Tree specifically formatted for optimization of genetic
     programming operations. The tree is represented with a
@@ -49,15 +98,54 @@ class PrimitiveTree(list):
     The nodes appended to the tree are required to
     have an attribute *arity* which defines the arity of the
     primitive. An arity of 0 is expected from terminals nodes.
+
+    The end of every subtree, the depth and the parent of every node are
+    computed in a single pass the first time they are needed and kept until
+    the tree is modified, so that :meth:`searchSubtree` and :attr:`height`
+    do not scan the tree again. The same goes for the positions of the nodes
+    grouped by return type used by the crossovers, see :attr:`types`.
     """
+    _extents = None
+    _types = None
+
     def __init__(self, content):
         list.__init__(self, content)
 
     def __deepcopy__(self, memo):
         new = self.__class__(self)
-        new.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        new.__dict__.update(copy.deepcopy(self.__getstate__(), memo))
         return new
 
+    def __getstate__(self):
+        # The extents are rebuilt on demand, they need not be copied
+        state = dict(self.__dict__)
+        state.pop("_extents", None)
+        state.pop("_types", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    @property
+    def extents(self):
+        """Tuple of three lists, giving for each node the end index of its
+        subtree, its depth and the index of its parent (-1 for the root).
+        """
+        if self._extents is None:
+            self._extents = _buildExtents([node.arity for node in self])
+        return self._extents
+
+    @property
+    def types(self):
+        """Tuple of three dictionaries mapping each return type to the
+        indices of, respectively, all the nodes, the terminals and the
+        primitives of that type, the root excluded.
+        """
+        if self._types is None:
+            self._types = _buildTypes([node.ret for node in self],
+                                      [node.arity for node in self])
+        return self._types
+
     def __setitem__(self, key, val):
         # Check for most common errors
         # Does NOT check for STGP constraints
@@ -84,6 +172,10 @@ class PrimitiveTree(list):
             raise ValueError("Invalid node replacement with a node of a"
                              " different arity.")
         list.__setitem__(self, key, val)
+        if isinstance(key, slice):
+            self._extents = None
+        # A node of the same arity may still have another type
+        self._types = None
 
     def __str__(self):
         """Return the expression in a human readable string.
@@ -155,13 +247,7 @@ class PrimitiveTree(list):
         """Return the height of the tree, or the depth of the
         deepest node.
         """
-        stack = [0]
-        max_depth = 0
-        for elem in self:
-            depth = stack.pop()
-            max_depth = max(max_depth, depth)
-            stack.extend([depth + 1] * elem.arity)
-        return max_depth
+        return max(self.extents[1]) if len(self) > 0 else 0
 
     @property
     def root(self):
@@ -174,12 +260,22 @@ class PrimitiveTree(list):
         range of values that defines the subtree which has the
         element with index *begin* as its root.
         """
-        end = begin + 1
-        total = self[begin].arity
-        while total > 0:
-            total += self[end].arity - 1
-            end += 1
-        return slice(begin, end)
+        if begin < 0:
+            begin += len(self)
+        return slice(begin, self.extents[0][begin])
+
+
+def _invalidating(method):
+    @wraps(method)
+    def wrapper(self, *args, **kargs):
+        self._extents = self._types = None
+        return method(self, *args, **kargs)
+    return wrapper
+
+# Every other way of modifying the list also discards the extents
+for _name in ("__delitem__", "__iadd__", "append", "extend", "insert",
+              "pop", "remove", "reverse", "sort", "clear"):
+    setattr(PrimitiveTree, _name, _invalidating(getattr(list, _name)))
 
 
 class Primitive(object):
@@ -254,6 +350,309 @@ class Ephemeral(Terminal):
         raise NotImplementedError
 
 
+class _NodeTable(object):
+    """Registry assigning a small integer code to every distinct node used
+    in a :class:`PrimitiveArrayTree`. Ephemeral constants are registered
+    by class, their values being stored by the trees themselves.
+    """
+    def __init__(self):
+        self.nodes = []
+        self.arities = []
+        self.ephemerals = bytearray()
+        self.codes = dict()
+
+    @staticmethod
+    def key(node):
+        if isclass(node):
+            return Ephemeral, node
+        if isinstance(node, Ephemeral):
+            return Ephemeral, type(node)
+        if isinstance(node, Primitive):
+            return Primitive, node.name, tuple(node.args), node.ret
+        return type(node), node.format(), node.ret
+
+    def encode(self, node):
+        """Return the code of *node*, which may also be an ephemeral class."""
+        key = self.key(node)
+        try:
+            return self.codes[key]
+        except KeyError:
+            code = len(self.nodes)
+            if code > 0xFFFF:
+                raise OverflowError("PrimitiveArrayTree cannot encode more "
+                                    "than 65536 distinct nodes.")
+            ephemeral = key[0] is Ephemeral
+            self.nodes.append(key[1] if ephemeral else node)
+            self.arities.append(0 if ephemeral else node.arity)
+            self.ephemerals.append(ephemeral)
+            self.codes[key] = code
+            return code
+
+    def decode(self, code, value=None):
+        node = self.nodes[code]
+        if self.ephemerals[code]:
+            # Rebuild the ephemeral without drawing a new random value
+            ephemeral = object.__new__(node)
+            Terminal.__init__(ephemeral, value, False, node.ret)
+            return ephemeral
+        return node
+
+_node_table = _NodeTable()
+
+
+class PrimitiveArrayTree(object):
+    """Compact alternative to :class:`PrimitiveTree` with the same public
+    interface. Nodes are stored as 16 bit codes in an :class:`array.array`,
+    shared node objects being looked up in a module wide table, and the
+    values of the ephemeral constants are kept in a side list in order of
+    appearance. Copying, slicing and pickling a tree are therefore copies of
+    these two buffers instead of lists of node objects.
+
+    Accessing an item builds the node back, so ephemeral constants read
+    from the tree are new (equal) objects at every access.
+    """
+    _extents = None
+    _types = None
+
+    def __init__(self, content=()):
+        self.codes = array('H')
+        self.values = []
+        for node in content:
+            code = _node_table.encode(node)
+            self.codes.append(code)
+            if _node_table.ephemerals[code]:
+                self.values.append(node.value)
+
+    @classmethod
+    def _fromBuffers(cls, codes, values):
+        tree = PrimitiveArrayTree.__new__(cls)
+        tree.codes = codes
+        tree.values = values
+        return tree
+
+    def _countEphemerals(self, end):
+        ephemerals = _node_table.ephemerals
+        return sum(1 for code in self.codes[:end] if ephemerals[code])
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        decode, ephemerals = _node_table.decode, _node_table.ephemerals
+        values = iter(self.values)
+        for code in self.codes:
+            yield decode(code, next(values) if ephemerals[code] else None)
+
+    def __reversed__(self):
+        return reversed(list(self))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return list(self)[key]
+            first = self._countEphemerals(start)
+            count = self._countEphemerals(stop) - first
+            return PrimitiveArrayTree._fromBuffers(self.codes[start:stop],
+                                                   self.values[first:first + count])
+        code = self.codes[key]
+        if _node_table.ephemerals[code]:
+            return _node_table.decode(code, self.values[self._countEphemerals(key % len(self))])
+        return _node_table.decode(code)
+
+    def __setitem__(self, key, val):
+        # Same checks as PrimitiveTree.__setitem__
+        if isinstance(key, slice):
+            if key.start >= len(self):
+                raise IndexError("Invalid slice object (try to assign a %s"
+                                 " in a tree of size %d). Even if this is allowed by the"
+                                 " list object slice setter, this should not be done in"
+                                 " the PrimitiveTree context, as this may lead to an"
+                                 " unpredictable behavior for searchSubtree or evaluate."
+                                 % (key, len(self)))
+            if not isinstance(val, PrimitiveArrayTree):
+                val = PrimitiveArrayTree(val)
+            arities = _node_table.arities
+            total = arities[val.codes[0]]
+            for code in val.codes[1:]:
+                total += arities[code] - 1
+            if total != 0:
+                raise ValueError("Invalid slice assignation : insertion of"
+                                 " an incomplete subtree is not allowed in PrimitiveTree.")
+            start, stop, _ = key.indices(len(self))
+            first = self._countEphemerals(start)
+            count = self._countEphemerals(stop) - first
+            self.codes[start:stop] = val.codes
+            self.values[first:first + count] = val.values
+            self._extents = self._types = None
+            return
+
+        key = key % len(self)
+        code = _node_table.encode(val)
+        if _node_table.arities[code] != _node_table.arities[self.codes[key]]:
+            raise ValueError("Invalid node replacement with a node of a"
+                             " different arity.")
+        index = self._countEphemerals(key)
+        if _node_table.ephemerals[self.codes[key]]:
+            del self.values[index]
+        if _node_table.ephemerals[code]:
+            self.values.insert(index, val.value)
+        self.codes[key] = code
+        self._types = None
+
+    def __eq__(self, other):
+        if isinstance(other, PrimitiveArrayTree):
+            return self.codes == other.codes and self.values == other.values
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __str__(self):
+        return PrimitiveTree.__str__(self)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, list(self))
+
+    def copy(self):
+        """Return a shallow copy of the tree, with its own buffers."""
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new.codes = array('H', self.codes)
+        new.values = list(self.values)
+        return new
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        new = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new
+        for name, value in self.__dict__.items():
+            if name not in ("codes", "values", "_extents", "_types"):
+                setattr(new, name, copy.deepcopy(value, memo))
+        new.codes = array('H', self.codes)
+        new.values = list(self.values)
+        return new
+
+    def __reduce__(self):
+        # Codes are only valid in this process, so the distinct nodes used by
+        # the tree are pickled along with the buffer, renumbered locally.
+        local = dict()
+        nodes = []
+        for code in self.codes:
+            if code not in local:
+                local[code] = len(nodes)
+                nodes.append(_node_table.nodes[code])
+        codes = array('H', [local[code] for code in self.codes])
+        state = dict(self.__dict__)
+        state.pop("_extents", None)
+        state.pop("_types", None)
+        state.update(codes=codes.tobytes(), values=self.values, nodes=nodes)
+        return self.__class__, (), state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        nodes = state.pop("nodes")
+        codes = array('H')
+        codes.frombytes(state.pop("codes"))
+        mapping = [_node_table.encode(node) for node in nodes]
+        self.__dict__.update(state)
+        self.codes = array('H', [mapping[code] for code in codes])
+
+    from_string = classmethod(PrimitiveTree.from_string.__func__)
+
+    @property
+    def extents(self):
+        """Tuple of three lists, giving for each node the end index of its
+        subtree, its depth and the index of its parent (-1 for the root).
+        """
+        if self._extents is None:
+            arities = _node_table.arities
+            self._extents = _buildExtents([arities[code] for code in self.codes])
+        return self._extents
+
+    @property
+    def types(self):
+        """Tuple of three dictionaries mapping each return type to the
+        indices of, respectively, all the nodes, the terminals and the
+        primitives of that type, the root excluded.
+        """
+        if self._types is None:
+            nodes, arities = _node_table.nodes, _node_table.arities
+            self._types = _buildTypes([nodes[code].ret for code in self.codes],
+                                      [arities[code] for code in self.codes])
+        return self._types
+
+    @property
+    def height(self):
+        """Return the height of the tree, or the depth of the
+        deepest node.
+        """
+        return max(self.extents[1]) if len(self) > 0 else 0
+
+    @property
+    def root(self):
+        """Root of the tree, the element 0 of the list.
+        """
+        return self[0]
+
+    def searchSubtree(self, begin):
+        """Return a slice object that corresponds to the
+        range of values that defines the subtree which has the
+        element with index *begin* as its root.
+        """
+        if begin < 0:
+            begin += len(self)
+        return slice(begin, self.extents[0][begin])
+
+
+def packTree(obj):
+    """Return a :class:`PrimitiveArrayTree` with the nodes of *obj* if it is
+    a :class:`PrimitiveTree`, and *obj* itself otherwise. Meant to be the
+    *pack* function of a :class:`~deap.base.ProcessPoolMap`, it reduces the
+    trees sent to the workers to their codes and distinct nodes, leaving out
+    any other attribute of the individuals, such as their fitness.
+    """
+    if isinstance(obj, PrimitiveTree):
+        return PrimitiveArrayTree(obj)
+    return obj
+
+
+def cloneTree(individual):
+    """Return a copy of the :class:`PrimitiveTree` or
+    :class:`PrimitiveArrayTree` *individual*. The list of nodes is copied but
+    the nodes themselves are immutable and are shared with *individual*, as
+    are the cached :attr:`~PrimitiveTree.extents` and
+    :attr:`~PrimitiveTree.types`, which are never modified in place. Every
+    other attribute, such as the fitness, is deep copied. This is the
+    :func:`~deap.base.clone` of the trees, used by the algorithms of
+    :mod:`deap.algorithms` unless another clone is registered in the
+    toolbox.
+    """
+    new = individual.__class__.__new__(individual.__class__)
+    memo = {id(individual): new}
+    for name, value in individual.__dict__.items():
+        if name in ("_extents", "_types"):
+            new.__dict__[name] = value
+        elif name not in ("codes", "values"):
+            new.__dict__[name] = copy.deepcopy(value, memo)
+    if isinstance(individual, PrimitiveArrayTree):
+        new.codes = array('H', individual.codes)
+        new.values = list(individual.values)
+    else:
+        list.extend(new, individual)
+    return new
+
+base.registerClone(PrimitiveTree, cloneTree)
+base.registerClone(PrimitiveArrayTree, cloneTree)
+
+
 class PrimitiveSetTyped(object):
     """Class that contains the primitives that can be used to solve a
     Strongly Typed GP problem. The set also defined the researched
@@ -267,7 +666,11 @@ class PrimitiveSetTyped(object):
         # being polluted by builtins function when evaluating
         # GP expression.
         self.context = {"__builtins__": None}
+        self.vectorized = dict()
         self.mapping = dict()
+        # Reachability tables, see viablePrimitives
+        self._viable = []
+        self._viable_prims = dict()
         self.terms_count = 0
         self.prims_count = 0
 
@@ -292,7 +695,55 @@ class PrimitiveSetTyped(object):
                 self.mapping[new_name].value = new_name
                 del self.mapping[old_name]
 
+    def _viableTypes(self, depth):
+        # Types from which a complete subtree of at most *depth* levels can
+        # be grown. The sets only grow with the depth and are computed level
+        # by level until they stop changing, deeper levels being the same.
+        viable = self._viable
+        if not viable:
+            viable.append(frozenset())
+            viable.append(frozenset(type_ for type_, terms in self.terminals.items() if terms))
+        while len(viable) <= depth and (len(viable) < 3 or viable[-1] != viable[-2]):
+            below = viable[-1]
+            level = set(viable[1])
+            for type_, prims in self.primitives.items():
+                if any(all(arg in below for arg in prim.args) for prim in prims):
+                    level.add(type_)
+            viable.append(frozenset(level))
+        return viable[min(depth, len(viable) - 1)]
+
+    def isViable(self, type_, depth):
+        """Return whether a complete subtree returning *type_* with at most
+        *depth* levels, the root being at the first level, can be grown
+        from the set.
+        """
+        return depth > 0 and type_ in self._viableTypes(depth)
+
+    def viablePrimitives(self, type_, depth):
+        """Return the primitives returning *type_* that can be the root of a
+        complete subtree of at most *depth* levels, that is the primitives
+        for which every argument type is viable with *depth* - 1 levels.
+        Generating a tree only from these primitives, and from terminals,
+        never leads to a dead end. The lists are computed once per type and
+        depth until a new primitive or terminal is added to the set.
+        """
+        if depth < 2:
+            return []
+        below = self._viableTypes(depth - 1)
+        key = (type_, min(depth, len(self._viable)))
+        try:
+            return self._viable_prims[key]
+        except KeyError:
+            prims = [prim for prim in self.primitives[type_]
+                     if all(arg in below for arg in prim.args)]
+            self._viable_prims[key] = prims
+            return prims
+
     def _add(self, prim):
+        # Any new element may change the reachability tables
+        self._viable = []
+        self._viable_prims = dict()
+
         def addType(dict_, ret_type):
             if not ret_type in dict_:
                 new_list = []
@@ -319,7 +770,8 @@ class PrimitiveSetTyped(object):
             if issubclass(prim.ret, type_):
                 dict_[type_].append(prim)
 
-    def addPrimitive(self, primitive, in_types, ret_type, name=None):
+    def addPrimitive(self, primitive, in_types, ret_type, name=None,
+                     vectorized=None):
         """Add a primitive to the set.
 
         :param primitive: callable object or a function.
@@ -327,6 +779,9 @@ class PrimitiveSetTyped(object):
         :param ret_type: type returned by the primitive.
         :param name: alternative name for the primitive instead
                      of its __name__ attribute.
+        :param vectorized: optional twin of *primitive* that accepts whole
+                           NumPy arrays of fitness cases, used by
+                           :func:`~deap.gp.evaluateVectorized`.
         """
         if name is None:
             name = primitive.__name__
@@ -340,6 +795,8 @@ class PrimitiveSetTyped(object):
 
         self._add(prim)
         self.context[prim.name] = primitive
+        if vectorized is not None:
+            self.vectorized[prim.name] = vectorized
         self.prims_count += 1
 
     def addTerminal(self, terminal, ret_type, name=None):
@@ -433,14 +890,15 @@ class PrimitiveSet(PrimitiveSetTyped):
         args = [__type__] * arity
         PrimitiveSetTyped.__init__(self, name, args, __type__, prefix)
 
-    def addPrimitive(self, primitive, arity, name=None):
+    def addPrimitive(self, primitive, arity, name=None, vectorized=None):
         """Add primitive *primitive* with arity *arity* to the set.
         If a name *name* is provided, it will replace the attribute __name__
         attribute to represent/identify the primitive.
         """
         assert arity > 0, "arity should be >= 1"
         args = [__type__] * arity
-        PrimitiveSetTyped.addPrimitive(self, primitive, args, __type__, name)
+        PrimitiveSetTyped.addPrimitive(self, primitive, args, __type__, name,
+                                       vectorized)
 
     def addTerminal(self, terminal, name=None):
         """Add a terminal to the set."""
@@ -508,6 +966,297 @@ def compileADF(expr, psets):
     return func
 
 
+def interpret(expr, pset):
+    """Translate the expression *expr* for the stack machine interpreter.
+    This is an alternative to :func:`~deap.gp.compile` taking the same
+    arguments and returning the same kind of result, but which neither
+    formats the tree into Python code nor calls :func:`eval`. The primitives
+    and named terminals are looked up once in *pset.context*, and calling the
+    result runs the nodes right to left on an explicit stack of values. Trees
+    are thus cheap to prepare, which suits offspring evaluated only once, and
+    are not limited in height by the Python parser.
+
+    :param expr: Expression to interpret, a PrimitiveTree.
+    :param pset: Primitive set against which the expression is interpreted.
+    :returns: a function if the primitive set has 1 or more arguments,
+              or return the results produced by evaluating the tree.
+    """
+    arguments = dict((name, i) for i, name in enumerate(pset.arguments))
+    program = []
+    for node in reversed(expr):
+        if node.arity > 0:
+            program.append((node.arity, pset.context[node.name]))
+        elif node.conv_fct is not str:
+            program.append((0, node.value))
+        elif node.value in arguments:
+            program.append((-1, arguments[node.value]))
+        else:
+            program.append((0, pset.context[node.value]))
+
+    def run(*args):
+        stack = []
+        push, pop = stack.append, stack.pop
+        for arity, item in program:
+            if arity == 0:
+                push(item)
+            elif arity == -1:
+                push(args[item])
+            elif arity == 1:
+                push(item(pop()))
+            elif arity == 2:
+                push(item(pop(), pop()))
+            else:
+                push(item(*[pop() for _ in range(arity)]))
+        return stack[0]
+
+    if len(pset.arguments) > 0:
+        return run
+    return run()
+
+
+def interpretADF(expr, psets):
+    """Interpret the expression represented by a list of trees with
+    :func:`~deap.gp.interpret`, the same way :func:`~deap.gp.compileADF`
+    compiles it.
+
+    :param expr: List of trees, the ADFs followed by the main tree.
+    :param psets: List of primitive sets. Each set corresponds to an ADF
+                  while the last set is associated with the expression
+                  and should contain reference to the preceding ADFs.
+    :returns: a function if the main primitive set has 1 or more arguments,
+              or return the results produced by evaluating the tree.
+    """
+    adfdict = {}
+    func = None
+    for pset, subexpr in list(zip(psets, expr)):
+        pset.context.update(adfdict)
+        func = interpret(subexpr, pset)
+        adfdict.update({pset.name: func})
+    return func
+
+
+def _applyScalar(func, args):
+    # Fallback for primitives without a vectorized twin: call the scalar
+    # primitive once per fitness case. Arguments that are not arrays are
+    # constant across the cases and are repeated.
+    if not any(isinstance(arg, numpy.ndarray) for arg in args):
+        return func(*args)
+    columns = [arg if isinstance(arg, numpy.ndarray) else itertools.repeat(arg)
+               for arg in args]
+    return numpy.array([func(*case) for case in zip(*columns)])
+
+
+def _evaluateColumns(expr, pset, columns, adfs):
+    # Walk the prefix list from the right, so that every primitive finds the
+    # values of its arguments on top of the stack, in order.
+    arguments = dict((name, i) for i, name in enumerate(pset.arguments))
+    stack = []
+    for node in reversed(expr):
+        if node.arity == 0:
+            if node.conv_fct is str:
+                # Symbolic terminal: an argument or a named object
+                name = node.value
+                if name in arguments:
+                    stack.append(columns[arguments[name]])
+                else:
+                    stack.append(pset.context[name])
+            else:
+                stack.append(node.value)
+            continue
+
+        args = [stack.pop() for _ in range(node.arity)]
+        if node.name in adfs:
+            subexpr, subpset = adfs[node.name]
+            stack.append(_evaluateColumns(subexpr, subpset, args, adfs))
+        elif node.name in pset.vectorized:
+            stack.append(pset.vectorized[node.name](*args))
+        else:
+            stack.append(_applyScalar(pset.context[node.name], args))
+    return stack.pop()
+
+
+def _broadcastCases(value, columns):
+    if numpy.ndim(value) == 0 and len(columns) > 0:
+        return numpy.repeat(value, len(columns[0]))
+    return value
+
+
+def evaluateVectorized(expr, pset, *columns):
+    """Evaluate the tree *expr* over all the fitness cases at once. Each
+    positional argument after *pset* is a NumPy array holding the values of
+    the corresponding pset argument for every case, cases being laid along
+    the first axis. Primitives registered with a *vectorized* twin are applied
+    once to the whole arrays; the others are called case by case.
+
+    :param expr: The PrimitiveTree to evaluate.
+    :param pset: Primitive set against which the expression is evaluated.
+    :param columns: One array of fitness cases per argument of *pset*.
+    :returns: An array with the output of the tree for every case.
+
+    Requires `numpy <http://www.numpy.org>`_.
+    """
+    value = _evaluateColumns(expr, pset, columns, {})
+    return _broadcastCases(value, columns)
+
+
+def evaluateVectorizedADF(expr, psets, *columns):
+    """Vectorized counterpart of :func:`~deap.gp.compileADF`. The list of
+    trees *expr* and the primitive sets *psets* follow the same order, the
+    last ones being the main tree, which is evaluated over *columns* as in
+    :func:`~deap.gp.evaluateVectorized`. Calls to an ADF evaluate its tree
+    over the arrays produced by the call's arguments.
+
+    :param expr: List of trees, the ADFs followed by the main tree.
+    :param psets: List of primitive sets, one per tree.
+    :param columns: One array of fitness cases per argument of the main set.
+    :returns: An array with the output of the main tree for every case.
+    """
+    adfs = dict((pset.name, (subexpr, pset)) for pset, subexpr in zip(psets, expr))
+    value = _evaluateColumns(expr[len(psets) - 1], psets[-1], columns, adfs)
+    return _broadcastCases(value, columns)
+
+
+def _evaluateBitwise(expr, pset, masks, adfs):
+    arguments = dict((name, i) for i, name in enumerate(pset.arguments))
+    stack = []
+    for node in reversed(expr):
+        if node.arity == 0:
+            if node.conv_fct is str and node.value in arguments:
+                stack.append(masks[arguments[node.value]])
+            else:
+                value = pset.context[node.value] if node.conv_fct is str else node.value
+                # A constant is the same for every case: all ones or all zeros
+                stack.append(-1 if value else 0)
+            continue
+
+        args = [stack.pop() for _ in range(node.arity)]
+        if node.name in adfs:
+            subexpr, subpset = adfs[node.name]
+            stack.append(_evaluateBitwise(subexpr, subpset, args, adfs))
+        elif node.name in pset.vectorized:
+            stack.append(pset.vectorized[node.name](*args))
+        else:
+            raise TypeError("Primitive %s has no vectorized twin, it cannot "
+                            "be evaluated bitwise." % (node.name,))
+    return stack.pop()
+
+
+def evaluateBitwise(expr, pset, *masks):
+    """Evaluate the Boolean tree *expr* over all the fitness cases at once.
+    Each positional argument after *pset* is an integer whose bit *i* holds
+    the value of the corresponding pset argument in case *i*, so that every
+    node is resolved with a single bitwise operation on whole masks. Every
+    primitive must be registered with a *vectorized* twin operating on such
+    masks, e.g. ``operator.and_``, ``operator.xor``, ``operator.invert`` or
+    ``lambda a, b: ~(a | b)`` for nor. Constant terminals are taken as true
+    or false in every case.
+
+    :param expr: The PrimitiveTree to evaluate.
+    :param pset: Primitive set against which the expression is evaluated.
+    :param masks: One packed integer per argument of *pset*.
+    :returns: The packed outputs of the tree. Bits above the number of cases
+              are meaningless and must be masked off by the caller.
+    """
+    return _evaluateBitwise(expr, pset, masks, {})
+
+
+def evaluateBitwiseADF(expr, psets, *masks):
+    """Bitwise counterpart of :func:`~deap.gp.evaluateVectorizedADF`, the
+    trees in *expr* being evaluated as in :func:`~deap.gp.evaluateBitwise`.
+
+    :param expr: List of trees, the ADFs followed by the main tree.
+    :param psets: List of primitive sets, one per tree.
+    :param masks: One packed integer per argument of the main set.
+    :returns: The packed outputs of the main tree.
+    """
+    adfs = dict((pset.name, (subexpr, pset)) for pset, subexpr in zip(psets, expr))
+    return _evaluateBitwise(expr[len(psets) - 1], psets[-1], masks, adfs)
+
+
+def countBits(mask):
+    """Return the number of bits set in the non negative integer *mask*."""
+    return bin(mask).count("1")
+
+
+class CompileCache(object):
+    """Least recently used cache of compiled expressions. An instance is
+    called exactly like :func:`~deap.gp.compile` and can be registered in
+    the toolbox in its place ::
+
+        toolbox.register("compile", gp.CompileCache(maxsize=5000), pset=pset)
+
+    Trees are keyed on their structure (the sequence of primitive names and
+    formatted terminals) and on the identity of the primitive set, so clones
+    and structurally identical offspring reuse the callable produced for the
+    first of them instead of being formatted and passed to :func:`eval`
+    again. When the primitive set
+    has no arguments, compiling evaluates the tree, so the cache is bypassed.
+
+    :param maxsize: Maximum number of compiled expressions retained. The
+                    least recently used entry is evicted when it is exceeded.
+    :param compiler: The function producing the entries, either
+                     :func:`~deap.gp.compile` (default) or
+                     :func:`~deap.gp.interpret`.
+
+    The attributes :attr:`hits`, :attr:`misses` and :attr:`evictions` count
+    the cache activity since creation or the last call to :meth:`clear`.
+    """
+    def __init__(self, maxsize=10000, compiler=compile):
+        self.maxsize = maxsize
+        self.compiler = compiler
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(expr, pset):
+        """Return the structural key of *expr* compiled against *pset*."""
+        # Terminals are keyed on the text compile evaluates, their name may be
+        # the same for different values (e.g. 1 and '1')
+        if isinstance(expr, list):
+            return id(pset), tuple(node.name if node.arity else node.format()
+                                   for node in expr)
+        if isinstance(expr, PrimitiveArrayTree):
+            return id(pset), expr.codes.tobytes(), tuple(map(repr, expr.values))
+        return id(pset), str(expr)
+
+    def __call__(self, expr, pset):
+        if len(pset.arguments) == 0:
+            return self.compiler(expr, pset)
+
+        key = self.key(expr, pset)
+        try:
+            # The primitive set is kept alongside the function so that its
+            # id cannot be reused by another set while the entry lives.
+            _, func = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            func = self.compiler(expr, pset)
+            self.entries[key] = pset, func
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return func
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def hit_rate(self):
+        """Ratio of the lookups that were answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / float(lookups) if lookups else 0.0
+
+    def clear(self):
+        """Empty the cache and reset its counters."""
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
 ######################################
 # GP Program generation functions    #
 ######################################
@@ -643,18 +1392,14 @@ def cxOnePoint(ind1, ind2):
         return ind1, ind2
 
     # List all available primitive types in each individual
-    types1 = defaultdict(list)
-    types2 = defaultdict(list)
     if ind1.root.ret == __type__:
         # Not STGP optimization
-        types1[__type__] = range(1, len(ind1))
-        types2[__type__] = range(1, len(ind2))
+        types1 = {__type__: range(1, len(ind1))}
+        types2 = {__type__: range(1, len(ind2))}
         common_types = [__type__]
     else:
-        for idx, node in enumerate(ind1[1:], 1):
-            types1[node.ret].append(idx)
-        for idx, node in enumerate(ind2[1:], 1):
-            types2[node.ret].append(idx)
+        types1 = ind1.types[0]
+        types2 = ind2.types[0]
         common_types = set(types1.keys()).intersection(set(types2.keys()))
 
     if len(common_types) > 0:
@@ -692,29 +1437,16 @@ def cxOnePointLeafBiased(ind1, ind2, termpb):
         # No crossover on single node tree
         return ind1, ind2
 
-    # Determine wether we keep terminals or primitives for each individual
-    terminal_op = partial(eq, 0)
-    primitive_op = partial(lt, 0)
-    arity_op1 = terminal_op if random.random() < termpb else primitive_op
-    arity_op2 = terminal_op if random.random() < termpb else primitive_op
-
-    # List all available primitive or terminal types in each individual
-    types1 = defaultdict(list)
-    types2 = defaultdict(list)
-
-    for idx, node in enumerate(ind1[1:], 1):
-        if arity_op1(node.arity):
-            types1[node.ret].append(idx)
-
-    for idx, node in enumerate(ind2[1:], 1):
-        if arity_op2(node.arity):
-            types2[node.ret].append(idx)
+    # Determine wether we keep terminals (1) or primitives (2) for each
+    # individual and list all available types of these nodes
+    types1 = ind1.types[1 if random.random() < termpb else 2]
+    types2 = ind2.types[1 if random.random() < termpb else 2]
 
     common_types = set(types1.keys()).intersection(set(types2.keys()))
 
     if len(common_types) > 0:
         # Set does not support indexing
-        type_ = random.sample(common_types, 1)[0]
+        type_ = random.choice(list(common_types))
         index1 = random.choice(types1[type_])
         index2 = random.choice(types2[type_])
 
@@ -68,6 +68,25 @@ def test_cma():
 
     assert best.fitness.values < (1e-8,), "CMA algorithm did not converged properly."
 
+@unittest.skipIf(platform.python_implementation() == "PyPy", "PyPy has no support for eigen decomposition.")
+@with_setup(setup_func_single_obj, teardown_func)
+def test_cma_lazy():
+    NDIM = 200
+
+    strategy = cma.Strategy(centroid=[1.0]*NDIM, sigma=1.0, lazy=True)
+    assert strategy.decompose_gap > 1, "The decomposition is not lazy in high dimension."
+
+    toolbox = base.Toolbox()
+    toolbox.register("evaluate", benchmarks.sphere)
+    toolbox.register("generate", strategy.generate, creator.__dict__[INDCLSNAME])
+    toolbox.register("update", strategy.update)
+
+    B = strategy.B
+    pop, _ = algorithms.eaGenerateUpdate(toolbox, ngen=strategy.decompose_gap - 1)
+    assert strategy.B is B, "The covariance matrix was decomposed before the gap."
+    pop, _ = algorithms.eaGenerateUpdate(toolbox, ngen=1)
+    assert strategy.B is not B, "The covariance matrix was not decomposed after the gap."
+
 @with_setup(setup_func_multi_obj, teardown_func)
 def test_nsga2():
     NDIM = 5
@@ -0,0 +1,143 @@
+import random
+import unittest
+from copy import copy
+from functools import partial
+
+import numpy
+
+from deap import benchmarks
+from deap.benchmarks import batch
+from deap.benchmarks import movingpeaks
+from deap.benchmarks import tools
+
+
+class BatchBenchmarksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.population = numpy.random.RandomState(3).uniform(0.05, 0.95, (20, 6))
+
+    def compare(self, name, *args):
+        expected = [getattr(benchmarks, name)(list(ind), *args) for ind in self.population]
+        result = getattr(batch, name)(self.population, *args)
+        self.assertEqual(result.shape, (20, len(expected[0])))
+        numpy.testing.assert_allclose(result, expected, rtol=1e-10, err_msg=name)
+
+    def test_single_objective(self):
+        for name in ("plane", "sphere", "cigar", "rosenbrock", "h1", "ackley",
+                     "bohachevsky", "griewank", "rastrigin", "rastrigin_scaled",
+                     "rastrigin_skew", "schaffer", "schwefel", "himmelblau"):
+            self.compare(name)
+        self.population -= 0.5
+        self.compare("rastrigin_skew")
+
+    def test_shekel(self):
+        a = [[0.5] * 6, [0.25] * 6, [0.75] * 6]
+        self.compare("shekel", a, [0.002, 0.005, 0.005])
+
+    def test_multi_objective(self):
+        for name in ("kursawe", "schaffer_mo", "zdt1", "zdt2", "zdt3", "zdt4",
+                     "zdt6", "fonseca", "poloni"):
+            self.compare(name)
+
+    def test_dtlz(self):
+        for obj in (2, 3, 4):
+            self.compare("dtlz1", obj)
+            self.compare("dtlz2", obj)
+            self.compare("dtlz3", obj)
+            self.compare("dtlz4", obj, 100)
+
+
+class BatchDecoratorsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.population = numpy.random.RandomState(4).uniform(-1, 1, (10, 3))
+
+    def compare(self, decorator, batch_decorator, *args):
+        func = decorator(*args)(benchmarks.rastrigin)
+        batch_func = batch_decorator(*args)(batch.rastrigin)
+        numpy.testing.assert_allclose(batch_func(self.population),
+                                      [func(list(ind)) for ind in self.population])
+
+    def test_translate(self):
+        self.compare(tools.translate, tools.translate_batch, [0.1, 0.2, 0.3])
+
+    def test_scale(self):
+        self.compare(tools.scale, tools.scale_batch, [0.5, 2.0, 3.0])
+
+    def test_rotate(self):
+        matrix, _ = numpy.linalg.qr(numpy.random.RandomState(5).rand(3, 3))
+        self.compare(tools.rotate, tools.rotate_batch, matrix)
+
+    def test_noise(self):
+        @tools.noise_batch((None, partial(random.gauss, 0.0, 1.0)))
+        def evaluate(individuals):
+            return batch.zdt1(individuals)
+
+        random.seed(1)
+        population = self.population + 1
+        noisy = evaluate(population)
+        numpy.testing.assert_array_equal(noisy[:, 0], batch.zdt1(population)[:, 0])
+        random.seed(1)
+        expected = batch.zdt1(population)[:, 1] + [random.gauss(0.0, 1.0) for _ in range(10)]
+        numpy.testing.assert_allclose(noisy[:, 1], expected)
+
+    def test_bound(self):
+        def identity(individuals):
+            return individuals
+
+        population = numpy.array([[-1.5, 0.25, 2.5]])
+        for type_, expected in (("clip", [-1.0, 0.25, 1.0]),
+                                ("wrap", [0.5, 0.25, 0.5]),
+                                ("mirror", [-0.5, 0.25, -0.5])):
+            bounded = tools.bound_batch((-1.0, 1.0), type_)(identity)
+            numpy.testing.assert_allclose(bounded(population), [expected])
+
+
+class MovingPeaksBatchTest(unittest.TestCase):
+
+    def pair(self, **kargs):
+        kargs = dict(movingpeaks.SCENARIO_1, **kargs)
+        kargs["period"] = 7
+        # The peaks functions list is used, and modified, by the benchmark
+        return [movingpeaks.MovingPeaks(dim=3, random=random.Random(11),
+                                        **dict(kargs, pfunc=copy(kargs["pfunc"])))
+                for _ in range(2)]
+
+    def compare(self, **kargs):
+        mpb, batch_mpb = self.pair(**kargs)
+        population = numpy.random.RandomState(6).uniform(0, 100, (40, 3))
+        expected = [mpb(list(ind)) for ind in population]
+        for chunk in (population[:5], population[5:23], population[23:]):
+            result = batch_mpb.evaluateBatch(chunk)
+            numpy.testing.assert_allclose(result, expected[:len(chunk)])
+            expected = expected[len(chunk):]
+        self.assertEqual(batch_mpb.nevals, mpb.nevals)
+        self.assertAlmostEqual(batch_mpb.offlineError(), mpb.offlineError())
+        self.assertAlmostEqual(batch_mpb.currentError(), mpb.currentError())
+        numpy.testing.assert_allclose(batch_mpb.peaks_position, mpb.peaks_position)
+
+    def test_scenarios(self):
+        self.compare(**movingpeaks.SCENARIO_1)
+        self.compare(**movingpeaks.SCENARIO_2)
+        self.compare(**movingpeaks.SCENARIO_3)
+
+    def test_fluctuating(self):
+        self.compare(npeaks=[2, 5, 10], number_severity=0.5,
+                     pfunc=[movingpeaks.cone, movingpeaks.function1] * 2 + [movingpeaks.cone])
+
+    def test_uncounted(self):
+        mpb, _ = self.pair()
+        mpb.evaluateBatch(numpy.zeros((20, 3)), count=False)
+        self.assertEqual(mpb.nevals, 0)
+
+    def test_maximums(self):
+        mpb, _ = self.pair(**movingpeaks.SCENARIO_2)
+        expected = []
+        for pos, height in zip(mpb.peaks_position, mpb.peaks_height):
+            if height >= mpb(pos, count=False)[0]:
+                expected.append((height, pos))
+        self.assertEqual(mpb.maximums(), sorted(expected, reverse=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
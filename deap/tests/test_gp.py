@@ -0,0 +1,405 @@
+import copy
+import operator
+import pickle
+import random
+import unittest
+
+from deap import base
+from deap import creator
+from deap import gp
+from deap.benchmarks.gp import parity_masks
+
+try:
+    import numpy
+except ImportError:
+    numpy = False
+
+
+def rand100():
+    return random.randint(0, 100)
+
+
+def get_pset():
+    pset = gp.PrimitiveSet("MAIN", 2)
+    pset.addPrimitive(operator.add, 2)
+    pset.addPrimitive(operator.sub, 2)
+    pset.addPrimitive(operator.mul, 2)
+    pset.addTerminal(1)
+    return pset
+
+
+class PrimitiveArrayTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.pset = get_pset()
+        self.pset.addEphemeralConstant("rand100", rand100)
+
+    def test_same_as_list_tree(self):
+        for _ in range(50):
+            expr1 = gp.genGrow(self.pset, 1, 5)
+            expr2 = gp.genGrow(self.pset, 1, 5)
+            list1, list2 = gp.PrimitiveTree(expr1), gp.PrimitiveTree(expr2)
+            array1, array2 = gp.PrimitiveArrayTree(expr1), gp.PrimitiveArrayTree(expr2)
+            self.assertEqual(str(array1), str(list1))
+            self.assertEqual(array1.height, list1.height)
+            self.assertEqual([array1.searchSubtree(i) for i in range(len(array1))],
+                             [list1.searchSubtree(i) for i in range(len(list1))])
+
+            state = random.getstate()
+            gp.cxOnePoint(list1, list2)
+            random.setstate(state)
+            gp.cxOnePoint(array1, array2)
+            self.assertEqual((str(array1), str(array2)), (str(list1), str(list2)))
+
+            state = random.getstate()
+            gp.mutEphemeral(list1, "one")
+            random.setstate(state)
+            gp.mutEphemeral(array1, "one")
+            self.assertEqual(list(array1), list(list1))
+
+    def test_copy_and_pickle(self):
+        tree = gp.PrimitiveArrayTree(gp.genFull(self.pset, 3, 3))
+        tree.tag = [1]
+        for other in (copy.deepcopy(tree), pickle.loads(pickle.dumps(tree))):
+            self.assertEqual(other, tree)
+            self.assertEqual(other.tag, tree.tag)
+            self.assertIsNot(other.codes, tree.codes)
+
+    def test_from_string(self):
+        tree = gp.PrimitiveArrayTree.from_string("add(ARG0, mul(1, 25))", self.pset)
+        self.assertIsInstance(tree, gp.PrimitiveArrayTree)
+        self.assertEqual(str(tree), "add(ARG0, mul(1, 25))")
+        self.assertEqual(gp.compile(tree, self.pset)(2, 0), 27)
+
+
+class ExtentsTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.pset = get_pset()
+
+    def scan(self, tree, begin):
+        end = begin + 1
+        total = tree[begin].arity
+        while total > 0:
+            total += tree[end].arity - 1
+            end += 1
+        return slice(begin, end)
+
+    def test_matches_scan(self):
+        for _ in range(50):
+            tree = gp.PrimitiveTree(gp.genGrow(self.pset, 0, 6))
+            ends, depths, parents = tree.extents
+            for i in range(len(tree)):
+                self.assertEqual(tree.searchSubtree(i), self.scan(tree, i))
+                if i > 0:
+                    self.assertEqual(depths[i], depths[parents[i]] + 1)
+                    self.assertTrue(parents[i] < i < ends[parents[i]])
+            self.assertEqual(parents[0], -1)
+            self.assertEqual(tree.height, max(depths))
+
+    def test_invalidated(self):
+        tree = gp.PrimitiveTree.from_string("add(ARG0, ARG1)", self.pset)
+        self.assertEqual(tree.height, 1)
+        tree[1:2] = gp.PrimitiveTree.from_string("mul(ARG0, sub(1, 1))", self.pset)
+        self.assertEqual(tree.height, 3)
+        self.assertEqual(tree.searchSubtree(1), slice(1, 6))
+        del tree[1:6]
+        tree.insert(1, self.pset.mapping["ARG1"])
+        self.assertEqual(tree.searchSubtree(0), slice(0, 3))
+        self.assertEqual(tree.height, 1)
+
+    def test_not_copied(self):
+        tree = gp.PrimitiveTree.from_string("add(ARG0, ARG1)", self.pset)
+        tree.extents
+        for other in (copy.deepcopy(tree), pickle.loads(pickle.dumps(tree))):
+            self.assertIsNone(other._extents)
+            self.assertEqual(other.searchSubtree(0), slice(0, 3))
+
+
+class CloneTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.pset = get_pset()
+        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+
+    def tearDown(self):
+        del creator.FitnessMin
+
+    def check(self, tree):
+        tree.fitness = creator.FitnessMin((3.0,))
+        other = base.Toolbox().clone(tree)
+        self.assertIs(type(other), type(tree))
+        self.assertEqual(other, tree)
+        self.assertTrue(all(a is b for a, b in zip(other, tree)))
+        self.assertEqual(other.fitness, tree.fitness)
+        del other.fitness.values
+        self.assertTrue(tree.fitness.valid)
+        other[1:2] = [self.pset.mapping["ARG1"]]
+        self.assertEqual(str(tree), "add(ARG0, mul(1, ARG1))")
+        self.assertEqual(tree.searchSubtree(2), slice(2, 5))
+
+    def test_list_tree(self):
+        self.check(gp.PrimitiveTree.from_string("add(ARG0, mul(1, ARG1))", self.pset))
+
+    def test_array_tree(self):
+        self.check(gp.PrimitiveArrayTree.from_string("add(ARG0, mul(1, ARG1))", self.pset))
+
+    def test_attributes_not_shared(self):
+        for cls in (gp.PrimitiveTree, gp.PrimitiveArrayTree):
+            tree = cls.from_string("add(ARG0, mul(1, ARG1))", self.pset)
+            tree.history = [1]
+            other = base.clone(tree)
+            other.history.append(2)
+            self.assertEqual(tree.history, [1])
+
+    def test_other_objects_deep_copied(self):
+        obj = [[1], [2]]
+        other = base.clone(obj)
+        self.assertEqual(other, obj)
+        self.assertIsNot(other[0], obj[0])
+
+class TypesTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.pset = gp.PrimitiveSetTyped("MAIN", [int, float], float)
+        self.pset.addPrimitive(operator.add, [float, float], float)
+        self.pset.addPrimitive(operator.sub, [int, int], int)
+        self.pset.addPrimitive(float, [int], float)
+        self.pset.addPrimitive(int, [float], int)
+        self.pset.addTerminal(1, int)
+        self.pset.addTerminal(1.0, float)
+
+    def test_matches_scan(self):
+        for _ in range(20):
+            expr = gp.genGrow(self.pset, 1, 5)
+            for tree in (gp.PrimitiveTree(expr), gp.PrimitiveArrayTree(expr)):
+                nodes, terminals, primitives = tree.types
+                for idx, node in enumerate(tree):
+                    self.assertEqual(idx in nodes.get(node.ret, []), idx > 0)
+                    self.assertEqual(idx in terminals.get(node.ret, []),
+                                     idx > 0 and node.arity == 0)
+                    self.assertEqual(idx in primitives.get(node.ret, []),
+                                     idx > 0 and node.arity > 0)
+
+    def test_crossover_keeps_types(self):
+        for _ in range(50):
+            ind1 = gp.PrimitiveTree(gp.genGrow(self.pset, 1, 5))
+            ind2 = gp.PrimitiveTree(gp.genGrow(self.pset, 1, 5))
+            ind1.types, ind2.types
+            gp.cxOnePointLeafBiased(ind1, ind2, 0.1)
+            gp.cxOnePoint(ind1, ind2)
+            for ind in (ind1, ind2):
+                self.assertEqual(ind.types, gp.PrimitiveTree(ind).types)
+                # Every argument has the type its parent expects
+                parents = ind.extents[2]
+                for idx in range(1, len(ind)):
+                    parent = ind[parents[idx]]
+                    child = sum(1 for j in range(parents[idx] + 1, idx)
+                                if parents[j] == parents[idx])
+                    self.assertEqual(parent.args[child], ind[idx].ret)
+
+
+class ViableTest(unittest.TestCase):
+
+    def setUp(self):
+        # str is only reachable through two levels of primitives, bytes never
+        self.pset = gp.PrimitiveSetTyped("MAIN", [int], str)
+        self.pset.addPrimitive(float, [int], float)
+        self.pset.addPrimitive(str, [float], str)
+        self.pset.addPrimitive(str, [bytes], str, name="decode")
+        self.pset.addPrimitive(bytes, [bytes], bytes, name="encode")
+
+    def test_tables(self):
+        self.assertTrue(self.pset.isViable(int, 1))
+        self.assertFalse(self.pset.isViable(float, 1))
+        self.assertTrue(self.pset.isViable(float, 2))
+        self.assertFalse(self.pset.isViable(str, 2))
+        self.assertTrue(self.pset.isViable(str, 3))
+        self.assertFalse(self.pset.isViable(bytes, 50))
+        self.assertEqual([p.name for p in self.pset.viablePrimitives(str, 3)], ["str"])
+        self.assertEqual(self.pset.viablePrimitives(str, 2), [])
+        self.assertEqual(self.pset.viablePrimitives(bytes, 10), [])
+
+    def test_invalidated(self):
+        self.assertFalse(self.pset.isViable(bytes, 3))
+        self.pset.addTerminal(b"", bytes)
+        self.assertTrue(self.pset.isViable(bytes, 1))
+        self.assertEqual(len(self.pset.viablePrimitives(str, 3)), 2)
+
+
+def evaluate(tree):
+    return str(tree), tree.height
+
+
+class ProcessPoolMapTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.pset = get_pset()
+        self.pset.addEphemeralConstant("rand100", rand100)
+
+    def test_same_as_map(self):
+        trees = [gp.PrimitiveTree(gp.genGrow(self.pset, 1, 5)) for _ in range(30)]
+        with base.ProcessPoolMap(2, chunksize=4, pack=gp.packTree) as pmap:
+            self.assertEqual(pmap(evaluate, trees), list(map(evaluate, trees)))
+            self.assertEqual(pmap(evaluate, []), [])
+
+    def test_pack(self):
+        tree = gp.PrimitiveTree(gp.genFull(self.pset, 2, 2))
+        packed = gp.packTree(tree)
+        self.assertIsInstance(packed, gp.PrimitiveArrayTree)
+        self.assertEqual(packed, tree)
+        self.assertIs(gp.packTree(packed), packed)
+
+
+class CompileCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.pset = get_pset()
+
+    def test_clone_hits(self):
+        cache = gp.CompileCache()
+        tree = gp.PrimitiveTree(gp.genFull(self.pset, 2, 4))
+        clone = gp.PrimitiveTree(list(tree))
+        func = cache(tree, self.pset)
+        self.assertIs(cache(clone, self.pset), func)
+        self.assertEqual(func(3, 5), gp.compile(tree, self.pset)(3, 5))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_pset_is_part_of_key(self):
+        cache = gp.CompileCache()
+        tree = gp.PrimitiveTree.from_string("add(ARG0, ARG1)", self.pset)
+        cache(tree, self.pset)
+        cache(tree, get_pset())
+        self.assertEqual(cache.misses, 2)
+
+    def test_terminals_keyed_on_format(self):
+        cache = gp.CompileCache()
+        add = self.pset.mapping["add"]
+        for value in (1, 1.0, "1"):
+            tree = gp.PrimitiveTree([add, self.pset.mapping["ARG0"],
+                                     gp.Terminal(value, False, object)])
+            self.assertEqual(cache(tree, self.pset)(value, None), value + value)
+        self.assertEqual(cache.misses, 3)
+
+    def test_eviction(self):
+        cache = gp.CompileCache(maxsize=2)
+        exprs = ["add(ARG0, ARG1)", "sub(ARG0, ARG1)", "mul(ARG0, ARG1)"]
+        trees = [gp.PrimitiveTree.from_string(e, self.pset) for e in exprs]
+        for tree in trees:
+            cache(tree, self.pset)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        cache(trees[0], self.pset)
+        self.assertEqual(cache.hits, 0)
+
+
+class InterpretTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.pset = get_pset()
+        self.pset.addPrimitive(max, 3)
+        self.pset.addEphemeralConstant("rand100", rand100)
+
+    def test_matches_compile(self):
+        for _ in range(50):
+            tree = gp.PrimitiveTree(gp.genGrow(self.pset, 1, 5))
+            self.assertEqual(gp.interpret(tree, self.pset)(3, 7),
+                             gp.compile(tree, self.pset)(3, 7), str(tree))
+
+    def test_deep_tree(self):
+        # Too deep to be compiled by eval
+        expr = "add(ARG0, " * 500 + "ARG1" + ")" * 500
+        tree = gp.PrimitiveTree.from_string(expr, self.pset)
+        self.assertEqual(gp.interpret(tree, self.pset)(1, 2), 502)
+
+    def test_no_arguments(self):
+        pset = gp.PrimitiveSet("MAIN", 0)
+        pset.addPrimitive(operator.mul, 2)
+        pset.addTerminal(3)
+        tree = gp.PrimitiveTree.from_string("mul(3, mul(3, 3))", pset)
+        self.assertEqual(gp.interpret(tree, pset), 27)
+
+    def test_adf(self):
+        adfset = gp.PrimitiveSet("ADF0", 2)
+        adfset.addPrimitive(operator.sub, 2)
+        mainset = gp.PrimitiveSet("MAIN", 2)
+        mainset.addPrimitive(operator.add, 2)
+        mainset.addADF(adfset)
+        adf = gp.PrimitiveTree.from_string("sub(ARG0, ARG1)", adfset)
+        main = gp.PrimitiveTree.from_string("ADF0(ARG1, add(ARG0, ARG0))", mainset)
+        func = gp.interpretADF([adf, main], [adfset, mainset])
+        self.assertEqual(func(2, 5), 1)
+
+
+@unittest.skipIf(not numpy, "Cannot import Numpy numerical library")
+class EvaluateVectorizedTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.pset = get_pset()
+        self.pset.addPrimitive(max, 2)
+        self.pset.vectorized["add"] = numpy.add
+        self.pset.vectorized["mul"] = numpy.multiply
+        self.columns = numpy.random.rand(2, 16)
+
+    def test_matches_compile(self):
+        for _ in range(50):
+            tree = gp.PrimitiveTree(gp.genGrow(self.pset, 1, 4))
+            func = gp.compile(tree, self.pset)
+            expected = [func(*case) for case in zip(*self.columns)]
+            result = gp.evaluateVectorized(tree, self.pset, *self.columns)
+            self.assertEqual(result.shape, (16,))
+            self.assertTrue(numpy.allclose(result, expected), str(tree))
+
+    def test_adf(self):
+        adfset = gp.PrimitiveSet("ADF0", 2)
+        adfset.addPrimitive(operator.sub, 2, vectorized=numpy.subtract)
+        mainset = gp.PrimitiveSet("MAIN", 2)
+        mainset.addPrimitive(operator.add, 2)
+        mainset.addADF(adfset)
+        adf = gp.PrimitiveTree.from_string("sub(ARG0, ARG1)", adfset)
+        main = gp.PrimitiveTree.from_string("ADF0(ARG1, add(ARG0, ARG0))", mainset)
+        x, y = self.columns
+        result = gp.evaluateVectorizedADF([adf, main], [adfset, mainset], x, y)
+        self.assertTrue(numpy.allclose(result, y - 2 * x))
+
+
+class EvaluateBitwiseTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.pset = gp.PrimitiveSet("MAIN", 4, "IN")
+        self.pset.addPrimitive(operator.and_, 2, vectorized=operator.and_)
+        self.pset.addPrimitive(operator.or_, 2, vectorized=operator.or_)
+        self.pset.addPrimitive(operator.xor, 2, vectorized=operator.xor)
+        self.pset.addPrimitive(lambda a: 1 - a, 1, name="not_", vectorized=operator.invert)
+        self.pset.addTerminal(1)
+        self.pset.addTerminal(0)
+
+    def test_matches_compile(self):
+        masks, _, full = parity_masks(4)
+        cases = [[(mask >> i) & 1 for mask in masks] for i in range(16)]
+        for _ in range(50):
+            tree = gp.PrimitiveTree(gp.genGrow(self.pset, 1, 5))
+            func = gp.compile(tree, self.pset)
+            result = gp.evaluateBitwise(tree, self.pset, *masks) & full
+            self.assertEqual([(result >> i) & 1 for i in range(16)],
+                             [int(func(*case)) for case in cases], str(tree))
+
+    def test_parity(self):
+        masks, outputs, full = parity_masks(4)
+        tree = gp.PrimitiveTree.from_string(
+            "not_(xor(xor(IN0, IN1), xor(IN2, IN3)))", self.pset)
+        result = gp.evaluateBitwise(tree, self.pset, *masks)
+        self.assertEqual(gp.countBits(~(result ^ outputs) & full), 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+
+import numpy
+
+from deap import base
+from deap import creator
+from deap import tools
+from deap.tools._hypervolume import load, nphv, pyhv
+
+
+def setUpModule():
+    creator.create("FitnessMin2", base.Fitness, weights=(-1.0, -1.0))
+    creator.create("FitnessMin3", base.Fitness, weights=(-1.0, -1.0, -1.0))
+    creator.create("FitnessMin4", base.Fitness, weights=(-1.0, -1.0, -1.0, -1.0))
+    creator.create("Individual", list)
+
+
+def tearDownModule():
+    del creator.FitnessMin2
+    del creator.FitnessMin3
+    del creator.FitnessMin4
+    del creator.Individual
+
+
+def individual(values):
+    ind = creator.Individual()
+    ind.fitness = creator.__dict__["FitnessMin%d" % len(values)](values)
+    return ind
+
+
+def front(n, m, seed=0):
+    # Points on the unit sphere are non-dominated
+    points = numpy.random.RandomState(seed).rand(n, m)
+    points /= numpy.linalg.norm(points, axis=1)[:, None]
+    return [individual(tuple(p)) for p in points]
+
+
+def leaveOneOut(individuals, ref):
+    points = numpy.array([ind.fitness.values for ind in individuals])
+    total = pyhv.hypervolume(points.copy(), ref)
+    return numpy.array([total - pyhv.hypervolume(numpy.delete(points, i, axis=0), ref)
+                        for i in range(len(points))])
+
+
+class HypervolumeContributionsTest(unittest.TestCase):
+
+    def compare(self, individuals):
+        ref = numpy.ones(len(individuals[0].fitness.values)) * 1.5
+        contribs = tools.hypervolume_contributions(individuals, ref=ref)
+        numpy.testing.assert_allclose(contribs, leaveOneOut(individuals, ref), atol=1e-12)
+
+    def test_two_objectives(self):
+        self.compare(front(50, 2))
+
+    def test_three_objectives(self):
+        self.compare(front(40, 3))
+
+    def test_four_objectives(self):
+        self.compare(front(15, 4))
+
+    def test_duplicates(self):
+        individuals = front(20, 2)
+        individuals.append(individual(individuals[3].fitness.values))
+        ref = numpy.ones(2) * 1.5
+        contribs = tools.hypervolume_contributions(individuals, ref=ref)
+        self.assertEqual(contribs[3], 0.0)
+        self.assertEqual(contribs[-1], 0.0)
+
+    def test_single(self):
+        contribs = tools.hypervolume_contributions([individual((1.0, 2.0, 3.0, 4.0))],
+                                                   ref=numpy.array([2.0, 3.0, 4.0, 5.0]))
+        self.assertEqual(list(contribs), [1.0])
+
+    def test_modes(self):
+        for m in (2, 3):
+            individuals = front(30, m)
+            self.assertEqual(tools.hypervolume(individuals),
+                             tools.hypervolume(individuals, mode="naive"))
+
+
+class NumpyHypervolumeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.random = numpy.random.RandomState(1)
+
+    def compare(self, points, ref):
+        expected = pyhv.hypervolume(points.copy(), ref)
+        self.assertAlmostEqual(nphv.hypervolume(points, ref), expected, places=10)
+
+    def test_two_objectives(self):
+        self.compare(self.random.rand(200, 2), numpy.ones(2) * 1.5)
+
+    def test_three_objectives(self):
+        self.compare(self.random.rand(200, 3), numpy.ones(3) * 1.5)
+
+    def test_ties(self):
+        for m in (2, 3):
+            self.compare(self.random.randint(0, 5, (60, m)).astype(float), numpy.ones(m) * 5)
+
+    def test_four_objectives(self):
+        self.compare(self.random.rand(20, 4), numpy.ones(4) * 1.5)
+
+    def test_unchanged(self):
+        points = self.random.rand(10, 3)
+        copy = points.copy()
+        nphv.hypervolume(points, numpy.ones(3) * 2)
+        numpy.testing.assert_array_equal(points, copy)
+
+    def test_reference(self):
+        points = numpy.array([[1.0, 1.0], [3.0, 0.5]])
+        self.assertEqual(nphv.hypervolume(points, numpy.array([2.0, 2.0])), 1.0)
+        self.assertEqual(nphv.hypervolume(points[1:], numpy.array([2.0, 2.0])), 0.0)
+
+    def test_load(self):
+        self.assertIs(load("numpy"), nphv)
+        self.assertIs(load("python"), pyhv)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,12 @@
+import io
+import json
+import os
 import sys
+import tempfile
 import unittest
 
+import numpy
+
 from deap import tools
 
 class LogbookTest(unittest.TestCase):
@@ -38,6 +44,70 @@ class LogbookTest(unittest.TestCase):
 
 
 
+class ArrayLogbookTest(unittest.TestCase):
+
+    def records(self, n):
+        for gen in range(n):
+            record = dict(gen=gen, evals=100, fitness={'avg' : gen / 3.0, 'max' : numpy.array([gen, 2 * gen])},
+                          length={'avg' : 1.0, 'max' : 30 + gen})
+            if gen == 5:
+                record['note'] = 'restart'
+            if gen == 7:
+                record['evals'] = 2.5
+            yield record
+
+    def test_same_text(self):
+        logbook, arrays = tools.Logbook(), tools.ArrayLogbook()
+        for record in self.records(40):
+            logbook.record(**record)
+            arrays.record(**record)
+            self.assertEqual(arrays.stream, logbook.stream)
+        self.assertEqual(str(arrays), str(logbook))
+        self.assertEqual(len(arrays), 40)
+        self.assertEqual(arrays[5]['note'], 'restart')
+        self.assertNotIn('note', arrays[6])
+
+    def test_select(self):
+        logbook = tools.ArrayLogbook()
+        for record in self.records(40):
+            logbook.record(**record)
+        gen, evals = logbook.select("gen", "evals")
+        self.assertEqual(gen.tolist(), list(range(40)))
+        self.assertEqual(evals[7], 2.5)
+        self.assertEqual(logbook.chapters['fitness'].select("max").shape, (40, 2))
+        self.assertEqual(logbook.select("note")[5], 'restart')
+        self.assertIs(logbook.select("gen").base, logbook.columns["gen"])
+
+    def test_export(self):
+        for format in ("csv", "jsonl"):
+            fd, filename = tempfile.mkstemp(suffix="." + format)
+            os.close(fd)
+            try:
+                logbook = tools.ArrayLogbook(filename=filename)
+                for record in self.records(3):
+                    logbook.record(**record)
+                logbook.close()
+                with open(filename) as file_:
+                    lines = file_.read().splitlines()
+            finally:
+                os.remove(filename)
+            if format == "csv":
+                self.assertEqual(lines[0], "gen,evals,fitness.avg,fitness.max,length.avg,length.max")
+                self.assertEqual(lines[3], '2,100,0.6666666666666666,"[2, 4]",1.0,32')
+            else:
+                self.assertEqual(json.loads(lines[2])['fitness']['max'], [2, 4])
+
+    def test_show(self):
+        logbook = tools.ArrayLogbook(interval=3600)
+        logbook.header = ['gen']
+        output = io.StringIO()
+        for gen in range(3):
+            logbook.record(gen=gen)
+            logbook.show(output)
+        self.assertEqual(output.getvalue().split(), ['gen', '0'])
+        logbook.show(output, force=True)
+        self.assertEqual(output.getvalue().split(), ['gen', '0', '1', '2'])
+
 if __name__ == "__main__":
     suite = unittest.TestLoader().loadTestsFromTestCase(LogbookTest)
     unittest.TextTestRunner(verbosity=2).run(suite)
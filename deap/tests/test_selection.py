@@ -0,0 +1,166 @@
+import random
+import unittest
+from operator import attrgetter
+
+from deap import base
+from deap import creator
+from deap import tools
+
+
+def setUpModule():
+    creator.create("FitnessMax", base.Fitness, weights=(1.0,))
+    creator.create("FitnessMulti", base.Fitness, weights=(-1.0, 1.0))
+    creator.create("FitnessMulti3", base.Fitness, weights=(-1.0, 1.0, 1.0))
+    creator.create("IndMax", list, fitness=creator.FitnessMax)
+    creator.create("IndMulti", list, fitness=creator.FitnessMulti)
+    creator.create("IndMulti3", list, fitness=creator.FitnessMulti3)
+
+
+def tearDownModule():
+    del creator.FitnessMax
+    del creator.FitnessMulti
+    del creator.FitnessMulti3
+    del creator.IndMax
+    del creator.IndMulti
+    del creator.IndMulti3
+
+
+def population(n, ind_type="IndMax"):
+    pop = []
+    for _ in range(n):
+        ind = creator.__dict__[ind_type]()
+        ind.fitness.values = tuple(random.randint(1, 20) for _ in ind.fitness.weights)
+        pop.append(ind)
+    return pop
+
+
+class CumulativeSamplerTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+
+    def test_frequencies(self):
+        sampler = tools.CumulativeSampler([1.0, 0.0, 3.0])
+        indices = sampler.sample(4000)
+        self.assertEqual(len(indices), 4000)
+        self.assertNotIn(1, indices)
+        self.assertAlmostEqual(indices.count(2) / 4000.0, 0.75, delta=0.03)
+
+    def test_single(self):
+        sampler = tools.CumulativeSampler([2.5])
+        self.assertEqual(sampler.sample(3), [0, 0, 0])
+        self.assertEqual(sampler.sample(0), [])
+
+
+class PopulationSelectionTest(unittest.TestCase):
+    """The selections give the same results on a Population"""
+
+    def setUp(self):
+        random.seed(42)
+
+    def compare(self, select, pop, *args):
+        random.seed(7)
+        expected = select(pop, *args)
+        random.seed(7)
+        self.assertEqual([id(ind) for ind in select(tools.Population(pop), *args)],
+                         [id(ind) for ind in expected])
+
+    def test_tournament(self):
+        self.compare(tools.selTournament, population(100), 60, 3)
+        self.compare(tools.selTournament, population(100, "IndMulti"), 60, 4)
+
+    def test_roulette(self):
+        self.compare(tools.selRoulette, population(100), 60)
+
+
+class VectorSelectionTest(unittest.TestCase):
+    """The vectorized selections agree with the loops they replace"""
+
+    def setUp(self):
+        random.seed(42)
+
+    def test_tournament(self):
+        pop = population(100, "IndMulti")
+        random.seed(3)
+        expected = [max([random.choice(pop) for _ in range(4)], key=attrgetter("fitness"))
+                    for _ in range(60)]
+        for k in (1, 60):
+            random.seed(3)
+            chosen = tools.selTournament(pop, k, 4)
+            self.assertEqual([id(ind) for ind in chosen], [id(ind) for ind in expected[:k]])
+
+    def test_tournament_invalid(self):
+        pop = population(2)
+        del pop[1].fitness.values
+        random.seed(3)
+        chosen = tools.selTournament(pop, 50, 20)
+        self.assertTrue(all(ind is pop[0] for ind in chosen))
+
+    def test_roulette(self):
+        pop = population(50)
+        s_inds = sorted(pop, key=attrgetter("fitness"), reverse=True)
+        sum_fits = sum(ind.fitness.values[0] for ind in pop)
+        random.seed(5)
+        expected = []
+        for i in range(40):
+            u = random.random() * sum_fits
+            sum_ = 0
+            for ind in s_inds:
+                sum_ += ind.fitness.values[0]
+                if sum_ > u:
+                    expected.append(ind)
+                    break
+        random.seed(5)
+        chosen = tools.selRoulette(pop, 40)
+        self.assertEqual([id(ind) for ind in chosen], [id(ind) for ind in expected])
+
+    def test_nondominated(self):
+        pop = population(200, "IndMulti")
+        for k in (1, 50, 200):
+            fronts = tools.sortNondominated(pop, k)
+            array_fronts = tools.sortNondominated(tools.Population(pop), k)
+            self.assertEqual([sorted(map(id, front)) for front in array_fronts],
+                             [sorted(map(id, front)) for front in fronts])
+        first = tools.sortNondominated(tools.Population(pop), 200, first_front_only=True)
+        self.assertEqual(len(first), 1)
+
+
+class ArrayNondominatedTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+
+    def compare(self, pop, k, **kargs):
+        fronts = tools.sortNondominated(pop, k)
+        array_fronts = tools.sortArrayNondominated(pop, k, **kargs)
+        self.assertEqual([sorted(map(id, front)) for front in array_fronts],
+                         [sorted(map(id, front)) for front in fronts])
+
+    def test_two_objectives(self):
+        pop = population(300, "IndMulti")
+        for k in (1, 100, 300):
+            self.compare(pop, k)
+
+    def test_three_objectives(self):
+        pop = population(300, "IndMulti3")
+        for k in (1, 100, 300):
+            self.compare(pop, k)
+            self.compare(pop, k, blocksize=7)
+
+    def test_first_front_only(self):
+        pop = population(100, "IndMulti3")
+        first = tools.sortArrayNondominated(pop, 100, first_front_only=True)
+        self.assertEqual(sorted(map(id, first[0])),
+                         sorted(map(id, tools.sortNondominated(pop, 100)[0])))
+
+    def test_nsga2(self):
+        pop = population(100, "IndMulti")
+        chosen = tools.selNSGA2(pop, 40, nd='array')
+        self.assertEqual(len(chosen), 40)
+        # Only the order of the ties on crowding distance may differ
+        self.assertEqual(sorted(ind.fitness.values for ind in chosen),
+                         sorted(ind.fitness.values for ind in tools.selNSGA2(pop, 40)))
+
+
+if __name__ == "__main__":
+    unittest.main()
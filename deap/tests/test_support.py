@@ -0,0 +1,386 @@
+import operator
+import os
+import random
+import tempfile
+import unittest
+
+import numpy
+
+from deap import base
+from deap import creator
+from deap import gp
+from deap import tools
+
+
+def setUpModule():
+    creator.create("FitnessMulti", base.Fitness, weights=(-1.0, 1.0))
+    creator.create("FitnessMulti3", base.Fitness, weights=(-1.0, 1.0, 1.0))
+    creator.create("Individual", list, fitness=creator.FitnessMulti)
+    creator.create("IndArray", numpy.ndarray, fitness=creator.FitnessMulti)
+
+
+def tearDownModule():
+    del creator.FitnessMulti
+    del creator.FitnessMulti3
+    del creator.Individual
+    del creator.IndArray
+
+
+def population(n):
+    pop = []
+    for _ in range(n):
+        ind = creator.Individual()
+        ind.fitness.values = (random.randint(0, 9), random.randint(0, 9))
+        pop.append(ind)
+    return pop
+
+
+class EvaluationCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.pset = gp.PrimitiveSet("MAIN", 1)
+        self.pset.addPrimitive(operator.add, 2)
+        self.pset.addTerminal(1)
+
+    def evaluate(self, individual):
+        self.calls.append(str(individual))
+        return len(individual),
+
+    def tree(self, string):
+        return gp.PrimitiveTree.from_string(string, self.pset)
+
+    def test_call(self):
+        cache = tools.EvaluationCache(self.evaluate)
+        self.assertEqual(cache(self.tree("add(ARG0, 1)")), (3,))
+        self.assertEqual(cache(self.tree("add(ARG0, 1)")), (3,))
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(cache.hit_rate, 0.5)
+
+    def test_map_deduplicates(self):
+        cache = tools.EvaluationCache(self.evaluate)
+        cache(self.tree("ARG0"))
+        trees = [self.tree(s) for s in ("add(1, 1)", "ARG0", "add(1, 1)", "1")]
+        self.assertEqual(cache.map(trees), [(3,), (1,), (3,), (1,)])
+        self.assertEqual(self.calls, ["ARG0", "add(1, 1)", "1"])
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+
+    def test_eviction(self):
+        cache = tools.EvaluationCache(self.evaluate, maxsize=2)
+        for string in ("ARG0", "1", "ARG0", "add(1, 1)", "ARG0", "1"):
+            cache(self.tree(string))
+        self.assertEqual(self.calls, ["ARG0", "1", "add(1, 1)", "1"])
+        self.assertEqual(cache.evictions, 2)
+        self.assertEqual(len(cache), 2)
+
+    def test_adf_key(self):
+        main, adf = self.tree("add(ARG0, 1)"), self.tree("ARG0")
+        self.assertEqual(tools.canonical([main, adf]), "add(ARG0, 1)\nARG0")
+
+
+
+class HistoryTest(unittest.TestCase):
+
+    def individual(self, content):
+        return creator.Individual(content)
+
+    def evolve(self, history):
+        mutate = history.decorator(lambda ind: (ind,))
+        population = [self.individual([i % 2]) for i in range(4)]
+        history.update(population)
+        for gen in range(5):
+            for i, ind in enumerate(population):
+                ind.append(i % 2)
+                mutate(ind)
+        return population
+
+    def test_genealogy(self):
+        history = tools.History()
+        population = self.evolve(history)
+        self.assertEqual(history.genealogy_index, 24)
+        self.assertEqual(list(history.genealogy_history[23]), [0] * 6)
+        self.assertEqual(history.genealogy_history[23].history_index, 23)
+        self.assertEqual(history.getGenealogy(population[3], max_depth=2),
+                         {24: (20,), 20: (16,)})
+        # Two distinct contents per generation
+        self.assertEqual(len(history.genealogy_history), 24)
+        self.assertEqual(len(history.genealogy_history.blobs), 12)
+
+    def test_exact_content(self):
+        history = tools.History()
+        first, second, third = (creator.IndArray(values) for values in
+                                ([0.1234567891, 0.5], [0.1234567899, 0.5], [0.1234567891, 0.5]))
+        history.update([first, second, third])
+        self.assertEqual(history.genealogy_history[2].tolist(), second.tolist())
+        self.assertEqual(history.genealogy_history[3].tolist(), first.tolist())
+        self.assertEqual(len(history.genealogy_history.blobs), 2)
+
+    def test_attributes(self):
+        history = tools.History()
+        inds = [self.individual([1]) for _ in range(3)]
+        inds[0].strategy = [1.0]
+        inds[1].strategy = [2.0]
+        inds[2].strategy = [1.0]
+        history.update(inds)
+        self.assertEqual(history.genealogy_history[2].strategy, [2.0])
+        self.assertEqual(len(history.genealogy_history.blobs), 2)
+
+    def test_window(self):
+        history = tools.History(window=10)
+        population = self.evolve(history)
+        self.assertEqual(sorted(history.genealogy_tree), list(range(15, 25)))
+        self.assertEqual(sorted(history.genealogy_history), list(range(15, 25)))
+        self.assertEqual(len(history.genealogy_history.blobs), 6)
+        self.assertEqual(history.getGenealogy(population[0]),
+                         {21: (17,), 17: (13,)})
+
+    def test_prune(self):
+        history = tools.History()
+        population = self.evolve(history)
+        history.prune(population[:1])
+        self.assertEqual(sorted(history.genealogy_tree), [1, 5, 9, 13, 17, 21])
+        self.assertEqual(len(history.genealogy_history.blobs), 6)
+        self.assertEqual(list(history.genealogy_history[9]), [0] * 3)
+
+    def test_sqlite(self):
+        fd, filename = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            history = tools.History(window=10, filename=filename)
+            self.evolve(history)
+            self.assertEqual(len(history.genealogy_history.blobs), 6)
+            self.assertEqual(list(history.genealogy_history[24]), [1] * 6)
+            history.genealogy_history.blobs.connection.close()
+        finally:
+            os.remove(filename)
+
+
+class HallOfFameTest(unittest.TestCase):
+
+    def individual(self, content, values):
+        ind = creator.Individual([content])
+        ind.fitness.values = values
+        return ind
+
+    def test_order(self):
+        random.seed(42)
+        hof = tools.HallOfFame(10)
+        seen = []
+        for _ in range(5):
+            pop = [self.individual(random.random(), (random.randint(0, 3), random.randint(0, 3)))
+                   for _ in range(20)]
+            hof.update(pop)
+            seen.extend(pop)
+        # The newer individuals come first among equal fitnesses
+        best = sorted(enumerate(seen), key=lambda p: (p[1].fitness.wvalues, p[0]), reverse=True)
+        self.assertEqual([ind for ind in hof], [ind for _, ind in best[:10]])
+        self.assertEqual(hof.keys, [ind.fitness for ind in reversed(hof)])
+
+    def test_duplicates(self):
+        hof = tools.HallOfFame(3)
+        hof.update([self.individual(1, (0, 1)), self.individual(1, (0, 2)),
+                    self.individual(2, (0, 0))])
+        self.assertEqual([ind[0] for ind in hof], [1, 2])
+        hof.update([self.individual(3, (0, 5)), self.individual(4, (0, 4))])
+        self.assertEqual([ind[0] for ind in hof], [3, 4, 1])
+        hof.update([self.individual(2, (0, 6))])
+        self.assertEqual([ind[0] for ind in hof], [2, 3, 4])
+        self.assertEqual(sorted(hof.counts), [(2,), (3,), (4,)])
+
+    def test_equal_content(self):
+        hof = tools.HallOfFame(5)
+        hof.update([self.individual(1, (0, 1)), self.individual(1.0, (0, 2)),
+                    self.individual(0.0, (0, 3)), self.individual(-0.0, (0, 4))])
+        self.assertEqual([ind.fitness.values for ind in hof], [(0, 3), (0, 1)])
+
+    def test_exact_arrays(self):
+        hof = tools.HallOfFame(3, similar=numpy.array_equal)
+        exact = tools.HallOfFame(3)
+        pop = [creator.IndArray(values) for values in
+               ([0.1234567891, 0.5], [0.1234567899, 0.5], [0.1234567891, 0.5])]
+        for i, ind in enumerate(pop):
+            ind.fitness.values = (0, i)
+        hof.update(pop)
+        exact.update(pop)
+        self.assertEqual([ind.fitness.values for ind in exact], [(0, 1), (0, 0)])
+        self.assertEqual([ind.fitness.values for ind in exact],
+                         [ind.fitness.values for ind in hof])
+
+    def test_similar(self):
+        hof = tools.HallOfFame(3, similar=lambda a, b: a[0] % 2 == b[0] % 2)
+        hof.update([self.individual(i, (0, i)) for i in range(6)])
+        self.assertEqual([ind[0] for ind in hof], [1, 0])
+
+    def test_not_a_sequence(self):
+        class Program(object):
+            def __init__(self, values):
+                self.fitness = creator.FitnessMulti(values)
+
+        class Expression(Program):
+            def __eq__(self, other):
+                return str(self) == str(other)
+
+            def __str__(self):
+                return "x"
+
+        hof = tools.HallOfFame(3)
+        hof.update([Program((0, 1)), Program((0, 1))])
+        self.assertEqual(len(hof), 2)
+        hof = tools.HallOfFame(3)
+        hof.update([Expression((0, 1)), Expression((0, 2))])
+        self.assertEqual([ind.fitness.values for ind in hof], [(0, 1)])
+
+    def test_copies(self):
+        ind = self.individual(1, (0, 1))
+        hof = tools.HallOfFame(2)
+        hof.update([ind])
+        self.assertIsNot(hof[0], ind)
+        hof.remove(0)
+        self.assertEqual(len(hof), 0)
+
+
+class ParetoFrontTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+
+    def population(self, n, nobj):
+        pop = population(n)
+        if nobj == 3:
+            for ind in pop:
+                ind.fitness = creator.FitnessMulti3(ind.fitness.values + (random.randint(0, 9),))
+        for ind in pop:
+            ind.append(random.randint(0, 2))
+        return pop
+
+    def check(self, nobj):
+        front = tools.ParetoFront()
+        seen = []
+        for _ in range(4):
+            pop = self.population(30, nobj)
+            front.update(pop)
+            seen.extend(pop)
+        expected = set()
+        for ind in seen:
+            if not any(other.fitness.dominates(ind.fitness) for other in seen):
+                expected.add((tuple(ind.fitness.values), tuple(ind)))
+        self.assertEqual(sorted((tuple(ind.fitness.values), tuple(ind)) for ind in front),
+                         sorted(expected))
+        self.assertEqual([ind.fitness.wvalues for ind in front],
+                         sorted((ind.fitness.wvalues for ind in front), reverse=True))
+
+    def test_two_objectives(self):
+        self.check(2)
+
+    def test_three_objectives(self):
+        self.check(3)
+
+    def test_maxsize(self):
+        pop = self.population(30, 3)
+        full, front = tools.ParetoFront(), tools.ParetoFront(maxsize=5)
+        full.update(pop)
+        front.update(pop)
+        self.assertEqual(len(full), 6)
+        self.assertEqual(len(front), 5)
+        # The extremes of the front have an infinite crowding distance
+        dropped = [ind.fitness.values for ind in full if ind.fitness.values not in
+                   [other.fitness.values for other in front]]
+        self.assertEqual(dropped, [(5.0, 9.0, 8.0)])
+
+    def test_epsilon(self):
+        front = tools.ParetoFront(epsilon=4)
+        pop = self.population(100, 3)
+        front.update(pop)
+        boxes = [tuple(w // 4 for w in ind.fitness.wvalues) for ind in front]
+        self.assertEqual(len(set(boxes)), len(boxes))
+        for box in boxes:
+            self.assertFalse(any(other != box and all(o >= b for o, b in zip(other, box))
+                                 for other in boxes))
+
+
+class StatisticsTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.pop = population(50)
+        self.keys = []
+
+    def values(self, ind):
+        self.keys.append(ind)
+        return ind.fitness.values
+
+    def test_fused(self):
+        stats = tools.Statistics(self.values)
+        for name, function in (("avg", numpy.mean), ("std", numpy.std),
+                               ("min", numpy.min), ("max", numpy.max)):
+            stats.register(name, function, axis=0)
+            stats.register(name + "_all", function)
+        stats.register("len", len)
+        record = stats.compile(self.pop)
+        values = [ind.fitness.values for ind in self.pop]
+        for name, function in (("avg", numpy.mean), ("std", numpy.std),
+                               ("min", numpy.min), ("max", numpy.max)):
+            numpy.testing.assert_allclose(record[name], function(values, axis=0))
+            numpy.testing.assert_allclose(record[name + "_all"], function(values))
+        self.assertEqual(record["len"], 50)
+        self.assertEqual(len(self.keys), 50)
+
+    def test_multi_shares_extraction(self):
+        mstats = tools.MultiStatistics(a=tools.Statistics(self.values),
+                                       b=tools.Statistics(self.values),
+                                       size=tools.Statistics(len))
+        mstats.register("max", numpy.max, axis=0)
+        record = mstats.compile(self.pop)
+        self.assertEqual(len(self.keys), 50)
+        self.assertEqual(record["a"]["max"].tolist(), record["b"]["max"].tolist())
+        self.assertEqual(record["size"]["max"], 0)
+
+class PopulationTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.pop = tools.Population(population(50))
+
+    def test_arrays(self):
+        self.assertEqual(self.pop.wvalues.shape, (50, 2))
+        self.assertEqual(self.pop.values.tolist(), [list(ind.fitness.values) for ind in self.pop])
+        ranks = self.pop.ranks
+        for i in range(len(self.pop) - 1):
+            a, b = self.pop[i].fitness, self.pop[i + 1].fitness
+            self.assertEqual(ranks[i] < ranks[i + 1], a < b)
+            self.assertEqual(ranks[i] == ranks[i + 1], a == b)
+
+    def test_refreshed(self):
+        wvalues = self.pop.wvalues
+        self.assertIs(self.pop.wvalues, wvalues)
+        self.pop[3].fitness.values = (100, 100)
+        self.assertEqual(self.pop.wvalues[3].tolist(), [-100, 100])
+        del self.pop[3].fitness.values
+        self.assertTrue(numpy.isnan(self.pop.wvalues[3]).all())
+        self.pop.append(creator.Individual())
+        self.pop[-1].fitness.values = (1, 1)
+        self.assertEqual(self.pop.wvalues.shape, (51, 2))
+
+    def test_better(self):
+        pivot = self.pop[0].fitness
+        self.assertEqual(self.pop.better(pivot.wvalues).tolist(),
+                         [i for i, ind in enumerate(self.pop) if ind.fitness > pivot])
+
+    def test_statistics(self):
+        stats = tools.Statistics(tools.fitnessValues)
+        stats.register("mean", numpy.mean, axis=0)
+        stats.register("max", numpy.max)
+        self.assertEqual({k: numpy.asarray(v).tolist() for k, v in stats.compile(self.pop).items()},
+                         {k: numpy.asarray(v).tolist() for k, v in stats.compile(list(self.pop)).items()})
+
+    def test_hall_of_fame(self):
+        hof1, hof2 = tools.HallOfFame(5), tools.HallOfFame(5)
+        for _ in range(3):
+            pop = population(40)
+            hof1.update(pop)
+            hof2.update(tools.Population(pop))
+        self.assertEqual([ind.fitness for ind in hof1], [ind.fitness for ind in hof2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,4 +11,28 @@
 #    GNU Lesser General Public License for more details.
 #
 #    You should have received a copy of the GNU Lesser General Public
-#    License along with DEAP. If not, see <http://www.gnu.org/licenses/>.
\ No newline at end of file
+#    License along with DEAP. If not, see <http://www.gnu.org/licenses/>.
+"""Hypervolume computation. Three modules provide the same
+:func:`hypervolume` function: the C version :mod:`hv`, the NumPy version
+:mod:`nphv` and the pure Python version :mod:`pyhv`.
+"""
+
+import importlib
+
+BACKENDS = {"c": "hv", "numpy": "nphv", "python": "pyhv"}
+
+def load(name=None):
+    """Returns the hypervolume module *name*, one of "c", "numpy" or
+    "python". Without *name*, the C version is returned if it can be
+    imported, the NumPy version otherwise. ::
+
+        >>> hv = load("numpy")
+        >>> hv.hypervolume([(1.0, 2.0), (2.0, 1.0)], [3.0, 3.0])
+        3.0
+    """
+    if name is not None:
+        return importlib.import_module("." + BACKENDS[name], __name__)
+    try:
+        return load("c")
+    except ImportError:
+        return load("numpy")
@@ -0,0 +1,108 @@
+#    This file is part of DEAP.
+#
+#    DEAP is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as
+#    published by the Free Software Foundation, either version 3 of
+#    the License, or (at your option) any later version.
+#
+#    DEAP is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public
+#    License along with DEAP. If not, see <http://www.gnu.org/licenses/>.
+
+from bisect import bisect_right
+
+import numpy
+
+from . import pyhv
+
+
+def hypervolume(pointset, ref):
+    """Compute the absolute hypervolume of a *pointset* according to the
+    reference point *ref*, minimization being assumed. The points that do
+    not dominate the reference point are ignored and the *pointset* is not
+    modified.
+
+    Two dimensional sets are swept along the first objective in a single
+    NumPy pass. Three dimensional sets are swept along the third objective,
+    keeping the staircase of the first two objectives of the points already
+    swept, in :math:`O(N \\log N)` comparisons, see [Beume2009]_. Sets of more
+    dimensions fall back on the Python version.
+
+    .. [Beume2009] Beume, Fonseca, Lopez-Ibanez, Paquete and Vahrenhold, "On
+       the complexity of computing the hypervolume indicator", 2009.
+    """
+    ref = numpy.asarray(ref, dtype=float)
+    points = numpy.array(pointset, dtype=float).reshape(-1, len(ref))
+    points = points[(points < ref).all(axis=1)]
+    if len(points) == 0:
+        return 0.0
+    elif len(ref) == 1:
+        return float(ref[0] - points[:, 0].min())
+    elif len(ref) == 2:
+        return _hypervolume2D(points, ref)
+    elif len(ref) == 3:
+        return _hypervolume3D(points, ref)
+    return pyhv.hypervolume(points, ref)
+
+def _hypervolume2D(points, ref):
+    # Increasing first objective, the staircase of the points not dominated
+    # having a decreasing second objective
+    order = numpy.lexsort((points[:, 1], points[:, 0]))
+    x, y = points[order, 0], points[order, 1]
+    stair = numpy.ones(len(order), dtype=bool)
+    stair[1:] = y[1:] < numpy.minimum.accumulate(y)[:-1]
+    x, y = x[stair], y[stair]
+    right = numpy.append(x[1:], ref[0])
+    return float(numpy.dot(right - x, ref[1] - y))
+
+def _hypervolume3D(points, ref):
+    order = numpy.lexsort(points.T)
+    x, y, z = (points[order, i].tolist() for i in range(3))
+    heights = numpy.diff(numpy.append(z, ref[2])).tolist()
+    # Staircase of the first two objectives of the swept points, increasing
+    # first objective and decreasing second objective
+    xs, ys = [], []
+    area = volume = 0.0
+    for xi, yi, height in zip(x, y, heights):
+        i = bisect_right(xs, xi)
+        if i == 0 or ys[i-1] > yi:
+            # Remove the points dominated by the new one, gaining the area
+            # between them and the new point
+            j = i
+            while j < len(ys) and ys[j] >= yi:
+                j += 1
+            bounds = [xi] + xs[i:j] + [xs[j] if j < len(xs) else ref[0]]
+            uppers = [ys[i-1] if i > 0 else ref[1]] + ys[i:j]
+            area += sum((b2 - b1) * (u - yi) for b1, b2, u in zip(bounds, bounds[1:], uppers))
+            xs[i:j] = [xi]
+            ys[i:j] = [yi]
+        volume += area * height
+    return volume
+
+__all__ = ["hypervolume"]
+
+if __name__ == "__main__":
+    import timeit
+
+    try:
+        from deap.tools._hypervolume import hv
+    except ImportError:
+        hv = None
+        print("Cannot import C version of hypervolume")
+
+    for dim, size in ((2, 1000), (3, 200), (3, 1000)):
+        points = numpy.random.rand(size, dim)
+        pointset = points / numpy.linalg.norm(points, axis=1)[:, None]
+        ref = numpy.ones(dim) * 2
+
+        print("%dD, %d points" % (dim, size))
+        for name, function in (("NumPy", hypervolume), ("Python", pyhv.hypervolume),
+                             ("C", hv and hv.hypervolume)):
+            if function is None:
+                continue
+            time = min(timeit.repeat(lambda: function(pointset.copy(), ref), number=1, repeat=3))
+            print("  %s version: %f (%.4fs)" % (name, function(pointset.copy(), ref), time))
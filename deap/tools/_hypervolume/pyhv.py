@@ -36,6 +36,13 @@ def hypervolume(pointset, ref):
     hv = _HyperVolume(ref)
     return hv.compute(pointset)
 
+def contributions(pointset, ref):
+    """Compute the exclusive hypervolume contribution of every point of a
+    non-dominated *pointset* according to the reference point *ref*.
+    """
+    hv = _HyperVolume(ref)
+    return hv.contributions(pointset)
+
 
 class _HyperVolume:
     """
@@ -99,6 +106,33 @@ class _HyperVolume:
         return hyperVolume
 
 
+    def contributions(self, front):
+        """Returns the exclusive hypervolume contribution of every point of a
+        non-dominated front.
+
+        The part of the box of a point that is also dominated by the other
+        points is the hypervolume of the other points limited to this box.
+        The front is translated once for all the contributions and each
+        limited set is sorted with NumPy instead of the node sorts of
+        preProcess.
+
+        """
+        points = numpy.array(front, dtype=float) - self.referencePoint
+        dimensions = len(self.referencePoint)
+        contribs = numpy.empty(len(points))
+        for i, point in enumerate(points):
+            limited = numpy.maximum(numpy.delete(points, i, axis=0), point)
+            # The recursion does not handle duplicated points
+            limited = numpy.unique(limited, axis=0)
+            # Same order as the successive stable sorts of preProcess
+            orders = [numpy.lexsort(limited[:, :j+1].T) for j in range(dimensions)]
+            self.preProcessSorted(limited, orders)
+            bounds = [-1.0e308] * dimensions
+            volume = self.hvRecursive(dimensions - 1, len(limited), bounds)
+            contribs[i] = numpy.prod(-point) - volume
+        return contribs
+
+
     def hvRecursive(self, dimIndex, length, bounds):
         """Recursive call to hypervolume calculation.
 
@@ -134,7 +168,7 @@ class _HyperVolume:
             hvRecursive = self.hvRecursive
             p = sentinel
             q = p.prev[dimIndex]
-            while q.cargo != None:
+            while q.cargo is not None:
                 if q.ignore < dimIndex:
                     q.ignore = 0
                 q = q.prev[dimIndex]
@@ -189,6 +223,18 @@ class _HyperVolume:
         self.list = nodeList
 
 
+    def preProcessSorted(self, front, orders):
+        """Sets up the list data structure needed for calculation from the
+        indices of the points of *front* sorted along every dimension.
+        """
+        dimensions = len(self.referencePoint)
+        nodeList = _MultiList(dimensions)
+        nodes = [_MultiList.Node(dimensions, point) for point in front]
+        for i in range(dimensions):
+            nodeList.extend([nodes[j] for j in orders[i]], i)
+        self.list = nodeList
+
+
     def sortByDimension(self, nodes, i):
         """Sorts the list of nodes by the i-th value of the contained points."""
         # build a list of tuples of (point[i], node)
@@ -7,6 +7,13 @@ from itertools import chain
 from operator import attrgetter, itemgetter
 from collections import defaultdict
 
+try:
+    import numpy
+except ImportError:
+    numpy = False
+
+from .support import Population
+
 ######################################
 # Non-Dominated Sorting   (NSGA-II)  #
 ######################################
@@ -22,7 +29,8 @@ def selNSGA2(individuals, k, nd='standard'):
     
     :param individuals: A list of individuals to select from.
     :param k: The number of individuals to select.
-    :param nd: Specify the non-dominated algorithm to use: 'standard' or 'log'.
+    :param nd: Specify the non-dominated algorithm to use: 'standard', 'log'
+               or 'array', the latter using :func:`sortArrayNondominated`.
     :returns: A list of selected individuals.
     
     .. [Deb2002] Deb, Pratab, Agarwal, and Meyarivan, "A fast elitist
@@ -33,6 +41,8 @@ def selNSGA2(individuals, k, nd='standard'):
         pareto_fronts = sortNondominated(individuals, k)
     elif nd == 'log':
         pareto_fronts = sortLogNondominated(individuals, k)
+    elif nd == 'array':
+        pareto_fronts = sortArrayNondominated(individuals, k)
     else:
         raise Exception('selNSGA2: The choice of non-dominated sorting '
                         'method "{0}" is invalid.'.format(nd))
@@ -65,10 +75,16 @@ def sortNondominated(individuals, k, first_front_only=False):
     .. [Deb2002] Deb, Pratab, Agarwal, and Meyarivan, "A fast elitist
        non-dominated sorting genetic algorithm for multi-objective
        optimization: NSGA-II", 2002.
+
+    When *individuals* is a :class:`~deap.tools.Population`, the sorting is
+    done on its array of fitness values by :func:`sortArrayNondominated`.
     """
     if k == 0:
         return []
 
+    if isinstance(individuals, Population):
+        return sortArrayNondominated(individuals, k, first_front_only)
+
     map_fit_ind = defaultdict(list)
     for ind in individuals:
         map_fit_ind[ind.fitness].append(ind)
@@ -114,6 +130,103 @@ def sortNondominated(individuals, k, first_front_only=False):
     
     return fronts
 
+def sortArrayNondominated(individuals, k, first_front_only=False, blocksize=None):
+    """Sort the first *k* *individuals* into different nondomination levels
+    working on a NumPy array of their fitness values. The individuals with
+    equal fitnesses are sorted once, then the unique fitnesses are ordered
+    lexicographically so that an individual can only be dominated by the ones
+    preceding it.
+
+    With two objectives, the fronts are found by a single sweep in
+    :math:`O(N \\log N)`, see [Jensen2003]_. With more objectives, the
+    dominance relations are computed by blocks of *blocksize* rows against
+    all the preceding rows, bounding the memory to the size of a block
+    instead of the :math:`N^2` of the whole dominance matrix.
+
+    :param individuals: A list of individuals or a
+                        :class:`~deap.tools.Population` to select from.
+    :param k: The number of individuals to select.
+    :param first_front_only: If :obj:`True` sort only the first front and
+                             exit.
+    :param blocksize: The number of rows of each block of the dominance
+                      matrix, by default chosen so that a block holds about
+                      a million comparisons.
+    :returns: A list of Pareto fronts (lists), the first list includes
+              nondominated individuals.
+
+    .. [Jensen2003] Jensen, "Reducing the run-time complexity of
+       multiobjective EAs: The NSGA-II and other algorithms", 2003.
+    """
+    if k == 0:
+        return []
+
+    if not isinstance(individuals, Population):
+        individuals = Population(individuals)
+    unique, inverse = numpy.unique(individuals.wvalues, axis=0, return_inverse=True)
+    # Decreasing lexicographic order, the dominating fitnesses first
+    unique = unique[::-1]
+    inverse = len(unique) - 1 - inverse.ravel()
+
+    if unique.shape[1] == 2:
+        ranks = _sweepFronts2D(unique)
+    else:
+        ranks = _blockFronts(unique, blocksize)
+    ranks = ranks[inverse]
+
+    if first_front_only:
+        return [[individuals[i] for i in numpy.flatnonzero(ranks == 0)]]
+
+    order = numpy.argsort(ranks, kind="stable")
+    sizes = numpy.bincount(ranks)
+    fronts = []
+    pareto_sorted = 0
+    N = min(len(individuals), k)
+    for size in sizes:
+        fronts.append([individuals[i] for i in order[pareto_sorted:pareto_sorted + size]])
+        pareto_sorted += size
+        if pareto_sorted >= N:
+            break
+    return fronts
+
+def _sweepFronts2D(wvalues):
+    # Each point is dominated by a preceding point of its front if its
+    # second objective is not greater, the second objective of the last
+    # point added to each front decreasing with the front rank.
+    ranks = numpy.empty(len(wvalues), dtype=int)
+    lasts = []
+    for i, value in enumerate(wvalues[:, 1].tolist()):
+        rank = bisect.bisect_right(lasts, -value)
+        if rank == len(lasts):
+            lasts.append(-value)
+        else:
+            lasts[rank] = -value
+        ranks[i] = rank
+    return ranks
+
+def _blockFronts(wvalues, blocksize=None):
+    N, M = wvalues.shape
+    if blocksize is None:
+        blocksize = max(1, 2**20 // (N * M))
+    ranks = numpy.zeros(N, dtype=int)
+    for begin in range(0, N, blocksize):
+        end = min(begin + blocksize, N)
+        block = wvalues[begin:end]
+        # dominated[i, j]: the preceding row j dominates row begin + i, the
+        # rows being unique
+        dominated = (wvalues[None, :end] >= block[:, None]).all(axis=2)
+        dominated[:, begin:] &= numpy.tri(end - begin, k=-1, dtype=bool)
+        ranks[begin:end] = numpy.where(dominated[:, :begin], ranks[:begin], -1).max(axis=1, initial=-1) + 1
+        # Propagate the ranks within the block up to the longest chain
+        inner = dominated[:, begin:]
+        if inner.any():
+            while True:
+                current = ranks[begin:end]
+                new = numpy.maximum(current, numpy.where(inner, current, -1).max(axis=1) + 1)
+                if (new == current).all():
+                    break
+                ranks[begin:end] = new
+    return ranks
+
 def assignCrowdingDist(individuals):
     """Assign a crowding distance to each individual's fitness. The 
     crowding distance can be retrieve via the :attr:`crowding_dist` 
@@ -587,4 +700,4 @@ def _partition(array, begin, end):
 
 
 __all__ = ['selNSGA2', 'selSPEA2', 'sortNondominated', 'sortLogNondominated',
-           'selTournamentDCD']
+           'sortArrayNondominated', 'selTournamentDCD']
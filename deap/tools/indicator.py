@@ -16,18 +16,25 @@
 
 import numpy
 
-try:
-    # try importing the C version
-    from ._hypervolume import hv as hv
-except ImportError:
-    # fallback on python version
-    from ._hypervolume import pyhv as hv
+from ._hypervolume import load, pyhv
+
+# The C version when it can be imported, the NumPy version otherwise
+hv = load()
 
 def hypervolume(front, **kargs):
     """Returns the index of the individual with the least the hypervolume
     contribution. The provided *front* should be a set of non-dominated
     individuals having each a :attr:`fitness` attribute. 
+
+    By default the contributions are computed all at once by
+    :func:`hypervolume_contributions`. With ``mode="naive"``, the
+    contribution of each individual is obtained from the hypervolume of the
+    front without it, computing N full hypervolumes with the *backend*
+    "c", "numpy" or "python" (see :func:`~deap.tools._hypervolume.load`).
     """
+    if kargs.get("mode", "sweep") == "sweep":
+        return numpy.argmin(hypervolume_contributions(front, **kargs))
+
     # Must use wvalues * -1 since hypervolume use implicit minimization
     # And minimization in deap use max on -obj
     wobj = numpy.array([ind.fitness.wvalues for ind in front]) * -1
@@ -35,10 +42,12 @@ def hypervolume(front, **kargs):
     if ref is None:
         ref = numpy.max(wobj, axis=0) + 1
     
+    hv_ = load(kargs["backend"]) if kargs.get("backend") else hv
+
     def contribution(i):
         # The contribution of point p_i in point set P
         # is the hypervolume of P without p_i
-        return hv.hypervolume(numpy.concatenate((wobj[:i], wobj[i+1:])), ref)
+        return hv_.hypervolume(numpy.concatenate((wobj[:i], wobj[i+1:])), ref)
 
     # Parallelization note: Cannot pickle local function
     contrib_values = list(map(contribution, list(range(len(front)))))
@@ -46,6 +55,82 @@ def hypervolume(front, **kargs):
     # Select the maximum hypervolume value (correspond to the minimum difference)
     return numpy.argmax(contrib_values)
 
+def hypervolume_contributions(front, **kargs):
+    """Returns the array of the exclusive hypervolume contribution of every
+    individual of *front*, the hypervolume dominated only by this individual.
+    The provided *front* should be a set of non-dominated individuals having
+    each a :attr:`fitness` attribute, the reference point *ref* defaults to
+    the worst value of every objective plus one.
+
+    The contributions are computed in a single pass: a sweep along the first
+    objective for two objectives, a sweep along the third objective over the
+    two dimensional contributions of the slices for three objectives, and
+    the recursion of the Python hypervolume on the points limited to the box
+    of each individual for more objectives.
+    """
+    wobj = numpy.array([ind.fitness.wvalues for ind in front], dtype=float) * -1
+    ref = kargs.get("ref", None)
+    if ref is None:
+        ref = numpy.max(wobj, axis=0) + 1
+    ref = numpy.asarray(ref, dtype=float)
+
+    if wobj.shape[1] == 2:
+        return _contributions2D(wobj, ref)
+    elif wobj.shape[1] == 3:
+        return _contributions3D(wobj, ref)
+    return pyhv.contributions(wobj, ref)
+
+def _contributions2D(points, ref):
+    contribs = numpy.zeros(len(points))
+    if len(points) == 0:
+        return contribs
+
+    # Increasing first objective, the staircase of the points not dominated
+    # having a decreasing second objective
+    order = numpy.lexsort((points[:, 1], points[:, 0]))
+    x, y = points[order, 0], points[order, 1]
+    stair = numpy.ones(len(order), dtype=bool)
+    stair[1:] = y[1:] < numpy.minimum.accumulate(y)[:-1]
+    sx, sy = x[stair], y[stair]
+    right = numpy.append(sx[1:], ref[0])
+    upper = numpy.append(ref[1], sy[:-1])
+    areas = (right - sx) * (upper - sy)
+
+    # A dominated point reduces the contribution of its only dominating
+    # point, when it falls in the rectangle exclusive to this point
+    ox, oy = x[~stair], y[~stair]
+    owner = numpy.searchsorted(sx, ox, side="right") - 1
+    inside = oy < upper[owner]
+    ox, oy, owner = ox[inside], oy[inside], owner[inside]
+    if len(owner) > 0:
+        # The rectangles are stacked with a decreasing second objective, the
+        # staircase in each one is found in a single pass
+        o = numpy.lexsort((oy, ox, owner))
+        ox, oy, owner = ox[o], oy[o], owner[o]
+        ostair = numpy.ones(len(o), dtype=bool)
+        ostair[1:] = oy[1:] < numpy.minimum.accumulate(oy)[:-1]
+        ox, oy, owner = ox[ostair], oy[ostair], owner[ostair]
+        nextx = numpy.append(ox[1:], 0.0)
+        last = numpy.append(owner[1:] != owner[:-1], True)
+        nextx[last] = right[owner[last]]
+        areas -= numpy.bincount(owner, (nextx - ox) * (upper[owner] - oy),
+                                minlength=len(areas))
+
+    contribs[order[stair]] = areas
+    return contribs
+
+def _contributions3D(points, ref):
+    contribs = numpy.zeros(len(points))
+    order = numpy.argsort(points[:, 2], kind="stable")
+    heights = numpy.diff(numpy.append(points[order, 2], ref[2]))
+    # Each slice between two consecutive values of the third objective adds
+    # the two dimensional contributions of the points below it
+    for i, height in enumerate(heights):
+        if height > 0:
+            below = order[:i+1]
+            contribs[below] += height * _contributions2D(points[below, :2], ref[:2])
+    return contribs
+
 def additive_epsilon(front, **kargs):
     """Returns the index of the individual with the least the additive epsilon
     contribution. The provided *front* should be a set of non-dominated
@@ -91,4 +176,5 @@ def multiplicative_epsilon(front, **kargs):
 
 
 
-__all__ = ["hypervolume", "additive_epsilon", "multiplicative_epsilon"]
\ No newline at end of file
+__all__ = ["hypervolume", "hypervolume_contributions", "additive_epsilon",
+           "multiplicative_epsilon"]
\ No newline at end of file
@@ -1,13 +1,58 @@
 
 import random
 
+from bisect import bisect_right
 from functools import partial
+from itertools import accumulate
 from operator import attrgetter
 
+from .support import Population
+
+try:
+    import numpy
+except ImportError:
+    numpy = False
+
 ######################################
 # Selections                         #
 ######################################
 
+class CumulativeSampler(object):
+    """Draw indices at random, each with a probability proportional to its
+    weight. The cumulative sum of the *weights* is computed once, when the
+    sampler is created, then each draw is a binary search in it, so that
+    drawing *k* indices among *n* costs O(k log n) instead of O(k n) when
+    the weights are scanned again at every draw.
+
+    :param weights: A sequence of non negative weights, not all null.
+
+    A sampler is meant to be built once per generation and used for all
+    the selections of that generation. The draws use the :func:`~random.random`
+    function from the python base :mod:`random` module, the binary searches
+    are done all at once with :func:`numpy.searchsorted` when NumPy is
+    available.
+    """
+    def __init__(self, weights):
+        if numpy:
+            self.cumulative = numpy.cumsum(numpy.asarray(weights, dtype=float))
+        else:
+            self.cumulative = list(accumulate(weights))
+        self.total = self.cumulative[-1]
+
+    def __len__(self):
+        return len(self.cumulative)
+
+    def sample(self, k):
+        """Return a list of *k* indices drawn with replacement."""
+        points = [random.random() * self.total for _ in range(k)]
+        # The last index guards against rounding errors in the sum
+        last = len(self.cumulative) - 1
+        if numpy:
+            indices = numpy.searchsorted(self.cumulative, points, side="right")
+            return numpy.minimum(indices, last).tolist()
+        return [min(bisect_right(self.cumulative, point), last) for point in points]
+
+
 def selRandom(individuals, k):
     """Select *k* individuals at random from the input *individuals* with
     replacement. The list returned contains references to the input
@@ -45,6 +90,11 @@ def selWorst(individuals, k):
     return sorted(individuals, key=attrgetter("fitness"))[:k]
 
 
+def _vectorize(individuals, draws):
+    # Building the fitness array of a plain list only pays off when it is
+    # used for many draws
+    return isinstance(individuals, Population) or draws >= len(individuals)
+
 def selTournament(individuals, k, tournsize):
     """Select *k* individuals from the input *individuals* using *k*
     tournaments of *tournsize* individuals. The list returned contains
@@ -55,9 +105,25 @@ def selTournament(individuals, k, tournsize):
     :param tournsize: The number of individuals participating in each tournament.
     :returns: A list of selected individuals.
     
-    This function uses the :func:`~random.choice` function from the python base
-    :mod:`random` module.
+    The aspirants are drawn with the :func:`~random.randrange` function
+    from the python base :mod:`random` module. With NumPy, when the
+    *individuals* are a :class:`~deap.tools.Population` or the number of
+    aspirants is at least their number, the winners of all the tournaments
+    are found at once by comparing the fitness ranks of the aspirants, see
+    :attr:`~deap.tools.Population.ranks`.
     """
+    if numpy and _vectorize(individuals, k * tournsize):
+        if not isinstance(individuals, Population):
+            individuals = Population(individuals)
+        ranks = individuals.ranks
+        n = len(individuals)
+        # The same draws as the loop below, tournament by tournament
+        aspirants = numpy.array([random.randrange(n) for _ in range(k * tournsize)],
+                                dtype=int).reshape(k, tournsize)
+        # argmax keeps the first of the best aspirants, as max does
+        winners = aspirants[numpy.arange(k), ranks[aspirants].argmax(axis=1)]
+        return [individuals[i] for i in winners]
+
     chosen = []
     for i in range(k):
         aspirants = selRandom(individuals, tournsize)
@@ -75,12 +141,23 @@ def selRoulette(individuals, k):
     :returns: A list of selected individuals.
     
     This function uses the :func:`~random.random` function from the python base
-    :mod:`random` module.
+    :mod:`random` module. With NumPy, when the *individuals* are a
+    :class:`~deap.tools.Population` or *k* is at least their number, the
+    spins are resolved by binary search in the cumulative fitness values,
+    see :class:`CumulativeSampler`.
     
     .. warning::
        The roulette selection by definition cannot be used for minimization 
        or when the fitness can be smaller or equal to 0.
     """
+    if numpy and _vectorize(individuals, k):
+        if not isinstance(individuals, Population):
+            individuals = Population(individuals)
+        # From the best to the worst, as sorted below
+        order = numpy.argsort(-individuals.ranks, kind="stable")
+        sampler = CumulativeSampler(individuals.values[order, 0])
+        return [individuals[order[i]] for i in sampler.sample(k)]
+
     s_inds = sorted(individuals, key=attrgetter("fitness"), reverse=True)
     sum_fits = sum(ind.fitness.values[0] for ind in individuals)
     
@@ -174,4 +251,4 @@ def selDoubleTournament(individuals, k, fitness_size, parsimony_size, fitness_fi
         return _fitTournament(individuals, k, tsize)
 
 __all__ = ['selRandom', 'selBest', 'selWorst', 'selRoulette',
-           'selTournament', 'selDoubleTournament']
\ No newline at end of file
+           'selTournament', 'selDoubleTournament', 'CumulativeSampler']
\ No newline at end of file
@@ -5,12 +5,29 @@ try:
 except ImportError:
     import pickle
 
-from bisect import bisect_right
-from collections import defaultdict
-from copy import deepcopy
+import hashlib
+import heapq
+import math
+import sys
+import time
+import zlib
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, OrderedDict
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 from functools import partial
 from itertools import chain
-from operator import eq
+from operator import eq, is_
+
+from .. import base
+
+try:
+    import numpy
+except ImportError:
+    numpy = False
 
 
 def identity(obj):
@@ -18,6 +35,94 @@ def identity(obj):
     """
     return obj
 
+def fitnessValues(individual):
+    """Returns the fitness values of *individual*. Used as the *key* of a
+    :class:`Statistics`, the values of a :class:`Population` are taken
+    directly from its array.
+    """
+    return individual.fitness.values
+
+
+class Population(list):
+    """List of individuals that gathers the weighted fitness values of its
+    individuals in a contiguous NumPy array of shape (N, M), N being the
+    number of individuals and M the number of objectives. The array is built
+    when first needed and reused as long as neither the list nor the fitness
+    of any of its individuals change, an invalid fitness giving a row of
+    NaN.
+
+    Given a :class:`Population`, :func:`selTournament`, :func:`selRoulette`,
+    :func:`sortNondominated`, :meth:`HallOfFame.update` and
+    :meth:`Statistics.compile` (with the :func:`fitnessValues` key) work on
+    this array instead of accessing the fitness of every individual. ::
+
+        >>> pop = Population(toolbox.population(n=300))
+        >>> pop.wvalues.shape
+        (300, 2)
+    """
+    def __init__(self, iterable=()):
+        list.__init__(self, iterable)
+        self._rows = None
+        self._wvalues = None
+        self._ranks = None
+
+    def _weights(self):
+        return self[0].fitness.weights if len(self) > 0 else ()
+
+    @property
+    def wvalues(self):
+        """Array of the weighted fitness values of the individuals."""
+        rows = [ind.fitness.wvalues for ind in self]
+        old = self._rows
+        # Fitness values are replaced, never modified in place, so the
+        # array is still valid if every row is the same tuple object
+        if old is None or len(old) != len(rows) or not all(map(is_, rows, old)):
+            nobj = len(self._weights())
+            if all(len(row) == nobj for row in rows):
+                wvalues = numpy.array(rows, dtype=float).reshape(len(rows), nobj)
+            else:
+                wvalues = numpy.full((len(rows), nobj), numpy.nan)
+                for i, row in enumerate(rows):
+                    if row:
+                        wvalues[i] = row
+            self._rows, self._wvalues, self._ranks = rows, wvalues, None
+        return self._wvalues
+
+    @property
+    def values(self):
+        """Array of the fitness values of the individuals."""
+        return self.wvalues / numpy.asarray(self._weights(), dtype=float)
+
+    @property
+    def ranks(self):
+        """Array of the rank of every individual when they are sorted by
+        increasing fitness, equal fitnesses sharing a same rank and invalid
+        fitnesses coming first.
+        """
+        wvalues = self.wvalues
+        if self._ranks is None:
+            # Invalid fitnesses compare lower than any other
+            wvalues = numpy.where(numpy.isnan(wvalues), -numpy.inf, wvalues)
+            order = numpy.lexsort(wvalues.T[::-1])
+            sorted_ = wvalues[order]
+            new = numpy.ones(len(order), dtype=bool)
+            new[1:] = (sorted_[1:] != sorted_[:-1]).any(axis=1)
+            self._ranks = numpy.empty(len(order), dtype=int)
+            self._ranks[order] = numpy.cumsum(new) - 1
+        return self._ranks
+
+    def better(self, wvalues):
+        """Return the indices of the individuals whose fitness is strictly
+        greater than the weighted fitness values *wvalues*, in the
+        lexicographic order used to compare fitnesses.
+        """
+        population = self.wvalues
+        greater = population > wvalues
+        differ = greater | (population < wvalues)
+        first = differ.argmax(axis=1)
+        rows = numpy.arange(len(population))
+        return numpy.flatnonzero(differ[rows, first] & greater[rows, first])
+
 class History(object):
     """The :class:`History` class helps to build a genealogy of all the
     individuals produced in the evolution. It contains two attributes,
@@ -65,13 +170,35 @@ class History(object):
     .. note::
        The genealogy tree might get very big if your population and/or the 
        number of generation is large.
-        
+
+    The individuals are not copied in the history, they are stored once for
+    each distinct content, as given by *key*, compressed with :mod:`pickle`
+    and :mod:`zlib`, and decoded when accessed through
+    :attr:`genealogy_history`. An individual obtained this way is the first
+    one having its content that was inserted, with its fitness at that time.
+    The storage can be spilled to a SQLite database in *filename*, and kept
+    bounded either with a *window*, to keep only the most recent individuals,
+    or by calling :meth:`prune` regularly with the current population, to
+    forget the lineages that left no descendants. ::
+
+        history = History(window=50 * POPSIZE, filename="genealogy.db")
+
+    :param window: The number of most recent individuals to keep in the
+                   history, by default they are all kept.
+    :param filename: The name of a SQLite database file where the individuals
+                     are stored, by default they are kept in memory.
+    :param key: A function returning the string or bytes identifying the
+                content of an individual, by default the exact content of
+                the individual and of its attributes, its fitness aside, or
+                :func:`canonical` for the GP trees.
     """
-    def __init__(self):
+    def __init__(self, window=None, filename=None, key=None):
         self.genealogy_index = 0
-        self.genealogy_history = dict()
+        self.genealogy_history = _GenealogyHistory(key or _contentKey, filename)
         self.genealogy_tree = dict()
-        
+        self.window = window
+        self.oldest = 1
+
     def update(self, individuals):
         """Update the history with the new *individuals*. The index present in
         their :attr:`history_index` attribute will be used to locate their
@@ -99,9 +226,36 @@ class History(object):
         for ind in individuals:
             self.genealogy_index += 1
             ind.history_index = self.genealogy_index
-            self.genealogy_history[self.genealogy_index] = deepcopy(ind)
+            self.genealogy_history.add(self.genealogy_index, ind)
             self.genealogy_tree[self.genealogy_index] = parent_indices
-    
+
+        if self.window is not None:
+            while self.oldest <= self.genealogy_index - self.window:
+                self._forget(self.oldest)
+                self.oldest += 1
+
+    def prune(self, individuals):
+        """Forget every individual of the history that is not an ancestor of
+        one of the *individuals*, or one of them.
+
+        :param individuals: The individuals whose genealogy is kept, usually
+                            the current population.
+        """
+        keep = set()
+        stack = [ind.history_index for ind in individuals]
+        while stack:
+            index = stack.pop()
+            if index in keep or index not in self.genealogy_tree:
+                continue
+            keep.add(index)
+            stack.extend(self.genealogy_tree[index])
+        for index in [i for i in self.genealogy_tree if i not in keep]:
+            self._forget(index)
+
+    def _forget(self, index):
+        self.genealogy_tree.pop(index, None)
+        self.genealogy_history.discard(index)
+
     @property
     def decorator(self):
         """Property that returns an appropriate decorator to enhance the
@@ -151,6 +305,31 @@ class History(object):
         genealogy(individual.history_index, 0)
         return gtree
 
+def _fusedStatistics(array, axis, kinds):
+    # The statistics *kinds* among "mean", "std", "min" and "max" of
+    # *array* along *axis*, as computed by the NumPy functions
+    results = dict()
+    if "mean" in kinds or "std" in kinds:
+        count = array.size if axis is None else array.shape[axis]
+        mean = numpy.add.reduce(array, axis=axis, dtype=numpy.result_type(array.dtype, float),
+                                keepdims=True) / count
+        if "mean" in kinds:
+            results["mean"] = numpy.squeeze(mean, axis)[()]
+        if "std" in kinds:
+            deviations = array - mean
+            variance = numpy.add.reduce(deviations * deviations, axis=axis) / count
+            results["std"] = numpy.sqrt(variance)
+    if "min" in kinds:
+        results["min"] = numpy.min(array, axis=axis)
+    if "max" in kinds:
+        results["max"] = numpy.max(array, axis=axis)
+    return results
+
+if numpy:
+    _FUSED = {numpy.mean: "mean", numpy.std: "std", numpy.min: "min",
+              numpy.max: "max", numpy.amin: "min", numpy.amax: "max"}
+
+
 class Statistics(object):
     """Object that compiles statistics on a list of arbitrary objects. 
     When created the statistics object receives a *key* argument that 
@@ -174,11 +353,19 @@ class Statistics(object):
         {'max': 4, 'mean': 2.5}
         >>> s.compile([5, 6, 7, 8])
         {'max': 8, 'mean': 6.5}
+
+    When NumPy is available, the values are also gathered in a single array
+    that is passed to every registered NumPy function, and the
+    :func:`numpy.mean`, :func:`numpy.std`, :func:`numpy.min` and
+    :func:`numpy.max` registered with at most an *axis* argument are
+    computed together, the standard deviation reusing the mean.
     """
     def __init__(self, key=identity):
         self.key = key
         self.functions = dict()
         self.fields = []
+        self.arrays = set()
+        self.fused = dict()
 
     def register(self, name, function, *args, **kargs):
         """Register a *function* that will be applied on the sequence each
@@ -194,6 +381,48 @@ class Statistics(object):
         """        
         self.functions[name] = partial(function, *args, **kargs)
         self.fields.append(name)
+        self.arrays.discard(name)
+        self.fused.pop(name, None)
+        if numpy and (getattr(function, "__module__", None) or "").startswith("numpy"):
+            self.arrays.add(name)
+            kind = _FUSED.get(function)
+            if kind is not None and not args and set(kargs) <= set(["axis"]):
+                self.fused[name] = (kind, kargs.get("axis"))
+
+    def _extract(self, data, array):
+        # The values given by the key, and their array if *array* is true
+        # and the values make one
+        if self.key is fitnessValues and isinstance(data, Population):
+            return data.values, data.values
+        values = tuple(self.key(elem) for elem in data)
+        if array:
+            try:
+                array = numpy.asarray(values)
+            except ValueError:
+                array = None
+            if array is not None and array.dtype != object:
+                return values, array
+        return values, None
+
+    def _compile(self, values, array):
+        fused = dict()
+        if array is not None and self.fused:
+            axes = defaultdict(set)
+            for kind, axis in self.fused.values():
+                axes[axis].add(kind)
+            for axis, kinds in axes.items():
+                for kind, result in _fusedStatistics(array, axis, kinds).items():
+                    fused[kind, axis] = result
+
+        entry = dict()
+        for key, func in self.functions.items():
+            if key in self.fused and array is not None:
+                entry[key] = fused[self.fused[key]]
+            elif key in self.arrays and array is not None:
+                entry[key] = func(array)
+            else:
+                entry[key] = func(values)
+        return entry
 
     def compile(self, data):
         """Apply to the input sequence *data* each registered function 
@@ -201,12 +430,7 @@ class Statistics(object):
         
         :param data: Sequence of objects on which the statistics are computed.
         """
-        values = tuple(self.key(elem) for elem in data)
-        
-        entry = dict()
-        for key, func in self.functions.items():
-            entry[key] = func(values)
-        return entry
+        return self._compile(*self._extract(data, bool(self.arrays)))
 
 class MultiStatistics(dict):
     """Dictionary of :class:`Statistics` object allowing to compute
@@ -228,13 +452,21 @@ class MultiStatistics(dict):
     """ 
     def compile(self, data):
         """Calls :meth:`Statistics.compile` with *data* of each
-        :class:`Statistics` object.
+        :class:`Statistics` object. The values of the objects sharing the
+        same key are extracted only once.
         
         :param data: Sequence of objects on which the statistics are computed.
         """
-        record = {}
+        groups = OrderedDict()
         for name, stats in list(self.items()):
-            record[name] = stats.compile(data)
+            groups.setdefault(stats.key, []).append((name, stats))
+
+        record = {}
+        for group in groups.values():
+            array = any(stats.arrays for _, stats in group)
+            values = group[0][1]._extract(data, array)
+            for name, stats in group:
+                record[name] = stats._compile(*values)
         return record
 
     @property
@@ -481,6 +713,452 @@ class Logbook(list):
         return "\n".join(text)
 
 
+def _plain(value):
+    # The Python equivalent of a NumPy value, for the exports
+    if isinstance(value, dict):
+        return dict((key, _plain(item)) for key, item in value.items())
+    return value.tolist() if hasattr(value, "tolist") else value
+
+def _flatten(infos, prefix=""):
+    flat = OrderedDict()
+    for key, value in infos.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, prefix + key + "."))
+        else:
+            flat[prefix + key] = _plain(value)
+    return flat
+
+
+class ArrayLogbook(object):
+    """Evolution records stored column-wise, each field in a NumPy array that
+    grows with the records. It is used like a :class:`Logbook`, with the
+    same :meth:`record` method, :attr:`chapters`, :attr:`header` and
+    :attr:`stream`, but :meth:`select` returns views of the arrays instead
+    of building lists. An entry of the logbook, as returned by indexing it,
+    is a dictionary rebuilt from the arrays.
+
+    The numeric fields are stored in arrays of their type, with one more
+    dimension for the values that are arrays themselves, like the
+    statistics computed along an axis. A field whose values have varying
+    types or shapes, or that is missing from some records, falls back to an
+    array of objects where the missing values are :data:`None`.
+
+    :param filename: The name of a file where each record is written as soon
+                     as it is made, optional.
+    :param format: The format of the file, ``"csv"`` or ``"jsonl"`` (one JSON
+                   object per line), by default ``"csv"`` when *filename*
+                   ends with ``.csv`` and ``"jsonl"`` otherwise. The columns
+                   of a CSV file are the fields of the first record, those
+                   of the chapters being named ``chapter.field``.
+    :param interval: The minimum number of seconds between two outputs of
+                     :meth:`show`, optional.
+
+    ::
+
+        >>> logbook = ArrayLogbook(filename="evolution.csv", interval=1.0)
+        >>> logbook.header = ['gen'] + stats.fields
+        >>> for gen in range(NGEN):
+        ...     # [...]
+        ...     logbook.record(gen=gen, **stats.compile(population))
+        ...     logbook.show()
+        >>> logbook.show(force=True)
+        >>> logbook.close()
+    """
+    def __init__(self, filename=None, format=None, interval=None):
+        self.columns = OrderedDict()
+        self.length = 0
+        self.capacity = 16
+        self.chapters = defaultdict(ArrayLogbook)
+        self.header = None
+        self.log_header = True
+        self.columns_len = None
+        self.buffindex = 0
+        self.interval = interval
+        self.shown = None
+        self.writer = None
+        self.file = None
+        if filename is not None:
+            if format is None:
+                format = "csv" if filename.endswith(".csv") else "jsonl"
+            self.format = format
+            self.file = open(filename, "w")
+
+    def _column(self, value):
+        # A new column for the field of *value*, typed only if it is numeric
+        # and appears in the first record
+        if self.length == 0 and value is not None:
+            array = numpy.asarray(value)
+            if array.dtype.kind in "biuf":
+                return numpy.empty((self.capacity,) + array.shape, dtype=array.dtype)
+        return numpy.empty(self.capacity, dtype=object)
+
+    def _objects(self, column):
+        objects = numpy.empty(self.capacity, dtype=object)
+        for i in range(self.length):
+            objects[i] = column[i] if column.ndim == 1 else column[i].copy()
+        return objects
+
+    def _set(self, name, value):
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = self._column(value)
+        elif column.dtype != object:
+            array = None if value is None else numpy.asarray(value)
+            if array is None or array.shape != column.shape[1:] or array.dtype.kind not in "biuf":
+                column = self.columns[name] = self._objects(column)
+            elif not numpy.can_cast(array.dtype, column.dtype):
+                column = column.astype(numpy.result_type(array.dtype, column.dtype))
+                self.columns[name] = column
+        column[self.length] = value
+
+    def record(self, **infos):
+        """Enter a record of event in the logbook as a list of key-value
+        pairs, appending the values to the arrays of their fields. When the
+        value part of a pair is a dictionnary, the informations contained in
+        the dictionnary are recorded in a chapter entitled as the name of the
+        key part of the pair. Chapters are also :class:`ArrayLogbook`.
+        """
+        if self.file is not None:
+            self._write(infos)
+        infos = dict(infos)
+        for key, value in list(infos.items()):
+            if isinstance(value, dict):
+                self.chapters[key].record(**value)
+                del infos[key]
+
+        if self.length == self.capacity:
+            self.capacity *= 2
+            for name, column in self.columns.items():
+                grown = numpy.empty((self.capacity,) + column.shape[1:], dtype=column.dtype)
+                grown[:self.length] = column[:self.length]
+                self.columns[name] = grown
+        for name in list(self.columns):
+            if name not in infos:
+                self._set(name, None)
+        for name, value in infos.items():
+            self._set(name, value)
+        self.length += 1
+
+    def _write(self, infos):
+        if self.format == "csv":
+            flat = _flatten(infos)
+            if self.writer is None:
+                import csv
+                self.writer = csv.DictWriter(self.file, fieldnames=list(flat),
+                                             extrasaction="ignore")
+                self.writer.writeheader()
+            self.writer.writerow(flat)
+        else:
+            import json
+            self.file.write(json.dumps(_plain(infos)) + "\n")
+        self.file.flush()
+
+    def close(self):
+        """Close the file where the records are written."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.writer = None
+
+    def select(self, *names):
+        """Return the array of values associated to each of the *names*
+        provided in argument, as views on the storage of the logbook, a
+        single array when a single name is given and a tuple of arrays
+        otherwise. The arrays of the names that were never recorded are
+        filled with :data:`None`.
+        """
+        arrays = []
+        for name in names:
+            column = self.columns.get(name)
+            if column is None:
+                column = numpy.empty(self.length, dtype=object)
+            arrays.append(column[:self.length])
+        if len(names) == 1:
+            return arrays[0]
+        return tuple(arrays)
+
+    @property
+    def stream(self):
+        """Retrieve the formatted not streamed yet entries of the database
+        including the headers, see :attr:`Logbook.stream`.
+        """
+        startindex, self.buffindex = self.buffindex, len(self)
+        return self.__str__(startindex)
+
+    def show(self, file=None, force=False):
+        """Print the :attr:`stream` to *file*, by default the standard
+        output, unless less than :attr:`interval` seconds passed since the
+        last time it was printed or there is nothing new to print. The
+        entries not printed are printed the next time, so that calling
+        :meth:`show` with *force* after the evolution prints them all.
+
+        :param file: The file where the stream is printed, optional.
+        :param force: Whether to print the stream regardless of the interval,
+                      optional.
+        """
+        now = time.time()
+        if self.buffindex == len(self):
+            return
+        if not force and self.interval and self.shown is not None and now - self.shown < self.interval:
+            return
+        self.shown = now
+        print(self.stream, file=file or sys.stdout)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("logbook index out of range")
+        entry = dict()
+        for name, column in self.columns.items():
+            value = column[index]
+            if column.dtype != object or value is not None:
+                entry[name] = value
+        return entry
+
+    def __iter__(self):
+        for i in range(self.length):
+            yield self[i]
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["file"] = state["writer"] = None
+        return state
+
+    __txt__ = Logbook.__txt__
+    __str__ = Logbook.__str__
+
+
+class _SQLiteBlobs(object):
+    # Minimal mapping of digests to blobs in a SQLite database
+    def __init__(self, filename):
+        import sqlite3
+        self.connection = sqlite3.connect(filename, isolation_level=None)
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS blobs "
+                                "(digest BLOB PRIMARY KEY, data BLOB)")
+
+    def __getitem__(self, digest):
+        row = self.connection.execute("SELECT data FROM blobs WHERE digest = ?",
+                                      (digest,)).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        return bytes(row[0])
+
+    def __setitem__(self, digest, data):
+        self.connection.execute("INSERT OR REPLACE INTO blobs VALUES (?, ?)",
+                                (digest, data))
+
+    def __delitem__(self, digest):
+        self.connection.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+
+
+class _GenealogyHistory(Mapping):
+    # Individuals of a History by index, each distinct content being stored
+    # once, under the digest of its key, with a count of the indices using it
+    def __init__(self, key, filename=None):
+        self.key = key
+        self.digests = dict()
+        self.counts = dict()
+        self.blobs = dict() if filename is None else _SQLiteBlobs(filename)
+
+    def add(self, index, individual):
+        key = self.key(individual)
+        if not isinstance(key, bytes):
+            key = key.encode("utf-8")
+        digest = hashlib.sha1(key).digest()
+        self.digests[index] = digest
+        count = self.counts.get(digest, 0)
+        if count == 0:
+            self.blobs[digest] = zlib.compress(pickle.dumps(individual, pickle.HIGHEST_PROTOCOL))
+        self.counts[digest] = count + 1
+
+    def discard(self, index):
+        digest = self.digests.pop(index, None)
+        if digest is None:
+            return
+        self.counts[digest] -= 1
+        if self.counts[digest] == 0:
+            del self.counts[digest]
+            del self.blobs[digest]
+
+    def __getitem__(self, index):
+        individual = pickle.loads(zlib.decompress(self.blobs[self.digests[index]]))
+        individual.history_index = index
+        return individual
+
+    def __contains__(self, index):
+        return index in self.digests
+
+    def __iter__(self):
+        return iter(self.digests)
+
+    def __len__(self):
+        return len(self.digests)
+
+
+def canonical(individual):
+    """Return a string identifying *individual* by its content. The branches
+    of an individual made of several trees (ADFs) are joined line by line,
+    any other individual is converted by :func:`str`, which for a
+    :class:`~deap.gp.PrimitiveTree` includes the values of its ephemeral
+    constants. An individual having a :meth:`canonical_string` method is
+    identified by the string it returns.
+    """
+    if hasattr(individual, "canonical_string"):
+        return individual.canonical_string()
+    if hasattr(individual, "__len__") and len(individual) > 0 and \
+            hasattr(individual[0], "searchSubtree"):
+        return "\n".join(str(branch) for branch in individual)
+    return str(individual)
+
+
+def _isTree(individual):
+    if hasattr(individual, "canonical_string") or hasattr(individual, "searchSubtree"):
+        return True
+    return isinstance(individual, list) and len(individual) > 0 and \
+        hasattr(individual[0], "searchSubtree")
+
+def _contentKey(individual):
+    # Bytes identifying exactly the content of *individual* and of its
+    # attributes other than its fitness and history index, the GP trees
+    # being identified by their canonical string
+    if _isTree(individual):
+        return canonical(individual).encode("utf-8")
+    if numpy and isinstance(individual, numpy.ndarray):
+        content = (individual.dtype.str, individual.shape, individual.tobytes())
+    elif isinstance(individual, (list, tuple)):
+        content = list(individual)
+    else:
+        content = None
+    attributes = sorted((name, value) for name, value in getattr(individual, "__dict__", {}).items()
+                        if name not in ("fitness", "history_index"))
+    class_ = type(individual)
+    return pickle.dumps((class_.__module__, class_.__name__, content, attributes),
+                        pickle.HIGHEST_PROTOCOL)
+
+
+def _equalityKey(individual):
+    # A key equal for two individuals when they are equal, the lists and
+    # tuples of hashable items being keyed on their items, whose hash agrees
+    # with the equality (1 and 1.0, 0.0 and -0.0), and any other individual
+    # on its exact content
+    if not _isTree(individual) and type(individual).__eq__ in (list.__eq__, tuple.__eq__):
+        items = tuple(individual)
+        try:
+            hash(items)
+        except TypeError:
+            pass
+        else:
+            return items
+    return _contentKey(individual)
+
+
+class EvaluationCache(object):
+    """Memoization of an evaluation function, that returns the fitness
+    values already computed for an individual with the same content instead
+    of evaluating it again. The values are looked up by the string returned
+    by *key*, at most *maxsize* of them are kept, the least recently used
+    being dropped first.
+
+    :param evaluate: The evaluation function, taking an individual and
+                     returning its fitness values.
+    :param maxsize: The maximum number of values kept.
+    :param key: A function returning the string identifying an individual,
+                by default :func:`canonical`.
+
+    The cache can replace the evaluation function in the toolbox, ::
+
+        >>> cache = EvaluationCache(evalSymbReg, maxsize=5000)
+        >>> toolbox.register("evaluate", cache)
+
+    or evaluate a whole population at once with :meth:`map`, that also
+    evaluates only once the duplicates of a same batch. The :attr:`hit_rate`
+    may be recorded in the :class:`Logbook` along with the statistics.
+    """
+    def __init__(self, evaluate, maxsize=10000, key=canonical):
+        self.evaluate = evaluate
+        self.maxsize = maxsize
+        self.key = key
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get(self, key):
+        values = self.entries[key]
+        self.entries.move_to_end(key)
+        return values
+
+    def _set(self, key, values):
+        self.entries[key] = values
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def __call__(self, individual):
+        key = self.key(individual)
+        try:
+            values = self._get(key)
+        except KeyError:
+            self.misses += 1
+            values = self.evaluate(individual)
+            self._set(key, values)
+        else:
+            self.hits += 1
+        return values
+
+    def map(self, individuals, map_=map):
+        """Return the fitness values of all the *individuals*, evaluating
+        through *map_* (e.g. the toolbox's map) only one individual for each
+        content not already in the cache.
+
+        :param individuals: A list of individuals.
+        :param map_: The map function used for the evaluations.
+        :returns: A list of the fitness values, in the order of *individuals*.
+        """
+        keys = [self.key(ind) for ind in individuals]
+        found = dict()
+        missing = OrderedDict()
+        for key, ind in zip(keys, individuals):
+            if key in found or key in missing:
+                continue
+            try:
+                found[key] = self._get(key)
+            except KeyError:
+                missing[key] = ind
+
+        for key, values in zip(missing, map_(self.evaluate, list(missing.values()))):
+            found[key] = values
+            self._set(key, values)
+
+        self.misses += len(missing)
+        self.hits += len(individuals) - len(missing)
+        return [found[key] for key in keys]
+
+    @property
+    def hit_rate(self):
+        """Ratio of the lookups that were answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / float(total) if total else 0.0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        """Empty the cache and reset its counters."""
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
 class HallOfFame(object):
     """The hall of fame contains the best individual that ever lived in the
     population during the evolution. It is lexicographically sorted at all
@@ -491,23 +1169,66 @@ class HallOfFame(object):
     The insertion is made so that old individuals have priority on new
     individuals. A single copy of each individual is kept at all time, the
     equivalence between two individuals is made by the operator passed to the
-    *similar* argument.
+    *similar* argument. With the default :func:`operator.eq`, the individuals
+    are instead compared through a set of the keys returned by *key*, which
+    avoids comparing each candidate to every individual of the hall of fame.
+    The default key is the tuple of the items of a list or tuple, so that
+    the duplicates are those found by :func:`operator.eq`, the
+    :func:`canonical` string of the GP trees, and the exact content of any
+    other individual, such as a :class:`numpy.ndarray`. The individuals
+    whose class does not define the equality, and are thus compared by
+    identity, are still compared with *similar*.
 
     :param maxsize: The maximum number of individual to keep in the hall of
                     fame.
     :param similar: An equivalence operator between two individuals, optional.
                     It defaults to operator :func:`operator.eq`.
+    :param key: A function returning a hashable key identifying the
+                content of an individual, used when *similar* is
+                :func:`operator.eq`, optional.
+
+    The individuals are kept in a heap whose root is the worst of them, so
+    that a candidate is rejected in constant time when it is not better than
+    the worst, and is copied with :func:`~deap.base.clone` only when it
+    enters the hall of fame.
     
     The class :class:`HallOfFame` provides an interface similar to a list
     (without being one completely). It is possible to retrieve its length, to
     iterate on it forward and backward and to get an item or a slice from it.
     """
-    def __init__(self, maxsize, similar=eq):
+    def __init__(self, maxsize, similar=eq, key=None):
         self.maxsize = maxsize
-        self.keys = list()
-        self.items = list()
         self.similar = similar
-    
+        self.key = (key or _equalityKey) if similar is eq else None
+        self.heap = list()
+        self.counts = dict()
+        self.inserted = 0
+        self._items = None
+
+    @property
+    def items(self):
+        """The individuals of the hall of fame, from the best to the worst."""
+        if self._items is None:
+            self._items = [entry[-1] for entry in sorted(self.heap, reverse=True)]
+        return self._items
+
+    @property
+    def keys(self):
+        """The fitnesses of the hall of fame, from the worst to the best."""
+        return [ind.fitness for ind in reversed(self.items)]
+
+    def _key(self, ind):
+        # The key of *ind*, or None when it is compared with similar
+        if self.key is None or type(ind).__eq__ is object.__eq__:
+            return None
+        return self.key(ind)
+
+    def _contains(self, ind):
+        key = self._key(ind)
+        if key is None:
+            return any(self.similar(ind, entry[-1]) for entry in self.heap)
+        return key in self.counts
+
     def update(self, population):
         """Update the hall of fame with the *population* by replacing the
         worst individuals in it by the best individuals present in
@@ -517,57 +1238,72 @@ class HallOfFame(object):
         :param population: A list of individual with a fitness attribute to
                            update the hall of fame with.
         """
-        if len(self) == 0 and self.maxsize !=0:
-            # Working on an empty hall of fame is problematic for the
-            # "for else"
-            self.insert(population[0])
-        
+        if self.maxsize == 0:
+            return
+
+        if isinstance(population, Population) and self.maxsize <= len(self):
+            # Only the individuals better than the worst can enter
+            better = population.better(self.heap[0][0])
+            population = [population[i] for i in better]
+
         for ind in population:
-            if ind.fitness > self[-1].fitness or len(self) < self.maxsize:
-                for hofer in self:
-                    # Loop through the hall of fame to check for any
-                    # similar individual
-                    if self.similar(ind, hofer):
-                        break
-                else:
-                    # The individual is unique and strictly better than
-                    # the worst
-                    if len(self) >= self.maxsize:
-                        self.remove(-1)
-                    self.insert(ind)
-    
+            full = len(self.heap) >= self.maxsize
+            if full and not ind.fitness.wvalues > self.heap[0][0]:
+                continue
+            if self._contains(ind):
+                continue
+            if full:
+                self._discard(heapq.heappop(self.heap))
+            self.insert(ind)
+
     def insert(self, item):
-        """Insert a new individual in the hall of fame using the
-        :func:`~bisect.bisect_right` function. The inserted individual is
-        inserted on the right side of an equal individual. Inserting a new 
-        individual in the hall of fame also preserve the hall of fame's order.
-        This method **does not** check for the size of the hall of fame, in a
-        way that inserting a new individual in a full hall of fame will not
-        remove the worst individual to maintain a constant size.
+        """Insert a copy of a new individual in the hall of fame, on the
+        right side of the individuals with an equal fitness, preserving the
+        hall of fame's order. This method **does not** check for the size of
+        the hall of fame, in a way that inserting a new individual in a full
+        hall of fame will not remove the worst individual to maintain a
+        constant size.
         
         :param item: The individual with a fitness attribute to insert in the
                      hall of fame.
         """
-        item = deepcopy(item)
-        i = bisect_right(self.keys, item.fitness)
-        self.items.insert(len(self) - i, item)
-        self.keys.insert(i, item.fitness)
-    
+        item = base.clone(item)
+        self.inserted += 1
+        heapq.heappush(self.heap, (item.fitness.wvalues, self.inserted, item))
+        key = self._key(item)
+        if key is not None:
+            self.counts[key] = self.counts.get(key, 0) + 1
+        self._items = None
+
+    def _discard(self, entry):
+        key = self._key(entry[-1])
+        if key is not None:
+            self.counts[key] -= 1
+            if self.counts[key] == 0:
+                del self.counts[key]
+        self._items = None
+
     def remove(self, index):
         """Remove the specified *index* from the hall of fame.
         
         :param index: An integer giving which item to remove.
         """
-        del self.keys[len(self) - (index % len(self) + 1)]
-        del self.items[index]
+        item = self.items[index]
+        for i, entry in enumerate(self.heap):
+            if entry[-1] is item:
+                break
+        entry = self.heap.pop(i)
+        heapq.heapify(self.heap)
+        self._discard(entry)
     
     def clear(self):
         """Clear the hall of fame."""
-        del self.items[:]
-        del self.keys[:]
+        del self.heap[:]
+        self.counts.clear()
+        self._items = None
 
     def __len__(self):
-        return len(self.items)
+        return len(self.heap)
 
     def __getitem__(self, i):
         return self.items[i]
@@ -582,6 +1318,33 @@ class HallOfFame(object):
         return str(self.items)
 
 
+def _dominatedBy(points, others, blocksize=2**18):
+    # Mask of the rows of *points* dominated by at least one row of
+    # *others*, the comparisons being made on blocks of *points*
+    dominated = numpy.zeros(len(points), dtype=bool)
+    if len(points) == 0 or len(others) == 0:
+        return dominated
+    step = max(1, blocksize // (len(others) * points.shape[1]))
+    for start in range(0, len(points), step):
+        block = points[start:start+step, None, :]
+        dominated[start:start+step] = ((others >= block).all(axis=2) &
+                                       (others > block).any(axis=2)).any(axis=1)
+    return dominated
+
+def _crowdingDistances(points):
+    # The crowding distances of :func:`~deap.tools.assignCrowdingDist`
+    nobj = points.shape[1]
+    distances = numpy.zeros(len(points))
+    for j in range(nobj):
+        order = numpy.argsort(points[:, j], kind="stable")
+        column = points[order, j]
+        distances[order[[0, -1]]] = numpy.inf
+        if column[-1] == column[0]:
+            continue
+        distances[order[1:-1]] += (column[2:] - column[:-2]) / (nobj * (column[-1] - column[0]))
+    return distances
+
+
 class ParetoFront(HallOfFame):
     """The Pareto front hall of fame contains all the non-dominated individuals
     that ever lived in the population. That means that the Pareto front hall of
@@ -589,20 +1352,69 @@ class ParetoFront(HallOfFame):
     
     :param similar: A function that tels the Pareto front whether or not two
                     individuals are similar, optional.
+    :param maxsize: The maximum number of individuals kept in the front,
+                    optional. When it is exceeded, the individuals with the
+                    smallest crowding distance are removed one at a time.
+    :param epsilon: The size of the boxes dividing the space of the fitness
+                    values, a number or a sequence with one number per
+                    objective, optional. When given, a single individual is
+                    kept in each box, the one nearest to the best corner of
+                    the box, and only in the boxes that are not dominated by
+                    another occupied box.
     
     The size of the front may become very large if it is used for example on
     a continuous function with a continuous domain. In order to limit the number
     of individuals, it is possible to specify a similarity function that will
     return :data:`True` if the genotype of two individuals are similar. In that
     case only one of the two individuals will be added to the hall of fame. By
-    default the similarity function is :func:`operator.eq`.
+    default the similarity function is :func:`operator.eq`. The *maxsize* and
+    *epsilon* arguments bound the size of the front whatever the genotypes.
     
     Since, the Pareto front hall of fame inherits from the :class:`HallOfFame`, 
-    it is sorted lexicographically at every moment.
+    it is sorted lexicographically at every moment. With two objectives, the
+    second objective of a front sorted this way is decreasing, so that the
+    front finds in logarithmic time the individuals dominating or dominated
+    by a candidate. With more objectives, a whole population is compared to
+    the front at once with NumPy, when it is available.
     """
-    def __init__(self, similar=eq):
-        HallOfFame.__init__(self, None, similar)
-    
+    def __init__(self, similar=eq, maxsize=None, epsilon=None):
+        self.similar = similar
+        self.maxsize = maxsize
+        self.epsilon = epsilon
+        self.entries = list()
+        self.wvalues = list()
+        self._items = None
+        self._array = None
+
+    @property
+    def items(self):
+        """The individuals of the front, in decreasing lexicographic order."""
+        if self._items is None:
+            self._items = self.entries[::-1]
+        return self._items
+
+    @property
+    def keys(self):
+        """The fitnesses of the front, in increasing lexicographic order."""
+        return [ind.fitness for ind in self.entries]
+
+    @property
+    def array(self):
+        """The weighted fitness values of the front, as a NumPy array in
+        increasing lexicographic order.
+        """
+        if self._array is None:
+            nobj = len(self.wvalues[0]) if self.wvalues else 0
+            self._array = numpy.array(self.wvalues, dtype=float).reshape(len(self.wvalues), nobj)
+        return self._array
+
+    def _changed(self):
+        self._items = None
+        self._array = None
+
+    def _hasTwin(self, ind, begin, end):
+        return any(self.similar(ind, self.entries[i]) for i in range(begin, end))
+
     def update(self, population):
         """Update the Pareto front hall of fame with the *population* by adding 
         the individuals from the population that are not dominated by the hall
@@ -612,26 +1424,170 @@ class ParetoFront(HallOfFame):
         :param population: A list of individual with a fitness attribute to
                            update the hall of fame with.
         """
-        for ind in population:
-            is_dominated = False
-            has_twin = False
-            to_remove = []
-            for i, hofer in enumerate(self):    # hofer = hall of famer
-                if hofer.fitness.dominates(ind.fitness):
-                    is_dominated = True
-                    break
-                elif ind.fitness.dominates(hofer.fitness):
-                    to_remove.append(i)
-                elif ind.fitness == hofer.fitness and self.similar(ind, hofer):
-                    has_twin = True
-                    break
-            
-            for i in reversed(to_remove):       # Remove the dominated hofer
-                self.remove(i)
-            if not is_dominated and not has_twin:
+        if len(population) > 0:
+            nobj = len(population[0].fitness.wvalues)
+            if nobj == 2:
+                for ind in population:
+                    self._update2D(ind)
+            elif numpy:
+                self._updateBatch(population)
+            else:
+                for ind in population:
+                    self._updateLoop(ind)
+
+        if self.epsilon is not None:
+            self._pruneBoxes()
+        if self.maxsize is not None:
+            self._pruneCrowded()
+
+    def _update2D(self, ind):
+        wvalues = ind.fitness.wvalues
+        begin = bisect_left(self.wvalues, wvalues)
+        end = bisect_right(self.wvalues, wvalues, begin)
+        # The entry following the twins has the largest second objective of
+        # all the lexicographically greater entries
+        if end < len(self.wvalues) and self.wvalues[end][1] >= wvalues[1]:
+            return
+        if self._hasTwin(ind, begin, end):
+            return
+        # The entries dominated by the individual precede its twins
+        first = begin
+        while first > 0 and self.wvalues[first-1][1] <= wvalues[1]:
+            first -= 1
+        del self.entries[first:begin]
+        del self.wvalues[first:begin]
+        self.insert(ind)
+
+    def _updateBatch(self, population):
+        candidates = numpy.array([ind.fitness.wvalues for ind in population], dtype=float)
+        survivors = numpy.flatnonzero(~_dominatedBy(candidates, self.array))
+        if len(survivors) == 0:
+            return
+
+        # In decreasing lexicographic order, a candidate can only be
+        # dominated by the non-dominated candidates preceding it
+        order = numpy.lexsort(candidates[survivors].T[::-1])[::-1]
+        front = numpy.empty((len(survivors), candidates.shape[1]))
+        count = 0
+        kept = []
+        for i in survivors[order]:
+            row, previous = candidates[i], front[:count]
+            if count and ((previous >= row).all(axis=1) & (previous > row).any(axis=1)).any():
+                continue
+            front[count] = row
+            count += 1
+            kept.append(i)
+        survivors = sorted(kept)
+        dominated = _dominatedBy(self.array, front[:count])
+        if dominated.any():
+            kept = numpy.flatnonzero(~dominated)
+            self.entries = [self.entries[i] for i in kept]
+            self.wvalues = [self.wvalues[i] for i in kept]
+            self._changed()
+        for i in survivors:
+            ind = population[i]
+            wvalues = ind.fitness.wvalues
+            begin = bisect_left(self.wvalues, wvalues)
+            end = bisect_right(self.wvalues, wvalues, begin)
+            if not self._hasTwin(ind, begin, end):
                 self.insert(ind)
 
-__all__ = ['HallOfFame', 'ParetoFront', 'History', 'Statistics', 'MultiStatistics', 'Logbook']
+    def _updateLoop(self, ind):
+        is_dominated = False
+        has_twin = False
+        to_remove = []
+        for i, hofer in enumerate(self):    # hofer = hall of famer
+            if hofer.fitness.dominates(ind.fitness):
+                is_dominated = True
+                break
+            elif ind.fitness.dominates(hofer.fitness):
+                to_remove.append(i)
+            elif ind.fitness == hofer.fitness and self.similar(ind, hofer):
+                has_twin = True
+                break
+
+        for i in reversed(to_remove):       # Remove the dominated hofer
+            self.remove(i)
+        if not is_dominated and not has_twin:
+            self.insert(ind)
+
+    def _pruneBoxes(self):
+        nobj = len(self.wvalues[0]) if self.wvalues else 0
+        try:
+            epsilon = [float(e) for e in self.epsilon]
+        except TypeError:
+            epsilon = [float(self.epsilon)] * nobj
+        scales = [e * abs(w) for e, w in zip(epsilon, self.entries[0].fitness.weights)] if nobj else []
+
+        # The individual nearest to the best corner of each box
+        boxes = dict()
+        for i, wvalues in enumerate(self.wvalues):
+            box = tuple(int(math.floor(w / s)) for w, s in zip(wvalues, scales))
+            distance = sum(((b + 1) * s - w)**2 for b, s, w in zip(box, scales, wvalues))
+            if box not in boxes or distance < boxes[box][0]:
+                boxes[box] = (distance, i)
+
+        # Boxes in decreasing lexicographic order can only be dominated by
+        # the ones preceding them
+        kept = []
+        for box in sorted(boxes, reverse=True):
+            if not any(all(o >= b for o, b in zip(other, box)) for other in kept):
+                kept.append(box)
+        if len(kept) < len(self.entries):
+            indices = sorted(boxes[box][1] for box in kept)
+            self.entries = [self.entries[i] for i in indices]
+            self.wvalues = [self.wvalues[i] for i in indices]
+            self._changed()
+
+    def _pruneCrowded(self):
+        while len(self.entries) > self.maxsize:
+            if numpy:
+                distances = _crowdingDistances(self.array)
+                worst = int(numpy.argmin(distances))
+            else:
+                from .emo import assignCrowdingDist
+                assignCrowdingDist(self.entries)
+                worst = min(range(len(self.entries)),
+                            key=lambda i: self.entries[i].fitness.crowding_dist)
+            del self.entries[worst]
+            del self.wvalues[worst]
+            self._changed()
+
+    def insert(self, item):
+        """Insert a copy of a new individual in the front, on the right side
+        of the individuals with an equal fitness. This method **does not**
+        check the dominance of the individual.
+
+        :param item: The individual with a fitness attribute to insert in the
+                     front.
+        """
+        item = base.clone(item)
+        i = bisect_right(self.wvalues, item.fitness.wvalues)
+        self.entries.insert(i, item)
+        self.wvalues.insert(i, item.fitness.wvalues)
+        self._changed()
+
+    def remove(self, index):
+        """Remove the specified *index* from the front.
+
+        :param index: An integer giving which item to remove.
+        """
+        i = len(self) - (index % len(self) + 1)
+        del self.entries[i]
+        del self.wvalues[i]
+        self._changed()
+
+    def clear(self):
+        """Clear the front."""
+        del self.entries[:]
+        del self.wvalues[:]
+        self._changed()
+
+    def __len__(self):
+        return len(self.entries)
+
+__all__ = ['HallOfFame', 'ParetoFront', 'History', 'Statistics', 'MultiStatistics', 'Logbook',
+           'ArrayLogbook', 'EvaluationCache', 'canonical', 'Population', 'fitnessValues']
 
 if __name__ == "__main__":
     import doctest
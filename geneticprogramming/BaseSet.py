@@ -13,11 +13,11 @@ class Baseset(object):
         # collection of terminals
         self.terminals = []
 
-    def add_primitive(self, primitive, in_types, ret_type, name=None):
+    def add_primitive(self, primitive, in_types, ret_type, name=None, vectorized=None):
         """
         Same as for DEAPs PrimitiveSetTyped
         """
-        self.primitives.append((primitive, in_types, ret_type, name))
+        self.primitives.append((primitive, in_types, ret_type, name, vectorized))
 
     def add_terminal(self, terminal, ret_type, name=None):
         """
@@ -6,8 +6,11 @@ import networkx as nx
 
 from deap.gp import PrimitiveSetTyped
 from deap.gp import PrimitiveTree
+from deap.gp import cloneTree
 from deap.gp import Primitive
 from deap.gp import Terminal
+from deap.gp import evaluateVectorizedADF
+from deap.gp import interpret
 from deap.base import Fitness
 
 from geneticprogramming import BirthError
@@ -46,6 +49,8 @@ class Individual(object):
     GROWTH_MAX_SIGNATURES = 100
     # All ephemerals must start with this
     EPHEMERAL_PREFIX = 'E'
+    # Run the trees on deap's stack interpreter rather than compiling them with eval
+    INTERPRET = False
 
     def __init__(self, baseset):
         """
@@ -117,7 +122,7 @@ class Individual(object):
             name, value = self.baseset.get_ephemeral_instance(idx)
             pset.addTerminal(value, type(value), name)
         for prim in self.baseset.primitives:
-            pset.addPrimitive(prim[0], prim[1], prim[2], prim[3])
+            pset.addPrimitive(prim[0], prim[1], prim[2], prim[3], prim[4])
         for adfset in self.psets:
             pset.addADF(adfset)
         return pset
@@ -153,19 +158,23 @@ class Individual(object):
     @staticmethod
     def grow_twig(pset, max_, type_):
         """Generate an expression tree.
+        Only primitives that can be completed within the remaining height are
+        picked, so a twig that can be started is always grown to the end.
 
         :param pset: Primitive set from which primitives are selected.
         :param max_: Maximum height of the twig.
         :param type_: The type that the tree must return when called.
         :returns: An expression tree
         """
-        # if maximum depth or no primitives or chance
-        if max_ <= 1 or random.random() < Individual.GROWTH_TERM_PB or not len(pset.primitives[type_]):
+        primitives = pset.viablePrimitives(type_, max_)
+
+        # if maximum depth or no viable primitives or chance
+        if not primitives or (pset.terminals[type_] and random.random() < Individual.GROWTH_TERM_PB):
             # return a random terminal
             return [Individual.get_random_terminal(pset, type_)]
 
         # return a primitive and tree
-        prim = Individual.get_random_primitive(pset, type_)
+        prim = random.choice(primitives)
         expr = [prim]
         for arg in prim.args:
             expr += Individual.grow_twig(pset, max_ - 1, arg)
@@ -185,6 +194,8 @@ class Individual(object):
         else:
             flexible_signature = False
             pset = self.get_primitive_set(name, intypes, outtype, prefix)
+            if not pset.isViable(pset.ret, Individual.GROWTH_MAX_INIT_DEPTH):
+                raise GrowError("No tree of type '%s' can be grown from the primitive set." % pset.ret)
 
         # grow a new tree
         for _ in range(Individual.GROWTH_MAX_ATTEMPTS):
@@ -192,6 +203,9 @@ class Individual(object):
                 outtype = self.get_random_outtype()
                 intypes = self.get_random_intypes()
                 pset = self.get_primitive_set(name, intypes, outtype, prefix)
+                if not pset.isViable(pset.ret, Individual.GROWTH_MAX_INIT_DEPTH):
+                    # this signature can never be satisfied
+                    continue
             try:
                 tree = self.grow_twig(pset, Individual.GROWTH_MAX_INIT_DEPTH, type_=pset.ret)
                 if Individual.all_args_used(pset, tree):
@@ -227,7 +241,7 @@ class Individual(object):
                 newtree[slice_] = self.grow_twig(subpset, Individual.GROWTH_MAX_MUT_DEPTH, type_=type_)
                 if Individual.all_args_used(subpset, newtree):
                     # found a valid tree
-                    self.trees[idx] = copy.deepcopy(newtree)
+                    self.trees[idx] = newtree
                     del self.fitness.values
                     break
             except GrowError:
@@ -237,8 +251,16 @@ class Individual(object):
             raise BirthError("Mutation Failed")
 
     def clone(self):
-        """returns a copy of oneself"""
-        return copy.deepcopy(self)
+        """
+        returns a copy of oneself
+        Only the trees and the fitness are copied, the nodes, the psets and their contexts are shared.
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new.trees = [cloneTree(tree) for tree in self.trees]
+        new.psets = list(self.psets)
+        new.fitness = copy.deepcopy(self.fitness)
+        return new
 
     @staticmethod
     def is_compatible(node, pset):
@@ -324,19 +346,47 @@ class Individual(object):
         func = None
         for subexpr, pset in self:
             pset.context.update(adfdict)
-            code = str(subexpr)
-            if len(pset.arguments) > 0:
-                adfargs = ",".join(arg for arg in pset.arguments)
-                code = "lambda {args}: {code}".format(args=adfargs, code=code)
             context = pset.context
             context.update(self.baseset.ephemeral_instances)
-            func = eval(code, pset.context, {})
+            if self.INTERPRET:
+                func = interpret(subexpr, pset)
+            else:
+                code = str(subexpr)
+                if len(pset.arguments) > 0:
+                    adfargs = ",".join(arg for arg in pset.arguments)
+                    code = "lambda {args}: {code}".format(args=adfargs, code=code)
+                func = eval(code, pset.context, {})
             adfdict.update({pset.name: func})
         return func
 
+    def evaluate_cases(self, *columns):
+        """Run the program over every fitness case at once
+        :param columns: a numpy array of cases for each input of the RPB
+        :return: a numpy array of the program's output for each case
+        """
+        for pset in self.psets:
+            pset.context.update(self.baseset.ephemeral_instances)
+        return evaluateVectorizedADF(self.trees, self.psets, *columns)
+
     def evaluate(self, *args):
         raise NotImplementedError()
 
+    def canonical_string(self):
+        """
+        Describe the program by its content, for caching its evaluation:
+        the signature and tree of every branch, with the ephemerals replaced by their values
+        """
+        lines = []
+        for tree, pset in self:
+            nodes = []
+            for node in tree:
+                if node.name in self.baseset.ephemeral_instances:
+                    node = Terminal(repr(self.baseset.ephemeral_instances[node.name]), True, node.ret)
+                nodes.append(node)
+            signature = ",".join(intype.__name__ for intype in pset.ins) + "->" + pset.ret.__name__
+            lines.append("%s(%s):%s" % (pset.name, signature, PrimitiveTree(nodes)))
+        return "\n".join(lines)
+
     @property
     def ephemerals_used(self):
         """A dictionary of the ephemerals actually in use"""
@@ -1,23 +1,35 @@
 import random
 import numpy as np
+from operator import methodcaller
 
 from geneticprogramming import Individual
 from geneticprogramming import BirthError
 
 from deap.tools import Statistics
 from deap.tools import HallOfFame
-from deap.tools import Logbook
+from deap.tools import ArrayLogbook
+from deap.tools import CumulativeSampler
 
 
 class Population(list):
     """
     A collection of individuals
+
+    The logbook is printed by evolve at most once every LOG_INTERVAL seconds; call
+    flush_log once done evolving to print the generations not yet shown.
     """
     INDIVIDUAL_CLASS = Individual
     POPULATION_SIZE = 100
     CLONE_BEST = 5
     MAX_MATE_ATTEMPTS = 10
     MATE_MUTATE_CLONE = (80, 18, 2)
+    # map used to evaluate the individuals, eg. a deap.base.ProcessPoolMap
+    MAP = map
+    # optional deap.tools.EvaluationCache of the evaluations, eg.
+    # EvaluationCache(methodcaller('evaluate'), key=methodcaller('canonical_string'))
+    CACHE = None
+    # minimum number of seconds between two outputs of the logbook, see flush_log
+    LOG_INTERVAL = 1.0
 
     def __init__(self, bset):
         self.bset = bset
@@ -30,21 +42,38 @@ class Population(list):
         self.stats.register("min", np.min)
         self.stats.register("max", np.max)
 
-        self.logbook = Logbook()
+        self.logbook = ArrayLogbook(interval=Population.LOG_INTERVAL)
         self.logbook.header = ['gen'] + self.stats.fields
+        if Population.CACHE is not None:
+            self.logbook.header.append('hit_rate')
 
         self.hof = HallOfFame(1)
         self.generation = 0
+        # the selection distribution of the current generation, see select
+        self.sampler = None
 
         # do an initial evaluation
-        for ind in self:
-            ind.fitness.values = ind.evaluate()
+        self.evaluate(self)
+
+    def evaluate(self, individuals):
+        """Evaluate the *individuals* all at once through MAP and assign their fitness
+
+        :param individuals: a list of individuals
+        """
+        if Population.CACHE is None:
+            fitnesses = Population.MAP(methodcaller('evaluate'), individuals)
+        else:
+            fitnesses = Population.CACHE.map(individuals, Population.MAP)
+        for ind, fit in zip(individuals, fitnesses):
+            ind.fitness.values = fit
+        self.sampler = None
 
-    def select(self, k):
+    def select(self, k, as_list=False):
         """Probablistic select *k* individuals among the input *individuals*. The
         list returned contains references to the input *individuals*.
 
         :param k: The number of individuals to select.
+        :param as_list: Return a list even when k is 1, rather than the individual itself.
         :returns: A list containing k individuals.
 
         The individuals returned are randomly selected from individuals according
@@ -52,39 +81,35 @@ class Population(list):
         that individual will be chosen.  Less fit individuals are less likely, but
         still possibly, selected.
         """
-        # adjusted pop is a list of tuples (adjusted fitness, individual)
-        adjusted_pop = [(1.0 / (1.0 + i.fitness.values[0]), i) for i in self]
-
-        # normalised_pop is a list of tuples (float, individual) where the float indicates
-        # a 'share' of 1.0 that the individual deserves based on it's fitness relative to
-        # the other individuals. It is sorted so the best chances are at the front of the list.
-        denom = sum([fit for fit, ind in adjusted_pop])
-        normalised_pop = [(fit / denom, ind) for fit, ind in adjusted_pop]
-        normalised_pop = sorted(normalised_pop, key=lambda i: i[0], reverse=True)
-
-        # randomly select with a fitness bias
-        # FIXME: surely this can be optimized?
-        selected = []
-        for x in range(k):
-            rand = random.random()
-            accumulator = 0.0
-            for share, ind in normalised_pop:
-                accumulator += share
-                if rand <= accumulator:
-                    selected.append(ind)
-                    break
-        if len(selected) == 1:
+        # the distribution is built once per generation, then each draw is a binary search
+        if self.sampler is None:
+            adjusted = [1.0 / (1.0 + i.fitness.values[0]) for i in self]
+            order = sorted(range(len(self)), key=adjusted.__getitem__, reverse=True)
+            self.sampler = CumulativeSampler([adjusted[idx] for idx in order]), order
+
+        sampler, order = self.sampler
+        selected = [self[order[idx]] for idx in sampler.sample(k)]
+        if len(selected) == 1 and not as_list:
             return selected[0]
         else:
             return selected
 
+    def flush_log(self):
+        """
+        Print the generations of the logbook that evolve has not shown yet
+        """
+        self.logbook.show(force=True)
+
     def evolve(self):
         """
         Evolve this population by one generation
         """
-        self.logbook.record(gen=self.generation, **self.stats.compile(self))
+        record = self.stats.compile(self)
+        if Population.CACHE is not None:
+            record['hit_rate'] = Population.CACHE.hit_rate
+        self.logbook.record(gen=self.generation, **record)
         self.hof.update(self)
-        print(self.logbook.stream)
+        self.logbook.show()
 
         # the best x of the population are cloned directly into the next generation
         offspring = self[:self.CLONE_BEST]
@@ -119,9 +144,8 @@ class Population(list):
             offspring.append(child)
         self[:] = offspring
         self.generation += 1
+        self.sampler = None
 
-        # evaluate every individual and sort
-        for ind in self:
-            if not len(ind.fitness.values):
-                ind.fitness.values = ind.evaluate()
+        # evaluate every new individual and sort
+        self.evaluate([ind for ind in self if not len(ind.fitness.values)])
         self.sort(key=lambda i: i.fitness.values[0])
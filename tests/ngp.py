@@ -326,6 +326,7 @@ class MatrixTestCase(unittest.TestCase):
         population = Population(bset)
         while population[0].fitness.values[0] >= 1.0:
             population.evolve()
+        population.flush_log()
 
         best = population[0]
         best.draw()
@@ -410,6 +411,7 @@ class MatrixTestCase(unittest.TestCase):
             population.evolve()
             if population[0].fitness.values[0] < 0.8:
                 break
+        population.flush_log()
 
         best = population[0]
         best.draw()
@@ -492,6 +494,7 @@ class GeneticProgrammingTestCase(unittest.TestCase):
             population.evolve()
             if round(population[0].fitness.values[0], 2) < 0.3:
                 break
+        population.flush_log()
 
         best = population[0]
         best.draw()
@@ -549,6 +552,7 @@ class GeneticProgrammingTestCase(unittest.TestCase):
         population = Population(bset)
         while round(population[0].fitness.values[0], 1) > 6.0:
             population.evolve()
+        population.flush_log()
 
         best = population[0]
         best.draw()
@@ -35,6 +35,11 @@ class ProbablisticSelectionTestCase(unittest.TestCase):
         toolbox.register("population", tools.initRepeat, list, toolbox.individual)
         self.toolbox = toolbox
 
+    def tearDown(self):
+        del creator.FitnessMin
+        del creator.Individual
+        del gp.Rfloat
+
     def test_selection(self):
         # create population
         pop = self.toolbox.population(n=100)
@@ -48,3 +53,15 @@ class ProbablisticSelectionTestCase(unittest.TestCase):
             print(int(ind.fitness.values[0]), '\t', str(ind))
 
         # the frequency of individuals should deteriorate as you go down the list
+
+    def test_as_list(self):
+        pop = self.toolbox.population(n=10)
+        for fit, ind in enumerate(pop):
+            ind.fitness.values = (fit,)
+
+        # a single selection is the individual itself unless a list is asked for
+        selected = selProbablistic(pop, 1)
+        self.assertTrue(any(selected is ind for ind in pop))
+        selected = selProbablistic(pop, 1, as_list=True)
+        self.assertEqual(len(selected), 1)
+        self.assertTrue(any(selected[0] is ind for ind in pop))